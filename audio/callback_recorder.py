@@ -0,0 +1,256 @@
+"""
+Callback-driven Recorder
+------------------------
+
+Same endpointing as SilenceRecorder, but PortAudio pushes blocks
+into a callback instead of the recorder pulling them with a
+blocking read. Each block is written into a preallocated ring,
+its energy is computed by the VAD (EnergyVAD uses a reusable
+float32 scratch buffer), and the finished utterance is copied out
+once as a memoryview over "WAV header + samples".
+
+open() keeps one input stream alive for the whole call. Between
+turns the callback keeps filling the ring (and the VAD keeps
+tracking the noise floor), so each turn can start pre_roll_ms
+before the detected speech onset, even if the caller started
+talking before record_view() was called. Without open(), each
+turn opens and closes its own stream as before.
+
+Steady-state capture allocates nothing per block besides the
+scalar RMS. CaptureStats records callback count and thread CPU so
+this can be checked in production.
+"""
+
+import threading
+import time
+
+import numpy as np
+import sounddevice as sd
+
+from audio.recorder import SilenceRecorder, STOP_MESSAGES
+from audio.ring_buffer import PCMRingBuffer
+from audio.vad import Endpointer
+from telemetry.tracing import tracer
+
+
+class CaptureStats:
+    def __init__(self):
+        self.callbacks = 0
+        self.cpu_s = 0.0
+        self.overflows = 0
+
+    def __str__(self):
+        per_cb = 1e6 * self.cpu_s / self.callbacks if self.callbacks else 0.0
+        return (
+            f"{self.callbacks} callbacks, {1000 * self.cpu_s:.2f} ms CPU "
+            f"({per_cb:.1f} µs/callback), {self.overflows} overflows"
+        )
+
+
+class CallbackRecorder(SilenceRecorder):
+    # Extra ring space so a returned view survives while it is uploaded
+    RING_SLACK_MS = 10000
+
+    def __init__(self, pre_roll_ms: int = 300, **kwargs):
+        super().__init__(**kwargs)
+
+        self.pre_roll_samples = int(self.sample_rate * pre_roll_ms / 1000)
+        capacity = (
+            int(self.sample_rate * (self.max_record_ms + pre_roll_ms + self.RING_SLACK_MS) / 1000)
+            + self.chunk_samples
+        )
+        self.ring = PCMRingBuffer(capacity, self.sample_rate, self.channels)
+
+        self._stream = None
+        self._done = threading.Event()
+        self._tick = threading.Event()
+        self._endpoint = None
+        self._turn_start = 0
+        self._turn_end = 0
+        self._onset_found = False
+        self._armed_at = 0.0
+        self._trailing_ms = 0
+        self.stop_reason = None
+        self.stats = CaptureStats()
+
+    # --------------------------------------------------
+
+    def open(self):
+        """
+        Start the persistent capture stream (idempotent).
+        """
+        if self._stream is None:
+            self._stream = sd.InputStream(
+                samplerate=self.sample_rate,
+                channels=self.channels,
+                dtype="int16",
+                blocksize=self.chunk_samples,
+                callback=self._callback,
+            )
+            self._stream.start()
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --------------------------------------------------
+
+    def _callback(self, indata, frames, time_info, status):
+        start = time.thread_time()
+
+        if status and status.input_overflow:
+            self.stats.overflows += 1
+
+        self.ring.write(indata)
+        speech = self.vad.is_speech(indata)
+
+        endpoint = self._endpoint
+        if endpoint is not None:
+            self._advance(endpoint, speech)
+
+        self.stats.callbacks += 1
+        self.stats.cpu_s += time.thread_time() - start
+        self._tick.set()
+
+    def _advance(self, endpoint: Endpointer, speech: bool):
+        reason = endpoint.update(speech)
+        write_pos = self.ring.write_pos
+
+        if endpoint.speech_detected and not self._onset_found:
+            # The speech run that started the turn, plus pre-roll before it
+            run = max(1, endpoint.held_speech_ms // self.chunk_ms)
+            onset = write_pos - run * self.chunk_samples
+            self._turn_start = max(self.ring.oldest(), onset - self.pre_roll_samples)
+            self._onset_found = True
+
+        if reason:
+            self._endpoint = None
+            self._trailing_ms = endpoint.silence_ms
+            self._turn_end = write_pos
+            self.stop_reason = reason
+            self._done.set()
+
+    # --------------------------------------------------
+
+    def _arm(self, hold, on_speech, barge_in_ms):
+        print("🎙️ Listening for user speech...")
+
+        self._done.clear()
+        self.stop_reason = None
+        self._onset_found = False
+        self._trailing_ms = 0
+        self._turn_start = self.ring.write_pos
+        self._armed_at = time.perf_counter()
+        self.vad.begin_turn()
+
+        # Assigned last: the callback starts endpointing once this is set
+        self._endpoint = Endpointer(self, hold=hold, on_speech=on_speech, barge_in_ms=barge_in_ms)
+
+    def cancel(self):
+        """
+        End the current turn now (stage timeout, shutdown); any thread.
+        """
+        if self._endpoint is not None:
+            self._endpoint = None
+            self._turn_end = self.ring.write_pos
+            self.stop_reason = "cancelled"
+            self._done.set()
+            self._tick.set()
+
+    def _finish(self):
+        tracer.record("capture", time.perf_counter() - self._armed_at, reason=self.stop_reason)
+        if self.stop_reason == "silence":
+            tracer.record("endpointing", self._trailing_ms / 1000)
+
+        print(STOP_MESSAGES.get(self.stop_reason, "⏱️ Capture stopped."))
+        print("✅ Recording complete.")
+
+    def _wait(self, event: threading.Event) -> bool:
+        """
+        Wait for event; give up if the device stops delivering blocks.
+        """
+        seen = -1
+        while not event.wait(timeout=2.0):
+            if self.stats.callbacks == seen:
+                self._endpoint = None
+                self._turn_end = self.ring.write_pos
+                return False
+            seen = self.stats.callbacks
+        return True
+
+    # --------------------------------------------------
+
+    def record_view(self, hold=None, on_speech=None, barge_in_ms: int = 0) -> memoryview:
+        """
+        Record one utterance; return its WAV bytes as a memoryview.
+
+        Barge-in arguments are passed to the Endpointer.
+        """
+        transient = self._stream is None
+        if transient:
+            self.ring.reset()
+            self.open()
+
+        try:
+            self._arm(hold, on_speech, barge_in_ms)
+            self._wait(self._done)
+        finally:
+            if transient:
+                self.close()
+
+        self._finish()
+        return self.ring.wav_view(self._turn_start, self._turn_end)
+
+    def record_pcm(self, **barge_in) -> np.ndarray:
+        self.record_view(**barge_in)
+        return self.ring.pcm(self._turn_start, self._turn_end)
+
+    def record(self, **barge_in) -> bytes:
+        return bytes(self.record_view(**barge_in))
+
+    # --------------------------------------------------
+
+    def iter_chunks(self, hold=None, on_speech=None, barge_in_ms: int = 0):
+        """
+        Streaming variant for PipelinedTranscriber.
+
+        Nothing is yielded until the speech onset is known; from then
+        on, audio from (onset - pre-roll) is yielded as it arrives.
+        """
+        transient = self._stream is None
+        if transient:
+            self.ring.reset()
+            self.open()
+
+        try:
+            self._arm(hold, on_speech, barge_in_ms)
+            sent = None
+            while True:
+                self._tick.clear()
+                finished = self._done.is_set()
+
+                if sent is None and (self._onset_found or finished):
+                    sent = self._turn_start
+
+                if sent is not None:
+                    end = self._turn_end if finished else self.ring.write_pos
+                    if end > sent:
+                        yield self.ring.pcm(sent, end).copy()
+                        sent = end
+
+                if finished or not self._wait(self._tick):
+                    break
+        finally:
+            if transient:
+                self.close()
+
+        self._finish()
@@ -0,0 +1,158 @@
+"""
+Compact Audio Encoding for STT Upload
+-------------------------------------
+
+Trims leading and trailing non-speech from a recorded utterance
+and optionally encodes it as FLAC or Opus before upload.
+
+Trimming is vectorized over 10 ms frames and keeps a small guard
+margin on both sides so word onsets and releases are not clipped.
+Encoding needs the optional `soundfile` package; without it the
+encoder falls back to plain WAV.
+"""
+
+import io
+import time
+import wave
+
+import numpy as np
+
+try:
+    import soundfile as sf
+except ImportError:  # optional dependency
+    sf = None
+
+
+CODECS = {
+    # codec: (soundfile format, subtype, mimetype)
+    "flac": ("FLAC", "PCM_16", "audio/flac"),
+    "opus": ("OGG", "OPUS", "audio/ogg"),
+}
+
+
+# --------------------------------------------------
+
+def trim_silence(
+    pcm: np.ndarray,
+    sample_rate: int,
+    threshold: float,
+    frame_ms: int = 10,
+    guard_ms: int = 150,
+) -> np.ndarray:
+    """
+    Return a view of `pcm` without leading/trailing non-speech.
+
+    If no frame crosses the threshold the input is returned unchanged,
+    so a quiet speaker is never trimmed to nothing.
+    """
+    samples = pcm.reshape(-1)
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    n_frames = len(samples) // frame_len
+    if n_frames == 0:
+        return pcm
+
+    frames = samples[: n_frames * frame_len].reshape(n_frames, frame_len)
+    energy = np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / frame_len
+    voiced = np.flatnonzero(energy > threshold * threshold)
+    if voiced.size == 0:
+        return pcm
+
+    guard = int(sample_rate * guard_ms / 1000)
+    start = max(0, voiced[0] * frame_len - guard)
+    end = min(len(samples), (voiced[-1] + 1) * frame_len + guard)
+    return pcm[start:end]
+
+
+def to_wav(pcm: np.ndarray, sample_rate: int, channels: int = 1) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+# --------------------------------------------------
+
+class EncodeReport:
+    def __init__(self, raw_bytes: int, sent_bytes: int, trimmed_ms: float, encode_ms: float, codec: str):
+        self.raw_bytes = raw_bytes
+        self.sent_bytes = sent_bytes
+        self.trimmed_ms = trimmed_ms
+        self.encode_ms = encode_ms
+        self.codec = codec
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.raw_bytes - self.sent_bytes
+
+    def __str__(self):
+        pct = 100.0 * self.saved_bytes / self.raw_bytes if self.raw_bytes else 0.0
+        return (
+            f"{self.codec}: {self.raw_bytes} -> {self.sent_bytes} bytes "
+            f"({pct:.0f}% saved, {self.trimmed_ms:.0f} ms trimmed, "
+            f"{self.encode_ms:.1f} ms encode)"
+        )
+
+
+class CompactEncoder:
+    def __init__(
+        self,
+        codec: str = "flac",
+        sample_rate: int = 16000,
+        channels: int = 1,
+        silence_threshold: float = 350.0,
+        guard_ms: int = 150,
+        trim: bool = True,
+    ):
+        if codec != "wav" and codec not in CODECS:
+            raise ValueError(f"Unsupported codec: {codec}")
+
+        if codec != "wav" and (sf is None or CODECS[codec][1] not in sf.available_subtypes(CODECS[codec][0])):
+            print(f"⚠️ {codec} encoding unavailable, sending WAV")
+            codec = "wav"
+
+        self.codec = codec
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.silence_threshold = silence_threshold
+        self.guard_ms = guard_ms
+        self.trim = trim
+
+    # --------------------------------------------------
+
+    def prepare(self, pcm: np.ndarray):
+        """
+        Trim and encode one utterance.
+
+        Returns (audio_bytes, mimetype, EncodeReport).
+        """
+        start = time.perf_counter()
+        raw_bytes = pcm.nbytes + 44  # what record() would have sent
+
+        if self.trim:
+            trimmed = trim_silence(
+                pcm, self.sample_rate, self.silence_threshold, guard_ms=self.guard_ms
+            )
+        else:
+            trimmed = pcm
+        trimmed_ms = 1000.0 * (len(pcm) - len(trimmed)) / self.sample_rate
+
+        if self.codec == "wav":
+            data = to_wav(trimmed, self.sample_rate, self.channels)
+            mimetype = "audio/wav"
+        else:
+            fmt, subtype, mimetype = CODECS[self.codec]
+            buffer = io.BytesIO()
+            sf.write(buffer, trimmed, self.sample_rate, format=fmt, subtype=subtype)
+            data = buffer.getvalue()
+
+        report = EncodeReport(
+            raw_bytes=raw_bytes,
+            sent_bytes=len(data),
+            trimmed_ms=trimmed_ms,
+            encode_ms=1000.0 * (time.perf_counter() - start),
+            codec=self.codec,
+        )
+        return data, mimetype, report
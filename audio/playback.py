@@ -1,12 +1,199 @@
+import threading
+import asyncio
+import contextlib
+from collections import deque
+
 import sounddevice as sd
 import numpy as np
 
+from telemetry.tracing import tracer
+
 
 class AudioPlayer:
-    def __init__(self, sample_rate: int = 24000):
+    """
+    Callback-driven playback on an OutputStream.
+
+    start() returns immediately; stop() silences the stream at the
+    next block boundary (blocksize samples, 20 ms by default), which
+    is what lets the caller barge in over a prompt.
+
+    Streaming: begin_stream() opens the output, feed() appends PCM as
+    it arrives and end_stream() marks the end. Output starts once
+    jitter_ms of audio is buffered, so time to first audio is one
+    network chunk plus the jitter buffer, not the whole synthesis.
+    """
+
+    def __init__(self, sample_rate: int = 24000, blocksize: int = 480, jitter_ms: int = 60, run_blocking=None):
+        """
+        run_blocking: async runner for the blocking wait(), e.g.
+        runtime.executors.run_device; the loop's default pool if None.
+        """
         self.sample_rate = sample_rate
+        self.run_blocking = run_blocking
+        self.blocksize = blocksize
+        self.jitter_samples = int(sample_rate * jitter_ms / 1000)
+
+        self._queue = deque()
+        self._head_pos = 0
+        self._fed = 0
+        self._leftover = b""
+        self._primed = False
+        self._eof = False
+
+        self._stream = None
+        self._stop = threading.Event()
+        self._done = threading.Event()
+        self._done.set()
+
+        self.interrupted = False
+        self.underruns = 0
+
+    # --------------------------------------------------
+
+    @property
+    def is_playing(self) -> bool:
+        return not self._done.is_set()
+
+    def _callback(self, outdata, frames, time_info, status):
+        if self._stop.is_set():
+            outdata.fill(0)
+            self.interrupted = True
+            raise sd.CallbackStop
+
+        if not self._primed:
+            outdata.fill(0)
+            return
+
+        out = outdata[:, 0]
+        filled = 0
+        while filled < frames and self._queue:
+            head = self._queue[0]
+            n = min(frames - filled, len(head) - self._head_pos)
+            out[filled: filled + n] = head[self._head_pos: self._head_pos + n]
+            filled += n
+            self._head_pos += n
+            if self._head_pos == len(head):
+                self._queue.popleft()
+                self._head_pos = 0
+
+        if filled < frames:
+            out[filled:] = 0
+            if self._eof and not self._queue:
+                raise sd.CallbackStop
+            self.underruns += 1
+
+    # --------------------------------------------------
+
+    def begin_stream(self):
+        """
+        Open the output for incremental playback via feed().
+        """
+        self.stop()
+        self.wait()
+
+        self._queue.clear()
+        self._head_pos = 0
+        self._fed = 0
+        self._leftover = b""
+        self._primed = False
+        self._eof = False
+        self._stop.clear()
+        self._done.clear()
+        self.interrupted = False
+
+        self._stream = sd.OutputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype="int16",
+            blocksize=self.blocksize,
+            callback=self._callback,
+            finished_callback=self._done.set,
+        )
+        self._stream.start()
+
+    def feed(self, audio_bytes):
+        """
+        Queue PCM bytes; chunks may split a sample across calls.
+        """
+        data = self._leftover + bytes(audio_bytes) if self._leftover else audio_bytes
+        usable = len(data) - len(data) % 2
+        self._leftover = bytes(data[usable:])
+        if not usable:
+            return
+
+        samples = np.frombuffer(data, dtype=np.int16, count=usable // 2)
+        self._queue.append(samples)
+        self._fed += len(samples)
+
+        if self._fed >= self.jitter_samples:
+            self._primed = True
+
+    def end_stream(self):
+        self._eof = True
+        self._primed = True
+
+    # --------------------------------------------------
+
+    def start(self, audio_bytes: bytes):
+        """
+        Begin playback without waiting for it to finish.
+        """
+        self.begin_stream()
+        self.feed(audio_bytes)
+        self.end_stream()
+
+    def stop(self):
+        """
+        Cancel playback; takes effect within one block.
+        """
+        if self.is_playing:
+            self._stop.set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Block until playback ends; True if it played to completion.
+        """
+        self._done.wait(timeout)
+        if self._done.is_set() and self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        return not self.interrupted
+
+    # --------------------------------------------------
 
     def play(self, audio_bytes: bytes):
-        audio_np = np.frombuffer(audio_bytes, dtype=np.int16)
-        sd.play(audio_np, samplerate=self.sample_rate)
-        sd.wait()
\ No newline at end of file
+        self.start(audio_bytes)
+        self.wait()
+
+    async def play_async(self, audio_bytes: bytes) -> bool:
+        """
+        Play without blocking the event loop; True if not interrupted.
+        """
+        with tracer.span("playback"):
+            self.start(audio_bytes)
+            return await self._wait_async()
+
+    async def play_stream(self, chunks) -> bool:
+        """
+        Play an async generator of PCM chunks as they arrive.
+
+        The generator is closed even when playback is stopped early.
+        """
+        with tracer.span("playback", streamed=True):
+            self.begin_stream()
+            try:
+                async with contextlib.aclosing(chunks):
+                    async for chunk in chunks:
+                        if self._stop.is_set():
+                            break
+                        self.feed(chunk)
+            finally:
+                self.end_stream()
+
+            return await self._wait_async()
+
+    async def _wait_async(self) -> bool:
+        if self.run_blocking is not None:
+            return await self.run_blocking(self.wait)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.wait)
@@ -14,6 +14,17 @@ import time
 import io
 import wave
 
+from audio.vad import EnergyVAD, Endpointer
+from telemetry.tracing import tracer
+
+
+STOP_MESSAGES = {
+    "silence": "🛑 Silence detected, stopping recording.",
+    "no_speech": "⏱️ No speech detected, stopping.",
+    "max_length": "⏱️ Max recording time reached.",
+    "cancelled": "⏹️ Recording cancelled.",
+}
+
 
 class SilenceRecorder:
     def __init__(
@@ -25,6 +36,7 @@ class SilenceRecorder:
         silence_duration_ms: int = 900,
         max_record_ms: int = 10000,
         start_timeout_ms: int = 5000,
+        vad=None,
     ):
         self.sample_rate = sample_rate
         self.channels = channels
@@ -36,6 +48,9 @@ class SilenceRecorder:
         self.max_record_ms = max_record_ms
         self.start_timeout_ms = start_timeout_ms
 
+        # Fixed-threshold detection unless a VAD is plugged in
+        self.vad = vad or EnergyVAD(silence_threshold, sample_rate)
+
     # --------------------------------------------------
 
     def _rms(self, audio: np.ndarray) -> float:
@@ -43,13 +58,21 @@ class SilenceRecorder:
 
     # --------------------------------------------------
 
-    def record(self) -> bytes:
+    def iter_chunks(self, hold=None, on_speech=None, barge_in_ms: int = 0):
+        """
+        Yield int16 chunks as they are captured until end of speech.
+
+        The endpointing rules are the same as record(); consumers can
+        start working on early chunks while the caller is still talking.
+        While hold() is true nothing is yielded until the caller barges
+        in (see Endpointer); the speech run that triggered it is kept.
+        """
         print("🎙️ Listening for user speech...")
 
-        audio_chunks = []
-        silence_ms = 0
-        total_ms = 0
-        speech_detected = False
+        endpoint = Endpointer(self, hold=hold, on_speech=on_speech, barge_in_ms=barge_in_ms)
+        self.vad.begin_turn()
+        pending = []
+        started = time.perf_counter()
 
         with sd.InputStream(
             samplerate=self.sample_rate,
@@ -60,33 +83,40 @@ class SilenceRecorder:
 
             while True:
                 audio_chunk, _ = stream.read(self.chunk_samples)
-                audio_chunks.append(audio_chunk.copy())
+                audio_chunk = audio_chunk.copy()
 
-                rms = self._rms(audio_chunk)
-                total_ms += self.chunk_ms
+                reason = endpoint.update(self.vad.is_speech(audio_chunk))
 
-                if rms > self.silence_threshold:
-                    speech_detected = True
-                    silence_ms = 0
-                else:
-                    if speech_detected:
-                        silence_ms += self.chunk_ms
+                if endpoint.holding:
+                    pending = pending + [audio_chunk] if endpoint.held_speech_ms else []
+                    continue
 
-                if speech_detected and silence_ms >= self.silence_duration_ms:
-                    print("🛑 Silence detected, stopping recording.")
-                    break
+                if pending:
+                    yield from pending
+                    pending = []
+                yield audio_chunk
 
-                if not speech_detected and total_ms >= self.start_timeout_ms:
-                    print("⏱️ No speech detected, stopping.")
-                    break
-
-                if total_ms >= self.max_record_ms:
-                    print("⏱️ Max recording time reached.")
+                if reason:
+                    tracer.record("capture", time.perf_counter() - started, reason=reason)
+                    if reason == "silence":
+                        tracer.record("endpointing", endpoint.silence_ms / 1000)
+                    print(STOP_MESSAGES[reason])
                     break
 
         print("✅ Recording complete.")
 
-        audio_np = np.concatenate(audio_chunks, axis=0)
+    # --------------------------------------------------
+
+    def record_pcm(self, **barge_in) -> np.ndarray:
+        """
+        Record one utterance and return it as an int16 array.
+        """
+        return np.concatenate(list(self.iter_chunks(**barge_in)), axis=0)
+
+    # --------------------------------------------------
+
+    def record(self, **barge_in) -> bytes:
+        audio_np = self.record_pcm(**barge_in)
 
         # 🔥 CONVERT TO WAV BYTES (CRITICAL FIX)
         wav_buffer = io.BytesIO()
@@ -96,4 +126,4 @@ class SilenceRecorder:
             wf.setframerate(self.sample_rate)
             wf.writeframes(audio_np.tobytes())
 
-        return wav_buffer.getvalue()
\ No newline at end of file
+        return wav_buffer.getvalue()
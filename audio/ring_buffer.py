@@ -0,0 +1,86 @@
+"""
+Preallocated PCM Ring Buffer
+----------------------------
+
+Fixed-size int16 ring that capture callbacks write into without
+allocating. wav_view() copies an utterance out once, straight
+into a buffer that already holds its WAV header.
+
+The ring itself is only ever written by write(): the capture
+callback may be filling it while a turn is read out, and the
+returned WAV stays valid after the writer wraps over that audio.
+"""
+
+import numpy as np
+
+from audio.wav import HEADER_SIZE, wav_header
+
+
+class PCMRingBuffer:
+    def __init__(self, capacity_samples: int, sample_rate: int, channels: int = 1):
+        self.capacity = capacity_samples
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frame_bytes = 2 * channels
+
+        self.samples = np.zeros((capacity_samples, channels), dtype=np.int16)
+
+        # Total samples ever written; positions are absolute, not wrapped
+        self.write_pos = 0
+
+    # --------------------------------------------------
+
+    def reset(self):
+        self.write_pos = 0
+
+    def write(self, frames: np.ndarray):
+        """
+        Append frames (n, channels), overwriting the oldest audio.
+        """
+        n = len(frames)
+        if n >= self.capacity:
+            frames = frames[n - self.capacity:]
+            self.write_pos += n - self.capacity
+            n = self.capacity
+
+        idx = self.write_pos % self.capacity
+        first = min(n, self.capacity - idx)
+        self.samples[idx: idx + first] = frames[:first]
+        if first < n:
+            self.samples[: n - first] = frames[first:]
+
+        self.write_pos += n
+
+    def oldest(self) -> int:
+        return max(0, self.write_pos - self.capacity)
+
+    # --------------------------------------------------
+
+    def pcm(self, start: int, end: int) -> np.ndarray:
+        """
+        Samples in [start, end) as an array; a view unless the range wraps.
+        """
+        start = max(start, self.oldest())
+        i, j = start % self.capacity, (end - 1) % self.capacity + 1
+        if end <= start:
+            return self.samples[:0]
+        if i < j:
+            return self.samples[i:j]
+        return np.concatenate([self.samples[i:], self.samples[:j]])
+
+    def wav_view(self, start: int, end: int) -> memoryview:
+        """
+        WAV bytes for [start, end) with a single copy out of the ring.
+        """
+        start = max(start, self.oldest())
+        n = max(0, end - start)
+
+        out = bytearray(HEADER_SIZE + n * self.frame_bytes)
+        out[:HEADER_SIZE] = wav_header(self.sample_rate, self.channels, n)
+        body = np.frombuffer(out, dtype=np.int16, offset=HEADER_SIZE).reshape(n, self.channels)
+
+        i = start % self.capacity
+        first = min(n, self.capacity - i)
+        body[:first] = self.samples[i: i + first]
+        body[first:] = self.samples[: n - first]
+        return memoryview(out)
@@ -0,0 +1,258 @@
+"""
+Voice Activity Detection
+------------------------
+
+Pluggable speech/non-speech decision for each captured block,
+plus the per-turn Endpointer that turns those decisions into a
+stop reason.
+
+EnergyVAD      fixed RMS threshold (the original recorder rule)
+AdaptiveVAD    tracks the line's noise floor, gates on zero-crossing
+               rate, and smooths decisions with a hangover
+
+Both are vectorized over sub-frames: a 100 ms block is split into
+short frames and features are computed for all of them at once.
+Endpointing latency (how much trailing non-speech ends a turn)
+stays on the recorder as silence_duration_ms, independent of the
+detection threshold.
+"""
+
+import numpy as np
+
+
+class VAD:
+    """
+    Base interface: is_speech(block) for streaming, classify(pcm) offline.
+    """
+
+    frame_ms = 20
+
+    def __init__(self, sample_rate: int = 16000):
+        self.sample_rate = sample_rate
+        self.frame_len = int(sample_rate * self.frame_ms / 1000)
+
+    def begin_turn(self):
+        """
+        Called at the start of each recording; state that should
+        carry across turns (e.g. the noise floor) is kept.
+        """
+
+    def is_speech(self, block: np.ndarray) -> bool:
+        raise NotImplementedError
+
+    def classify(self, pcm: np.ndarray) -> np.ndarray:
+        """
+        Per-frame speech decisions (bool array) for a whole recording.
+        """
+        frames = self._frames(pcm)
+        return np.array([self.is_speech(f) for f in frames], dtype=bool)
+
+    # --------------------------------------------------
+
+    def _frames(self, pcm: np.ndarray) -> np.ndarray:
+        samples = pcm.reshape(-1)
+        n = len(samples) // self.frame_len
+        return samples[: n * self.frame_len].reshape(n, self.frame_len)
+
+
+def frame_features(frames: np.ndarray):
+    """
+    RMS and zero-crossing rate for each row of a (n, frame_len) int16 array.
+    """
+    x = frames.astype(np.float32)
+    rms = np.sqrt(np.einsum("ij,ij->i", x, x) / frames.shape[1])
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frames.shape[1] - 1)
+    return rms, zcr
+
+
+# --------------------------------------------------
+
+class EnergyVAD(VAD):
+    """
+    Fixed RMS threshold over the whole block.
+    """
+
+    def __init__(self, threshold: float = 350.0, sample_rate: int = 16000):
+        super().__init__(sample_rate)
+        self.threshold = threshold
+        self._scratch = np.empty(0, dtype=np.float32)
+
+    def rms(self, block: np.ndarray) -> float:
+        """
+        Block RMS through a reusable float32 scratch buffer.
+        """
+        n = block.size
+        if n > self._scratch.size:
+            self._scratch = np.empty(n, dtype=np.float32)
+        scratch = self._scratch[:n]
+        np.copyto(scratch, block.reshape(-1), casting="unsafe")
+        return float(np.sqrt(np.dot(scratch, scratch) / n))
+
+    def is_speech(self, block: np.ndarray) -> bool:
+        return self.rms(block) > self.threshold
+
+    def classify(self, pcm: np.ndarray) -> np.ndarray:
+        rms, _ = frame_features(self._frames(pcm))
+        return rms > self.threshold
+
+
+# --------------------------------------------------
+
+class AdaptiveVAD(VAD):
+    """
+    Noise-floor-relative energy detector with ZCR gating and hangover.
+
+    A frame is speech when its RMS exceeds snr_ratio x noise floor
+    (never below min_threshold) and its zero-crossing rate looks
+    voiced; frames above loud_ratio x floor count as speech
+    regardless of ZCR so fricatives are not dropped. The floor falls
+    quickly towards quieter frames and rises by at most
+    floor_rise_db_per_s, so it settles on a steady line noise within
+    a few seconds while the dips between words keep it from
+    following speech upwards. hangover_ms keeps the decision
+    "speech" briefly after energy drops, bridging short gaps.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        snr_ratio: float = 2.0,
+        min_threshold: float = 120.0,
+        initial_floor: float = 100.0,
+        floor_rise_db_per_s: float = 6.0,
+        floor_down: float = 0.3,
+        max_zcr: float = 0.35,
+        loud_ratio: float = 8.0,
+        hangover_ms: int = 200,
+        min_speech_frames: int = 2,
+    ):
+        super().__init__(sample_rate)
+        self.snr_ratio = snr_ratio
+        self.min_threshold = min_threshold
+        self.floor_rise = 10 ** (floor_rise_db_per_s / 20 * self.frame_ms / 1000)
+        self.floor_down = floor_down
+        self.max_zcr = max_zcr
+        self.loud_ratio = loud_ratio
+        self.hangover_frames = max(0, hangover_ms // self.frame_ms)
+        self.min_speech_frames = min_speech_frames
+
+        self.noise_floor = initial_floor
+        self._hang = 0
+        self._run = 0
+
+    def begin_turn(self):
+        self._hang = 0
+        self._run = 0
+
+    @property
+    def threshold(self) -> float:
+        return max(self.min_threshold, self.noise_floor * self.snr_ratio)
+
+    # --------------------------------------------------
+
+    def _step(self, rms: float, zcr: float) -> bool:
+        threshold = self.threshold
+        loud = max(self.min_threshold, self.noise_floor * self.loud_ratio)
+        raw = rms > loud or (rms > threshold and zcr <= self.max_zcr)
+
+        if rms < self.noise_floor:
+            self.noise_floor += self.floor_down * (rms - self.noise_floor)
+        else:
+            self.noise_floor = min(rms, self.noise_floor * self.floor_rise)
+        self.noise_floor = max(self.noise_floor, 1.0)
+
+        self._run = self._run + 1 if raw else 0
+
+        if self._run >= self.min_speech_frames:
+            self._hang = self.hangover_frames
+            return True
+
+        if self._hang > 0:
+            self._hang -= 1
+            return True
+
+        return False
+
+    def _decide(self, frames: np.ndarray) -> np.ndarray:
+        rms, zcr = frame_features(frames)
+        out = np.empty(len(rms), dtype=bool)
+        for i in range(len(rms)):
+            out[i] = self._step(float(rms[i]), float(zcr[i]))
+        return out
+
+    def is_speech(self, block: np.ndarray) -> bool:
+        frames = self._frames(block)
+        if len(frames) == 0:
+            return False
+        return bool(self._decide(frames).any())
+
+    def classify(self, pcm: np.ndarray) -> np.ndarray:
+        return self._decide(self._frames(pcm))
+
+
+# --------------------------------------------------
+
+class Endpointer:
+    """
+    Per-turn endpointing state shared by the blocking and callback recorders.
+
+    `config` supplies chunk_ms, silence_duration_ms, start_timeout_ms
+    and max_record_ms (a recorder works).
+
+    Barge-in: while hold() is true (the agent is still talking) the
+    turn has not started yet. Audio is classified but no timeouts
+    run, and only barge_in_ms of continuous speech starts the turn.
+    on_speech() fires once, when speech first starts the turn.
+    """
+
+    def __init__(self, config, hold=None, on_speech=None, barge_in_ms: int = 0):
+        self.config = config
+        self.hold = hold
+        self.on_speech = on_speech
+        self.barge_in_ms = barge_in_ms
+
+        self.silence_ms = 0
+        self.total_ms = 0
+        self.speech_detected = False
+
+        # True while the last chunk was before the start of the turn
+        self.holding = False
+        self.held_speech_ms = 0
+
+    def update(self, speech: bool):
+        """
+        Feed one chunk's VAD decision; return a stop reason or None.
+        """
+        c = self.config
+
+        if self.hold is not None and not self.speech_detected and self.hold():
+            self.held_speech_ms = self.held_speech_ms + c.chunk_ms if speech else 0
+            if self.held_speech_ms < max(self.barge_in_ms, c.chunk_ms):
+                self.holding = True
+                return None
+            # Barge-in: the held speech run is the start of the turn
+            self.total_ms = self.held_speech_ms - c.chunk_ms
+
+        self.holding = False
+        self.total_ms += c.chunk_ms
+
+        if speech:
+            if not self.speech_detected and self.on_speech:
+                self.on_speech()
+            self.speech_detected = True
+            self.silence_ms = 0
+        else:
+            if self.speech_detected:
+                self.silence_ms += c.chunk_ms
+
+        if self.speech_detected and self.silence_ms >= c.silence_duration_ms:
+            return "silence"
+
+        if not self.speech_detected and self.total_ms >= c.start_timeout_ms:
+            return "no_speech"
+
+        if self.total_ms >= c.max_record_ms:
+            return "max_length"
+
+        return None
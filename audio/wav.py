@@ -0,0 +1,44 @@
+"""
+WAV Header Helpers
+------------------
+
+Builds canonical 44-byte PCM WAV headers.
+
+When the number of frames is not known up front (streaming
+upload), the RIFF and data sizes are set to 0xFFFFFFFF, which
+decoders treat as "read until end of stream".
+"""
+
+import struct
+
+STREAMING_SIZE = 0xFFFFFFFF
+HEADER_SIZE = 44
+
+
+def wav_header(sample_rate: int, channels: int = 1, num_frames: int = None, sample_width: int = 2) -> bytes:
+    if num_frames is None:
+        data_size = STREAMING_SIZE
+        riff_size = STREAMING_SIZE
+    else:
+        data_size = num_frames * channels * sample_width
+        riff_size = 36 + data_size
+
+    byte_rate = sample_rate * channels * sample_width
+    block_align = channels * sample_width
+
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        riff_size,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,  # PCM
+        channels,
+        sample_rate,
+        byte_rate,
+        block_align,
+        sample_width * 8,
+        b"data",
+        data_size,
+    )
@@ -0,0 +1,84 @@
+"""
+Capture Path Benchmark
+Per-turn allocations and CPU for blocking vs callback capture
+
+Feeds synthetic 100 ms blocks straight into each recorder's
+per-block work (no audio device needed) and reports bytes
+allocated per turn (tracemalloc peak) and CPU per block.
+
+    python -m benchmarks.bench_capture --turns 50
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from audio.callback_recorder import CallbackRecorder
+from audio.encoding import to_wav
+from audio.recorder import SilenceRecorder
+from audio.vad import Endpointer
+
+
+def synthetic_blocks(recorder, n_blocks: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return [
+        rng.normal(0, 2000, (recorder.chunk_samples, recorder.channels)).astype(np.int16)
+        for _ in range(n_blocks)
+    ]
+
+
+def blocking_turn(recorder: SilenceRecorder, blocks):
+    """
+    The per-block work SilenceRecorder.record() does after stream.read(),
+    plus its concatenate and WAV copy at the end.
+    """
+    chunks = []
+    endpoint = Endpointer(recorder)
+    for block in blocks:
+        chunks.append(block.copy())
+        endpoint.update(recorder._rms(block) > recorder.silence_threshold)
+    return to_wav(np.concatenate(chunks, axis=0), recorder.sample_rate)
+
+
+def callback_turn(recorder: CallbackRecorder, blocks):
+    """
+    The per-block work CallbackRecorder._callback() does, plus record_view().
+    """
+    recorder.ring.reset()
+    endpoint = Endpointer(recorder)
+    for block in blocks:
+        recorder.ring.write(block)
+        endpoint.update(recorder.vad.is_speech(block))
+    return recorder.ring.wav_view(0, recorder.ring.write_pos)
+
+
+def measure(label, fn, recorder, blocks, turns):
+    fn(recorder, blocks)  # warm-up
+
+    tracemalloc.start()
+    cpu_start = time.process_time()
+    for _ in range(turns):
+        fn(recorder, blocks)
+    cpu = time.process_time() - cpu_start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_block_us = 1e6 * cpu / (turns * len(blocks))
+    print(f"{label:>10} {peak:>18} {per_block_us:>16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--blocks", type=int, default=40, help="100 ms blocks per turn")
+    args = parser.parse_args()
+
+    blocking = SilenceRecorder(max_record_ms=args.blocks * 100)
+    callback = CallbackRecorder(max_record_ms=args.blocks * 100)
+    blocks = synthetic_blocks(blocking, args.blocks)
+
+    print(f"{'path':>10} {'peak bytes/turn':>18} {'CPU µs/block':>16}")
+    measure("blocking", blocking_turn, blocking, blocks, args.turns)
+    measure("callback", callback_turn, callback, blocks, args.turns)
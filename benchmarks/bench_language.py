@@ -0,0 +1,62 @@
+"""
+Language Detection Benchmark
+Accuracy on the labelled fixture set and time per utterance
+
+    python -m benchmarks.bench_language
+    python -m benchmarks.bench_language --fixture tests/fixtures/language_samples.json --repeat 200
+"""
+
+import argparse
+import json
+import time
+
+from language.detect_language import SUPPORTED_LANGUAGES, detect_language, detect_languages
+
+
+def accuracy(samples):
+    print(f"{'lang':>5} {'correct':>8} {'total':>6}")
+    misses = []
+    for lang in SUPPORTED_LANGUAGES:
+        subset = [(t, l) for t, l in samples if l == lang]
+        correct = 0
+        for text, label in subset:
+            got = detect_language(text)
+            if got == label:
+                correct += 1
+            else:
+                misses.append((label, got, text))
+        print(f"{lang:>5} {correct:>8} {len(subset):>6}")
+
+    for label, got, text in misses:
+        print(f"   miss: {label} -> {got}: {text}")
+    total = len(samples)
+    print(f"accuracy: {(total - len(misses)) / total:.1%}\n")
+
+
+def timing(texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            detect_language(text)
+    single_us = 1e6 * (time.perf_counter() - start) / (repeat * len(texts))
+
+    batch = texts * repeat
+    start = time.perf_counter()
+    detect_languages(batch)
+    batch_us = 1e6 * (time.perf_counter() - start) / len(batch)
+
+    print(f"detect_language   {single_us:7.1f} us / utterance")
+    print(f"detect_languages  {batch_us:7.1f} us / utterance ({len(batch)} texts)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixture", default="tests/fixtures/language_samples.json")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with open(args.fixture, encoding="utf-8") as f:
+        samples = [tuple(s) for s in json.load(f)]
+
+    accuracy(samples)
+    timing([t for t, _ in samples], args.repeat)
@@ -0,0 +1,66 @@
+"""
+Concurrent Session Benchmark
+Turns per second for N sessions sharing one pooled STT/TTS client
+
+Each simulated turn is one STT request followed by one TTS request
+against the local mock endpoint, so the numbers reflect event-loop
+and connection-pool behaviour rather than Deepgram itself.
+
+    python -m benchmarks.bench_sessions --sessions 1 8 32 128
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.mock_deepgram import start_mock_server
+from net.http_pool import HTTPPool
+from stt.async_deepgram_stt import AsyncDeepgramSTT
+from tts.async_deepgram_tts import AsyncDeepgramTTS
+
+
+FAKE_WAV = bytes(44 + 16000 * 2)
+
+
+async def _session(stt, tts, turns: int):
+    for _ in range(turns):
+        text = await stt.transcribe(FAKE_WAV)
+        await tts.synthesize(text)
+
+
+async def run(sessions_list, turns: int, latency_ms: float, max_concurrency: int):
+    runner, base_url = await start_mock_server(latency_ms=latency_ms)
+
+    try:
+        print(f"{'sessions':>10} {'turns':>8} {'seconds':>10} {'turns/s':>10}")
+        for sessions in sessions_list:
+            async with HTTPPool(
+                "mock-key",
+                base_url=base_url,
+                max_connections=max_concurrency,
+                max_concurrency=max_concurrency,
+            ) as pool:
+                stt = AsyncDeepgramSTT(pool)
+                tts = AsyncDeepgramTTS(pool)
+
+                start = time.perf_counter()
+                await asyncio.gather(
+                    *(_session(stt, tts, turns) for _ in range(sessions))
+                )
+                elapsed = time.perf_counter() - start
+
+            total = sessions * turns
+            print(f"{sessions:>10} {total:>8} {elapsed:>10.2f} {total / elapsed:>10.1f}")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--max-concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.sessions, args.turns, args.latency_ms, args.max_concurrency))
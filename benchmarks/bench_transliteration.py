@@ -0,0 +1,48 @@
+"""
+Transliteration Throughput Benchmark
+Tokens per millisecond, cold (no memo) and warm (memoized)
+
+    python -m benchmarks.bench_transliteration --tokens 50000
+"""
+
+import argparse
+import random
+import time
+
+from language import transliteration as tr
+from language.detect_language import SEED_CORPUS
+
+
+def run(n_tokens: int):
+    vocab = {lang: text.split() for lang, text in SEED_CORPUS.items() if lang != "en"}
+    rng = random.Random(1)
+
+    print(f"{'lang':>5} {'cold tok/ms':>12} {'warm tok/ms':>12} {'back tok/ms':>12}")
+    for lang, words in vocab.items():
+        text = " ".join(rng.choice(words) for _ in range(n_tokens))
+
+        tr._native_token.cache_clear()
+        engine = tr.get_transliterator(lang)
+        start = time.perf_counter()
+        for word in text.split():
+            engine.to_native(word)
+        cold = n_tokens / (1000 * (time.perf_counter() - start))
+
+        native = tr.roman_to_native(text, lang)  # fills the memo
+        start = time.perf_counter()
+        tr.roman_to_native(text, lang)
+        warm = n_tokens / (1000 * (time.perf_counter() - start))
+
+        tr.native_to_roman(native, lang)
+        start = time.perf_counter()
+        tr.native_to_roman(native, lang)
+        back = n_tokens / (1000 * (time.perf_counter() - start))
+
+        print(f"{lang:>5} {cold:>12.0f} {warm:>12.0f} {back:>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=50000)
+    args = parser.parse_args()
+    run(args.tokens)
@@ -0,0 +1,54 @@
+"""
+TTS Time-to-First-Audio Benchmark
+Buffered synthesize() vs streaming stream() against the mock endpoint
+
+    python -m benchmarks.bench_tts_stream --tts-ms 4000
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.mock_deepgram import start_mock_server
+from net.http_pool import HTTPPool
+from tts.async_deepgram_tts import AsyncDeepgramTTS
+
+
+async def run(tts_ms: int, latency_ms: float, repeats: int):
+    runner, base_url = await start_mock_server(latency_ms=latency_ms, tts_ms=tts_ms)
+
+    try:
+        async with HTTPPool("mock-key", base_url=base_url) as pool:
+            tts = AsyncDeepgramTTS(pool)
+            text = "The consultation fee for Dr. Kumar is 800 rupees."
+
+            buffered, first, total = [], [], []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                await tts.synthesize(text)
+                buffered.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                ttfa = None
+                async for _chunk in tts.stream(text):
+                    if ttfa is None:
+                        ttfa = time.perf_counter() - start
+                first.append(ttfa)
+                total.append(time.perf_counter() - start)
+
+            ms = lambda xs: 1000 * sorted(xs)[len(xs) // 2]
+            print(f"{tts_ms} ms of audio, {latency_ms:.0f} ms service latency")
+            print(f"  buffered   first audio after {ms(buffered):7.1f} ms")
+            print(f"  streaming  first audio after {ms(first):7.1f} ms (complete at {ms(total):.1f} ms)")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tts-ms", type=int, default=4000)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.tts_ms, args.latency_ms, args.repeats))
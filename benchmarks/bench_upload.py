@@ -0,0 +1,70 @@
+"""
+STT Upload Size Benchmark
+Bytes saved and transcription time for trimmed / encoded uploads
+
+Uses a synthetic utterance shaped like a typical turn: leading
+silence while the caller thinks, a couple of seconds of voiced
+audio, then the trailing silence that ends the recording.
+
+    python -m benchmarks.bench_upload --upload-kbps 256
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from audio.encoding import CompactEncoder
+from benchmarks.mock_deepgram import start_mock_server
+from net.http_pool import HTTPPool
+from stt.async_deepgram_stt import AsyncDeepgramSTT
+
+
+def synthetic_utterance(sample_rate=16000, lead_s=3.0, speech_s=2.0, tail_s=0.9, seed=0):
+    rng = np.random.default_rng(seed)
+    noise = lambda s: rng.normal(0, 60, int(sample_rate * s))
+    t = np.arange(int(sample_rate * speech_s)) / sample_rate
+    speech = 3000 * np.sin(2 * np.pi * 180 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t))
+    audio = np.concatenate([noise(lead_s), speech + noise(speech_s), noise(tail_s)])
+    return audio.astype(np.int16).reshape(-1, 1)
+
+
+async def run(upload_kbps: float, latency_ms: float, repeats: int):
+    pcm = synthetic_utterance()
+    runner, base_url = await start_mock_server(latency_ms=latency_ms, upload_kbps=upload_kbps)
+
+    configs = [
+        ("raw wav", CompactEncoder("wav", trim=False)),
+        ("trim wav", CompactEncoder("wav")),
+        ("trim flac", CompactEncoder("flac")),
+        ("trim opus", CompactEncoder("opus")),
+    ]
+
+    try:
+        async with HTTPPool("mock-key", base_url=base_url) as pool:
+            stt = AsyncDeepgramSTT(pool)
+            print(f"{'config':>10} {'bytes':>9} {'saved':>9} {'e2e ms':>9}")
+            for label, encoder in configs:
+                timings = []
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    data, mimetype, report = encoder.prepare(pcm)
+                    await stt.transcribe(data, mimetype)
+                    timings.append(1000 * (time.perf_counter() - start))
+                print(
+                    f"{label:>10} {report.sent_bytes:>9} {report.saved_bytes:>9} "
+                    f"{np.median(timings):>9.1f}"
+                )
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--upload-kbps", type=float, default=256.0)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.upload_kbps, args.latency_ms, args.repeats))
@@ -0,0 +1,180 @@
+"""
+Offline VAD / Endpointing Evaluation
+Endpointing delay and false cut-offs over labelled WAV fixtures
+
+A fixture directory holds mono 16-bit WAV files plus labels.json:
+
+    {"noisy_line.wav": {"speech": [[3000, 4200], [4700, 6100]]}, ...}
+
+Each file is replayed in recorder-sized chunks through every VAD
+and the same Endpointer the recorders use, then scored:
+
+    delay_ms     endpoint time minus end of the last speech segment
+    cut_off      turn ended while labelled speech was still to come
+    timed_out    turn ran to max_record_ms / start_timeout_ms instead
+
+    python -m benchmarks.eval_vad --synthesize fixtures/vad
+    python -m benchmarks.eval_vad fixtures/vad --silence-ms 600 900
+"""
+
+import argparse
+import json
+import os
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+
+from audio.vad import AdaptiveVAD, EnergyVAD, Endpointer
+
+
+def load_wav(path: str):
+    with wave.open(path, "rb") as wf:
+        if wf.getsampwidth() != 2 or wf.getnchannels() != 1:
+            raise ValueError(f"{path}: expected mono 16-bit PCM")
+        pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        return pcm.reshape(-1, 1), wf.getframerate()
+
+
+def run_endpointing(vad, pcm, sample_rate, silence_ms, chunk_ms=100, max_record_ms=15000, start_timeout_ms=5000):
+    """
+    Replay pcm through vad + Endpointer; return (stop_ms, reason).
+    """
+    config = SimpleNamespace(
+        chunk_ms=chunk_ms,
+        silence_duration_ms=silence_ms,
+        start_timeout_ms=start_timeout_ms,
+        max_record_ms=max_record_ms,
+    )
+    endpoint = Endpointer(config)
+    vad.begin_turn()
+
+    chunk = int(sample_rate * chunk_ms / 1000)
+    for i in range(0, len(pcm) - chunk + 1, chunk):
+        reason = endpoint.update(vad.is_speech(pcm[i: i + chunk]))
+        if reason:
+            return endpoint.total_ms, reason
+
+    return endpoint.total_ms, "end_of_file"
+
+
+def evaluate(fixture_dir, vad_factories, silence_ms_list):
+    with open(os.path.join(fixture_dir, "labels.json"), encoding="utf-8") as f:
+        labels = json.load(f)
+
+    print(f"{'vad':>10} {'silence':>8} {'file':>22} {'stop ms':>8} {'delay':>7} {'result':>10}")
+    summary = {}
+
+    for name, factory in vad_factories.items():
+        for silence_ms in silence_ms_list:
+            delays, cut_offs, timeouts = [], 0, 0
+
+            for filename, label in sorted(labels.items()):
+                pcm, sample_rate = load_wav(os.path.join(fixture_dir, filename))
+                speech_end = max(end for _, end in label["speech"])
+
+                stop_ms, reason = run_endpointing(factory(sample_rate), pcm, sample_rate, silence_ms)
+
+                if reason != "silence":
+                    result = "timeout"
+                    timeouts += 1
+                elif stop_ms < speech_end:
+                    result = "CUT-OFF"
+                    cut_offs += 1
+                else:
+                    result = "ok"
+                    delays.append(stop_ms - speech_end)
+
+                delay = f"{stop_ms - speech_end}" if result == "ok" else "-"
+                print(f"{name:>10} {silence_ms:>8} {filename:>22} {stop_ms:>8} {delay:>7} {result:>10}")
+
+            summary[(name, silence_ms)] = (delays, cut_offs, timeouts)
+
+    print()
+    print(f"{'vad':>10} {'silence':>8} {'mean delay':>11} {'p95 delay':>10} {'cut-offs':>9} {'timeouts':>9}")
+    for (name, silence_ms), (delays, cut_offs, timeouts) in summary.items():
+        mean = f"{np.mean(delays):.0f}" if delays else "-"
+        p95 = f"{np.percentile(delays, 95):.0f}" if delays else "-"
+        print(f"{name:>10} {silence_ms:>8} {mean:>11} {p95:>10} {cut_offs:>9} {timeouts:>9}")
+
+
+# --------------------------------------------------
+# Synthetic fixtures
+# --------------------------------------------------
+
+def _voiced(rng, duration_s, sample_rate, amplitude):
+    """
+    Harmonic "speech" with a syllable-rate envelope.
+    """
+    t = np.arange(int(duration_s * sample_rate)) / sample_rate
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.7 * t + rng.uniform(0, 6))
+    phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+    tone = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = 0.55 + 0.45 * np.sin(2 * np.pi * 4 * t + rng.uniform(0, 6))
+    return amplitude * tone * envelope
+
+
+def synthesize_fixtures(out_dir, sample_rate=16000, seed=7):
+    rng = np.random.default_rng(seed)
+    os.makedirs(out_dir, exist_ok=True)
+
+    scenarios = {
+        # name: (noise_rms, speech_amp, segments_s as (gap_before, length))
+        "clean.wav": (30, 3000, [(1.0, 2.0)]),
+        "quiet_speaker.wav": (40, 350, [(1.0, 2.5)]),
+        "noisy_line.wav": (600, 3500, [(1.5, 2.0)]),
+        "noisy_quiet.wav": (450, 1500, [(1.5, 2.0)]),
+        "mid_pause.wav": (80, 2500, [(1.0, 1.2), (0.5, 1.5)]),
+        "late_start.wav": (60, 2500, [(3.5, 1.5)]),
+    }
+
+    labels = {}
+    for filename, (noise_rms, amp, segments) in scenarios.items():
+        pieces, speech, cursor = [], [], 0.0
+        for gap, length in segments:
+            pieces.append(np.zeros(int(gap * sample_rate)))
+            cursor += gap
+            pieces.append(_voiced(rng, length, sample_rate, amp))
+            speech.append([int(cursor * 1000), int((cursor + length) * 1000)])
+            cursor += length
+        pieces.append(np.zeros(int(3.0 * sample_rate)))
+
+        audio = np.concatenate(pieces)
+        audio += rng.normal(0, noise_rms, len(audio))
+        pcm = np.clip(audio, -32768, 32767).astype(np.int16)
+
+        with wave.open(os.path.join(out_dir, filename), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(sample_rate)
+            wf.writeframes(pcm.tobytes())
+
+        labels[filename] = {"speech": speech}
+
+    with open(os.path.join(out_dir, "labels.json"), "w", encoding="utf-8") as f:
+        json.dump(labels, f, indent=2)
+
+    print(f"Wrote {len(scenarios)} fixtures to {out_dir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("fixture_dir", nargs="?")
+    parser.add_argument("--synthesize", metavar="DIR", help="write synthetic fixtures and exit")
+    parser.add_argument("--silence-ms", type=int, nargs="+", default=[600, 900])
+    parser.add_argument("--threshold", type=float, default=350.0, help="EnergyVAD threshold")
+    args = parser.parse_args()
+
+    if args.synthesize:
+        synthesize_fixtures(args.synthesize)
+    elif args.fixture_dir:
+        evaluate(
+            args.fixture_dir,
+            {
+                "energy": lambda sr: EnergyVAD(args.threshold, sr),
+                "adaptive": lambda sr: AdaptiveVAD(sr),
+            },
+            args.silence_ms,
+        )
+    else:
+        parser.error("fixture_dir or --synthesize is required")
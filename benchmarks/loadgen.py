@@ -0,0 +1,257 @@
+"""
+Gateway Load Generator
+Replays caller WAV files over many concurrent media-stream calls
+
+Each simulated call connects like a telephony provider, streams a
+caller utterance in real-time 20 ms μ-law frames (followed by line
+silence), waits for the agent's reply audio to finish, and repeats
+for --turns turns. Reported per run:
+
+    reply latency   end of caller speech -> first reply frame
+    late frames     sender ticks more than 20 ms behind schedule
+                    (the event loop is saturated)
+    cpu             process CPU seconds per second of wall time
+
+Without --url the gateway and a mock Deepgram run in this process,
+so cpu covers gateway + load generator on one core.
+
+    python -m benchmarks.loadgen --calls 10 50 100
+    python -m benchmarks.loadgen --url ws://127.0.0.1:8765 --wav caller.wav --calls 20
+    python -m benchmarks.loadgen --calls 50 --mock-rate-limit 20 --rate-limit 18
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import uuid
+
+import numpy as np
+import websockets
+
+from benchmarks.eval_vad import load_wav
+from benchmarks.mock_deepgram import STATS, start_mock_server
+from gateway import media
+from telemetry.tracing import tracer
+
+
+FRAME_S = media.FRAME_MS / 1000
+
+
+def caller_utterance(seconds: float = 1.5, seed: int = 0) -> np.ndarray:
+    """
+    Synthetic voiced speech at 8 kHz when no WAV is given.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * media.TELEPHONY_RATE)) / media.TELEPHONY_RATE
+    phase = 2 * np.pi * np.cumsum(140 + 30 * np.sin(2 * np.pi * 0.7 * t)) / media.TELEPHONY_RATE
+    tone = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = 0.55 + 0.45 * np.sin(2 * np.pi * 4 * t + rng.uniform(0, 6))
+    return (2500 * tone * envelope + rng.normal(0, 60, len(t))).astype(np.int16)
+
+
+def load_caller_wav(path: str) -> np.ndarray:
+    pcm, sample_rate = load_wav(path)
+    return media.resample(pcm.reshape(-1), sample_rate, media.TELEPHONY_RATE)
+
+
+def to_frames(pcm: np.ndarray) -> list[bytes]:
+    encoded = media.ulaw_encode(pcm)
+    n = len(encoded) // media.FRAME_BYTES * media.FRAME_BYTES
+    return [encoded[i: i + media.FRAME_BYTES] for i in range(0, n, media.FRAME_BYTES)]
+
+
+SILENCE_FRAME = media.ulaw_encode(
+    np.random.default_rng(1).normal(0, 40, media.FRAME_BYTES).astype(np.int16)
+)
+
+
+# --------------------------------------------------
+# One simulated call
+# --------------------------------------------------
+
+class SimulatedCall:
+    def __init__(self, url: str, utterance_frames: list, turns: int, reply_gap_s: float = 0.4):
+        self.url = url
+        self.utterance = utterance_frames
+        self.turns = turns
+        self.reply_gap = reply_gap_s
+
+        self.latencies = []
+        self.late_frames = 0
+        self.frames_received = 0
+        self.rejected = False
+        self.error = None
+
+        self._last_reply = 0.0
+        self._first_reply = None
+
+    async def _receive(self, ws):
+        async for raw in ws:
+            message = json.loads(raw)
+            if message.get("event") == "media":
+                now = time.perf_counter()
+                self.frames_received += 1
+                self._last_reply = now
+                if self._first_reply is None:
+                    self._first_reply = now
+
+    async def _wait_for_reply_end(self, timeout: float = 30.0):
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if self._first_reply and time.perf_counter() - self._last_reply > self.reply_gap:
+                return True
+            await asyncio.sleep(0.05)
+        return False
+
+    async def _send_frames(self, ws, frames, stop=None):
+        """
+        Send frames on a 20 ms clock; count ticks that fall behind.
+        """
+        next_tick = time.perf_counter()
+        for frame in frames:
+            if stop is not None and stop():
+                return
+            await ws.send(media.media_message(self.sid, frame))
+            next_tick += FRAME_S
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif delay < -FRAME_S:
+                self.late_frames += 1
+
+    async def _line_silence(self, ws, stop):
+        def frames():
+            while True:
+                yield SILENCE_FRAME
+
+        await self._send_frames(ws, frames(), stop)
+
+    async def run(self):
+        self.sid = f"MZ{uuid.uuid4().hex[:16]}"
+        call_sid = f"CA{self.sid[2:]}"
+        # Call ID in the path lets gateway.supervisor shard by call
+        url = f"{self.url.rstrip('/')}/media/{call_sid}"
+        try:
+            async with websockets.connect(url, max_size=None, compression=None) as ws:
+                await ws.send(json.dumps({"event": "connected"}))
+                await ws.send(media.start_message(self.sid, call_sid))
+                receiver = asyncio.create_task(self._receive(ws))
+
+                # Greeting plays first
+                done = False
+                silence = asyncio.create_task(self._line_silence(ws, lambda: done))
+                await self._wait_for_reply_end()
+
+                for _ in range(self.turns):
+                    done = True
+                    await silence
+
+                    await self._send_frames(ws, self.utterance)
+                    spoke_at = time.perf_counter()
+                    self._first_reply = None
+
+                    done = False
+                    silence = asyncio.create_task(self._line_silence(ws, lambda: done))
+                    if await self._wait_for_reply_end():
+                        self.latencies.append(self._first_reply - spoke_at)
+
+                done = True
+                await silence
+                await ws.send(media.stop_message(self.sid))
+                receiver.cancel()
+        except websockets.ConnectionClosed as e:
+            self.rejected = e.rcvd is not None and e.rcvd.code == 1013
+            self.error = None if self.rejected else e
+        except Exception as e:
+            self.error = e
+
+
+# --------------------------------------------------
+# Runs
+# --------------------------------------------------
+
+async def run_load(url: str, calls: int, utterance: np.ndarray, turns: int, ramp_s: float):
+    frames = to_frames(utterance)
+    sims = [SimulatedCall(url, frames, turns) for _ in range(calls)]
+
+    async def start(i, sim):
+        await asyncio.sleep(ramp_s * i / max(calls, 1))
+        await sim.run()
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    await asyncio.gather(*(start(i, s) for i, s in enumerate(sims)))
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+    latencies = [x for s in sims for x in s.latencies]
+    p50 = f"{1000 * np.percentile(latencies, 50):.0f}" if latencies else "-"
+    p95 = f"{1000 * np.percentile(latencies, 95):.0f}" if latencies else "-"
+    late = sum(s.late_frames for s in sims)
+    rejected = sum(s.rejected for s in sims)
+    errors = sum(s.error is not None for s in sims)
+
+    print(
+        f"{calls:>6} {len(latencies):>6} {p50:>8} {p95:>8} "
+        f"{late:>6} {rejected:>5} {errors:>5} {cpu / wall:>6.2f}"
+    )
+    for s in sims:
+        if s.error is not None:
+            print(f"   error: {s.error!r}")
+            break
+
+
+async def main(args):
+    utterance = load_caller_wav(args.wav) if args.wav else caller_utterance()
+
+    runner = gateway = server = None
+    url = args.url
+    if not url:
+        from gateway.server import VoiceGateway
+
+        runner, base_url = await start_mock_server(
+            latency_ms=args.latency_ms, tts_ms=1200, sample_rate=media.TELEPHONY_RATE,
+            rate_limit=args.mock_rate_limit,
+        )
+        cache_dir = tempfile.mkdtemp(prefix="loadgen-tts-")
+        gateway = VoiceGateway(
+            "mock-key", base_url=base_url, max_calls=args.max_calls,
+            cache_dir=cache_dir, log_calls=False, rate_limit=args.rate_limit,
+        )
+        server = await gateway.serve("127.0.0.1", 0)
+        port = list(server.sockets)[0].getsockname()[1]
+        url = f"ws://127.0.0.1:{port}"
+
+    print(f"{'calls':>6} {'turns':>6} {'p50 ms':>8} {'p95 ms':>8} {'late':>6} {'rej':>5} {'err':>5} {'cpu':>6}")
+    try:
+        for calls in args.calls:
+            await run_load(url, calls, utterance, args.turns, args.ramp_s)
+        if gateway is not None:
+            print(f"\nGateway stage latency\n{tracer.summary()}")
+            if args.mock_rate_limit:
+                stats = runner.app[STATS]
+                print(f"Mock Deepgram: {stats['requests']} requests, {stats['throttled']} answered 429")
+    finally:
+        if server is not None:
+            server.close()
+            await gateway.close()
+            await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="gateway websocket URL (default: in-process gateway + mock)")
+    parser.add_argument("--wav", help="caller utterance WAV (mono 16-bit)")
+    parser.add_argument("--calls", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--ramp-s", type=float, default=2.0)
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="mock Deepgram latency")
+    parser.add_argument("--max-calls", type=int, default=500)
+    parser.add_argument("--rate-limit", type=float, help="gateway's Deepgram requests/s limiter")
+    parser.add_argument("--mock-rate-limit", type=float, default=0.0, help="mock answers 429 above this rate")
+    args = parser.parse_args()
+
+    if args.wav and not os.path.exists(args.wav):
+        parser.error(f"{args.wav} not found")
+    asyncio.run(main(args))
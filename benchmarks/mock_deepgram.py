@@ -0,0 +1,123 @@
+"""
+Local Mock Deepgram Endpoint
+Serves /v1/listen and /v1/speak with a fixed artificial latency
+
+With rate_limit (requests per second over both endpoints) it answers
+excess requests with 429 and a Retry-After header, like a project
+that has hit its concurrency quota; app[STATS] counts them.
+
+Run standalone:
+    python -m benchmarks.mock_deepgram --port 8787 --latency-ms 150 --rate-limit 20
+"""
+
+import argparse
+import asyncio
+import math
+import time
+
+from aiohttp import web
+
+
+STATS = web.AppKey("stats", dict)
+
+
+def build_app(
+    latency_ms: float = 150.0,
+    tts_ms: int = 1500,
+    sample_rate: int = 24000,
+    upload_kbps: float = 0.0,
+    tts_realtime: float = 4.0,
+    rate_limit: float = 0.0,
+):
+    delay = latency_ms / 1000
+    silence = bytes(int(sample_rate * tts_ms / 1000) * 2)
+    stats = {"requests": 0, "throttled": 0}
+    bucket = {"tokens": rate_limit, "at": time.monotonic()}
+
+    def throttled():
+        """
+        429 response if this request is over rate_limit, else None.
+        """
+        stats["requests"] += 1
+        if not rate_limit:
+            return None
+        now = time.monotonic()
+        bucket["tokens"] = min(rate_limit, bucket["tokens"] + (now - bucket["at"]) * rate_limit)
+        bucket["at"] = now
+        if bucket["tokens"] >= 1:
+            bucket["tokens"] -= 1
+            return None
+        stats["throttled"] += 1
+        retry_after = math.ceil((1 - bucket["tokens"]) / rate_limit)
+        return web.json_response(
+            {"err_code": "TOO_MANY_REQUESTS", "err_msg": "Too many requests. Please try again later."},
+            status=429,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    async def listen(request: web.Request):
+        body = await request.read()
+        if (rejected := throttled()) is not None:
+            return rejected
+        if upload_kbps:
+            # Simulate a constrained uplink
+            await asyncio.sleep(len(body) * 8 / (upload_kbps * 1000))
+        await asyncio.sleep(delay)
+        return web.json_response({
+            "results": {
+                "channels": [
+                    {"alternatives": [{"transcript": "book an appointment in cardiology"}]}
+                ]
+            }
+        })
+
+    async def speak(request: web.Request):
+        await request.json()
+        if (rejected := throttled()) is not None:
+            return rejected
+        await asyncio.sleep(delay)
+
+        # Stream the audio the way Deepgram does: first bytes early,
+        # the rest paced at tts_realtime x faster than playback
+        response = web.StreamResponse(headers={"Content-Type": "application/octet-stream"})
+        await response.prepare(request)
+        chunk = int(sample_rate * 0.1) * 2
+        for i in range(0, len(silence), chunk):
+            await response.write(silence[i: i + chunk])
+            await asyncio.sleep(0.1 / tts_realtime)
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app[STATS] = stats
+    app.router.add_post("/v1/listen", listen)
+    app.router.add_post("/v1/speak", speak)
+    return app
+
+
+async def start_mock_server(port: int = 0, **kwargs):
+    """
+    Start the mock server on localhost and return (runner, base_url).
+    """
+    runner = web.AppRunner(build_app(**kwargs))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{bound_port}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--upload-kbps", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="requests/s before answering 429")
+    args = parser.parse_args()
+
+    web.run_app(
+        build_app(latency_ms=args.latency_ms, upload_kbps=args.upload_kbps, rate_limit=args.rate_limit),
+        host="127.0.0.1",
+        port=args.port,
+    )
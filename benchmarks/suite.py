@@ -0,0 +1,312 @@
+"""
+Hot Path Benchmark Suite
+Ops/sec and peak allocation per call, with JSON baselines
+
+Groups:
+
+    intent        hospital_agent.intent extractors on caller phrasings
+    storage       save_appointment / find_appointment_by_name /
+                  booked_slots on databases of --sizes records
+    availability  get_doctors / get_available_slots / roster_values
+                  on synthetic rosters of --roster-sizes doctors
+    recorder      SilenceRecorder._rms per block, WAV encoding per turn
+
+Each case runs in batches until --min-time has passed, best of
+five rounds; peak_bytes is the tracemalloc peak over PEAK_CALLS
+extra calls (one for slow cases).
+Baselines are plain JSON; --compare flags cases that got slower or
+allocate more than --tolerance beyond the baseline and exits 1.
+On shared or throttled hosts sub-microsecond cases can swing by
+a third between runs; raise --min-time or --tolerance there.
+
+    python -m benchmarks.suite --save
+    python -m benchmarks.suite --only intent recorder --compare
+    python -m benchmarks.suite --only storage --sizes 1000 10000 --compare
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from hospital_agent import availability, intent, storage
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "suite.json")
+
+# Allocation growth below this is noise (interned strings, caches)
+ALLOC_SLACK_BYTES = 4096
+
+# Calls traced for peak_bytes
+PEAK_CALLS = 32
+
+
+# ------------------------------------------------------
+# Measurement
+# ------------------------------------------------------
+
+def measure(fn, min_time: float = 0.2, rounds: int = 5) -> dict:
+    start = time.perf_counter()
+    fn()  # warm-up
+    single = time.perf_counter() - start
+
+    if single >= min_time:
+        # Slow case (e.g. a million-record file): one timed call is enough
+        start = time.perf_counter()
+        fn()
+        ops_per_sec = 1 / (time.perf_counter() - start)
+    else:
+        batch = max(1, int(min_time / 10 / max(single, 1e-7)))
+        ops_per_sec = 0.0
+        for _ in range(rounds):
+            calls = 0
+            start = time.perf_counter()
+            while True:
+                for _ in range(batch):
+                    fn()
+                calls += batch
+                elapsed = time.perf_counter() - start
+                if elapsed >= min_time:
+                    break
+            ops_per_sec = max(ops_per_sec, calls / elapsed)
+
+    # Enough calls to cycle through every input of the case
+    tracemalloc.start()
+    for _ in range(1 if single >= min_time else PEAK_CALLS):
+        fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"ops_per_sec": ops_per_sec, "peak_bytes": peak}
+
+
+# ------------------------------------------------------
+# Cases
+# ------------------------------------------------------
+# Each group is a generator of (name, fn); setup runs between
+# yields and cleanup in finally, so state never leaks across groups.
+
+UTTERANCES = [
+    "I want to book an appointment in cardiology",
+    "can I see someone in general medicine tomorrow",
+    "yes doctor kumar please",
+    "dr mehta",
+    "the most experienced one",
+    "12 mar",
+    "next week maybe 3 sep if that works",
+    "10:30 am is fine",
+    "2 pm",
+    "my name is Asha Rao",
+    "this is Vikram Singh",
+    "Meena Iyer",
+]
+
+
+def _cycling(fn, inputs):
+    it = itertools.cycle(inputs)
+    return lambda: fn(next(it))
+
+
+def intent_cases(args):
+    doctors = availability.get_doctors("Cardiology")
+    slots = availability.get_available_slots(doctors[0])
+    text = [u.lower() for u in UTTERANCES]
+
+    yield "intent.is_booking", _cycling(intent.is_booking, text)
+    yield "intent.extract_department", _cycling(intent.extract_department, text)
+    yield "intent.extract_doctor_name", _cycling(lambda t: intent.extract_doctor_name(t, doctors), text)
+    yield "intent.extract_patient_name", _cycling(intent.extract_patient_name, text)
+    yield "intent.extract_date", _cycling(intent.extract_date, text)
+    yield "intent.extract_slot", _cycling(lambda t: intent.extract_slot(t, slots), text)
+
+
+def _appointments(start: int, n: int) -> list:
+    # One booking per (doctor, day): no slot clashes
+    return [
+        {
+            "appointment_id": f"APT-{i:012d}",
+            "patient_name": f"Patient {i}",
+            "doctor": f"Dr. Doctor{i % 1000}",
+            "department": "Cardiology",
+            "date": f"day-{i // 1000}",
+            "time": "10:30 AM",
+            "status": "CONFIRMED",
+        }
+        for i in range(start, start + n)
+    ]
+
+
+def storage_cases(args):
+    data_dir = tempfile.mkdtemp(prefix="bench-storage-")
+    original = storage.DATA_FILE
+    try:
+        for n in args.sizes:
+            storage.DATA_FILE = os.path.join(data_dir, f"appointments-{n}.db")
+            storage.import_appointments(_appointments(0, n))
+            new = (_appointments(i, 1)[0] for i in itertools.count(n))
+
+            # Worst case for a scan: the match is the last record
+            yield f"storage.find_appointment_by_name[{n}]", lambda: storage.find_appointment_by_name(f"patient {n - 1}")
+            yield f"storage.save_appointment[{n}]", lambda: storage.save_appointment(next(new))
+            yield f"storage.booked_slots[{n}]", lambda: storage.booked_slots("Dr. Doctor7", "day-0")
+            storage.close()
+    finally:
+        storage.DATA_FILE = original
+        storage.close()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def _roster(n_doctors: int, n_departments: int = 100) -> dict:
+    roster = {}
+    for i in range(n_doctors):
+        roster.setdefault(f"Department {i % n_departments}", []).append({
+            "name": f"Dr. Doctor{i}",
+            "experience": 1 + i % 30,
+            "fee": 300 + 50 * (i % 12),
+            "slots": {
+                "morning": ["9:00 AM", "9:30 AM", "10:00 AM", "11:00 AM"],
+                "afternoon": ["2:00 PM", "3:30 PM", "4:30 PM"],
+            },
+        })
+    return roster
+
+
+def availability_cases(args):
+    original = dict(availability.AVAILABILITY)
+    try:
+        for n in args.roster_sizes:
+            availability.AVAILABILITY.clear()
+            availability.AVAILABILITY.update(_roster(n))
+            names = list(availability.AVAILABILITY)
+            doctors = [d for dept in names for d in availability.AVAILABILITY[dept]]
+
+            yield f"availability.get_doctors[{n}]", _cycling(availability.get_doctors, names)
+            yield f"availability.get_available_slots[{n}]", _cycling(availability.get_available_slots, doctors)
+            yield f"availability.roster_values[{n}]", availability.roster_values
+    finally:
+        availability.AVAILABILITY.clear()
+        availability.AVAILABILITY.update(original)
+
+
+def recorder_cases(args):
+    from audio.encoding import to_wav
+    from audio.recorder import SilenceRecorder
+
+    recorder = SilenceRecorder()
+    rng = np.random.default_rng(0)
+    block = rng.normal(0, 2000, (recorder.chunk_samples, recorder.channels)).astype(np.int16)
+    turn = rng.normal(0, 2000, (recorder.sample_rate * 4, 1)).astype(np.int16)
+
+    yield "recorder._rms[100ms]", lambda: recorder._rms(block)
+    yield "recorder.to_wav[4s]", lambda: to_wav(turn, recorder.sample_rate)
+
+
+GROUPS = {
+    "intent": intent_cases,
+    "storage": storage_cases,
+    "availability": availability_cases,
+    "recorder": recorder_cases,
+}
+
+
+# ------------------------------------------------------
+# Baselines
+# ------------------------------------------------------
+
+def run(args) -> dict:
+    results = {}
+    print(f"{'case':>44} {'ops/s':>12} {'µs/op':>10} {'peak bytes':>12}")
+    for group in args.only:
+        try:
+            for name, fn in GROUPS[group](args):
+                r = results[name] = measure(fn, args.min_time)
+                print(f"{name:>44} {r['ops_per_sec']:>12.1f} {1e6 / r['ops_per_sec']:>10.1f} {r['peak_bytes']:>12}")
+        except ImportError as e:  # e.g. no sounddevice for the recorder group
+            print(f"⚠️ Skipped {group}: {e}")
+    return results
+
+
+def save_baseline(path: str, results: dict):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    baseline = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()}",
+            "processor": platform.processor(),
+        },
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+    print(f"💾 Baseline written to {path}")
+
+
+def compare(path: str, results: dict, tolerance: float, groups=GROUPS) -> list:
+    """
+    Print current vs baseline; returns the regressed case names.
+    """
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    print(f"\n{'case':>44} {'base ops/s':>12} {'ops/s':>12} {'change':>8} {'Δ bytes':>10} {'result':>10}")
+    regressed = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:>44} {'-':>12} {r['ops_per_sec']:>12.1f} {'-':>8} {'-':>10} {'new':>10}")
+            continue
+
+        change = r["ops_per_sec"] / base["ops_per_sec"] - 1
+        grown = r["peak_bytes"] - base["peak_bytes"]
+        slower = change < -tolerance
+        bigger = grown > max(ALLOC_SLACK_BYTES, tolerance * base["peak_bytes"])
+        if slower or bigger:
+            regressed.append(name)
+            result = "REGRESSED"
+        else:
+            result = "faster" if change > tolerance else "ok"
+
+        print(
+            f"{name:>44} {base['ops_per_sec']:>12.1f} {r['ops_per_sec']:>12.1f} "
+            f"{100 * change:>+7.0f}% {grown:>+10} {result:>10}"
+        )
+
+    for name in sorted(set(baseline) - set(results)):
+        if name.split(".")[0] not in groups:
+            continue
+        print(f"{name:>44} {'':>12} {'':>12} {'':>8} {'':>10} {'not run':>10}")
+    return regressed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--only", nargs="+", choices=list(GROUPS), default=list(GROUPS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**3, 10**4, 10**5, 10**6],
+                        help="appointment records per storage case")
+    parser.add_argument("--roster-sizes", type=int, nargs="+", default=[10**3, 10**4, 10**5],
+                        help="doctors per availability case")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing round")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, metavar="PATH")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed fractional slowdown / growth")
+    args = parser.parse_args()
+
+    results = run(args)
+
+    regressed = compare(args.compare, results, args.tolerance, args.only) if args.compare else []
+    if args.save:
+        save_baseline(args.save, results)
+
+    if regressed:
+        print(f"\n❌ {len(regressed)} regression(s): {', '.join(regressed)}")
+        sys.exit(1)
@@ -0,0 +1 @@
+"""Gateway Module"""
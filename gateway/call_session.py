@@ -0,0 +1,409 @@
+"""
+Gateway Call Session
+One phone call: media frames in, agent replies out
+
+Each call owns its HospitalAppointmentAgent, conversation memory,
+VAD/endpointer, STT request and speech pipeline; only the HTTP pool
+and TTS cache are shared across calls.
+
+Backpressure is bounded per call in both directions:
+
+inbound   at most inbound_frames of caller audio are queued; when
+          the session falls behind the oldest frames are dropped
+          (counted in dropped_frames) instead of growing memory.
+outbound  TTS audio is encoded into 20 ms frames on a queue of
+          outbound_frames; synthesis blocks on the full queue, so a
+          call never buffers more than that much reply audio, and a
+          barge-in only has to discard a short queue.
+
+With templates, slow turns are covered by a cached filler and the
+agent's likely next replies are prefetched (tts.speculation).
+
+Upstream requests carry the call's priority for the shared rate
+limiter (net.rate_limit): greetings rank below calls that are mid-
+booking, and a request shed by the limiter is handled like a missed
+turn instead of ending the call.
+"""
+
+import asyncio
+import contextlib
+import time
+
+import numpy as np
+
+from audio.vad import AdaptiveVAD, Endpointer
+from audio.wav import wav_header
+from gateway import media
+from hospital_agent.agent import HospitalAppointmentAgent
+from hospital_agent.availability import doctor_names
+from hospital_agent import response as R
+from language.detect_language import detect_caller_language
+from language.indic_phonetic import convert_for_agent
+from memory.memory import ConversationMemory
+from net.rate_limit import BOOKING, GREETING, TURN, RateLimited, set_priority
+from runtime.executors import BoundedExecutor, StageTimeout, with_timeout
+from telemetry.tracing import tracer
+from telemetry.profiling import profiler
+from tts.speech_pipeline import SpeechPipeline
+from tts.speculation import Speculator
+
+
+class CallPlayer:
+    """
+    SpeechPipeline player that writes paced μ-law frames to a call.
+    """
+
+    def __init__(self, ws, stream_sid: str, sample_rate: int, outbound_frames: int = 25, lead_ms: int = 100):
+        self.ws = ws
+        self.stream_sid = stream_sid
+        self.sample_rate = sample_rate
+        self.lead = lead_ms / 1000
+
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=outbound_frames)
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._leftover = b""
+
+        self.interrupted = False
+        self.frames_sent = 0
+
+    # --------------------------------------------------
+
+    async def run_sender(self):
+        """
+        Send queued frames in real time (up to lead_ms ahead).
+        """
+        loop = asyncio.get_running_loop()
+        frame_s = media.FRAME_MS / 1000
+        next_send = loop.time()
+
+        while True:
+            frame = await self.queue.get()
+            try:
+                now = loop.time()
+                if next_send < now:
+                    next_send = now  # idle gap: restart the clock
+                if next_send - now > self.lead:
+                    await asyncio.sleep(next_send - now - self.lead)
+                await self.ws.send(media.media_message(self.stream_sid, frame))
+                self.frames_sent += 1
+                next_send += frame_s
+            finally:
+                self.queue.task_done()
+
+    async def _enqueue(self, audio_bytes, flush: bool = False):
+        data = self._leftover + bytes(audio_bytes) if self._leftover else bytes(audio_bytes)
+        usable = len(data) - len(data) % 2
+        self._leftover = data[usable:]
+
+        pcm = media.resample(
+            np.frombuffer(data, dtype=np.int16, count=usable // 2),
+            self.sample_rate,
+            media.TELEPHONY_RATE,
+        )
+        pcm = np.concatenate([self._pending, pcm]) if len(self._pending) else pcm
+
+        n = len(pcm) // media.FRAME_BYTES * media.FRAME_BYTES
+        if flush and n < len(pcm):
+            pcm = np.concatenate([pcm, np.zeros(media.FRAME_BYTES - (len(pcm) - n), dtype=np.int16)])
+            n = len(pcm)
+        self._pending = pcm[n:]
+
+        encoded = media.ulaw_encode(pcm[:n])
+        for i in range(0, n, media.FRAME_BYTES):
+            if self.interrupted:
+                return
+            await self.queue.put(encoded[i: i + media.FRAME_BYTES])
+
+    # --------------------------------------------------
+
+    async def play_stream(self, chunks) -> bool:
+        self.interrupted = False
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._leftover = b""
+
+        with tracer.span("playback"):
+            async with contextlib.aclosing(chunks):
+                async for chunk in chunks:
+                    if self.interrupted:
+                        break
+                    await self._enqueue(chunk)
+            if not self.interrupted:
+                await self._enqueue(b"", flush=True)
+
+            await self.queue.join()
+        return not self.interrupted
+
+    async def play_async(self, audio_bytes) -> bool:
+        async def one():
+            yield audio_bytes
+
+        return await self.play_stream(one())
+
+    def stop(self):
+        """
+        Drop queued reply audio and tell the carrier to flush its buffer.
+        """
+        self.interrupted = True
+        while True:
+            try:
+                self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            self.queue.task_done()
+        asyncio.ensure_future(self.ws.send(media.clear_message(self.stream_sid)))
+
+
+class CallSession:
+    # Endpointing config (read by Endpointer, as on the recorders)
+    chunk_ms = 100
+    silence_duration_ms = 700
+    start_timeout_ms = 5000
+    max_record_ms = 12000
+
+    barge_in_ms = 300
+
+    # Upper bound per stage of a turn (seconds)
+    stage_timeouts = {"listen": 30.0, "speak": 90.0}
+
+    def __init__(
+        self,
+        ws,
+        stream_sid: str,
+        call_sid: str,
+        stt,
+        tts,
+        templates=None,
+        inbound_frames: int = 50,
+        outbound_frames: int = 25,
+        caller_phone: str = None,
+    ):
+        self.ws = ws
+        self.stream_sid = stream_sid
+        self.call_sid = call_sid
+        self.stt = stt
+        self.templates = templates
+
+        self.memory = ConversationMemory()
+        self.memory.start_session(call_sid)
+        self.agent = HospitalAppointmentAgent(memory=self.memory, caller_phone=caller_phone)
+        # Agent steps run one at a time, off the shared disk pool
+        self.agent_steps = BoundedExecutor(f"agent-{call_sid}", max_workers=1, max_pending=2)
+
+        self.sample_rate = media.TELEPHONY_RATE
+        self.chunk_samples = self.sample_rate * self.chunk_ms // 1000
+        self.vad = AdaptiveVAD(sample_rate=self.sample_rate)
+
+        self.inbound: asyncio.Queue = asyncio.Queue(maxsize=inbound_frames)
+        self.dropped_frames = 0
+        self.ended = False
+
+        self.player = CallPlayer(ws, stream_sid, tts.sample_rate, outbound_frames)
+        self.speech = SpeechPipeline(tts, self.player, pause_ms=150)
+        self.speculator = Speculator(templates, self.player) if templates else None
+
+        self.speaking = False
+        self.barged_in = False
+        self.turns = 0
+        # Caller's language; picks the TTS voice
+        self.language = "en"
+
+    # --------------------------------------------------
+    # Inbound audio
+    # --------------------------------------------------
+
+    def _push(self, item):
+        if self.inbound.full():
+            self.inbound.get_nowait()
+            self.dropped_frames += 1
+        self.inbound.put_nowait(item)
+
+    async def read_media(self):
+        """
+        Websocket reader: queue caller frames until the call stops.
+        """
+        try:
+            async for raw in self.ws:
+                message = media.parse_message(raw)
+                event = message.get("event")
+                if event == "media":
+                    self._push(media.ulaw_decode(media.media_payload(message)))
+                elif event == "stop":
+                    break
+        finally:
+            self.ended = True
+            self._push(None)
+
+    async def _turn_chunks(self, hold=None, on_speech=None, barge_in_ms: int = 0):
+        """
+        Yield 100 ms PCM chunks of one caller turn (see Endpointer).
+        """
+        endpoint = Endpointer(self, hold=hold, on_speech=on_speech, barge_in_ms=barge_in_ms)
+        self.vad.begin_turn()
+        pending, frames, buffered = [], [], 0
+        started = time.perf_counter()
+
+        while True:
+            frame = await self.inbound.get()
+            if frame is None:
+                self.inbound.put_nowait(None)  # keep the end-of-call marker
+                return
+
+            frames.append(frame)
+            buffered += len(frame)
+            if buffered < self.chunk_samples:
+                continue
+
+            chunk = np.concatenate(frames)
+            frames, buffered = [], 0
+
+            reason = endpoint.update(self.vad.is_speech(chunk))
+            if endpoint.holding:
+                pending = pending + [chunk] if endpoint.held_speech_ms else []
+                continue
+
+            for c in pending + [chunk]:
+                yield c.tobytes()
+            pending = []
+
+            if reason:
+                tracer.record("capture", time.perf_counter() - started, reason=reason)
+                if reason == "silence":
+                    tracer.record("endpointing", endpoint.silence_ms / 1000)
+                return
+
+    async def listen(self, barge_in: bool = False) -> str:
+        kwargs = {}
+        if barge_in:
+            kwargs = dict(
+                hold=lambda: self.speaking,
+                on_speech=self._on_barge_in,
+                barge_in_ms=self.barge_in_ms,
+            )
+
+        async def body():
+            yield wav_header(self.sample_rate)
+            async for chunk in self._turn_chunks(**kwargs):
+                yield chunk
+
+        if self.ended:
+            return ""
+        return (await self.stt.transcribe_stream(body())).strip()
+
+    def _on_barge_in(self):
+        if self.speaking:
+            self.barged_in = True
+            self.player.stop()
+
+    # --------------------------------------------------
+    # Outbound speech
+    # --------------------------------------------------
+
+    async def speak(self, text: str, render=None):
+        self.speaking = True
+        self.barged_in = False
+        try:
+            # Template fragments are cached in the English voice only
+            if render and self.templates and self.language == "en":
+                try:
+                    audio = self.speculator.take(render) or await self.templates.render(*render)
+                except Exception as e:
+                    print(f"⚠️ [{self.call_sid}] Template audio failed: {e}")
+                else:
+                    await self.player.play_async(audio)
+                    return
+
+            await self.speech.speak(
+                text, should_continue=lambda: not self.barged_in, language=self.language
+            )
+        finally:
+            self.speaking = False
+
+    async def respond(self, text: str, render=None) -> str:
+        """
+        Speak while already listening, so the caller can barge in.
+        """
+        self.speaking = True
+        tracer.begin_turn(self.call_sid)
+        t = self.stage_timeouts
+        listening = asyncio.create_task(with_timeout("listen", self.listen(barge_in=True), t["listen"]))
+        try:
+            try:
+                await with_timeout("speak", self.speak(text, render), t["speak"], on_timeout=self.player.stop)
+            except (StageTimeout, RateLimited) as e:
+                print(f"⚠️ [{self.call_sid}] {e}")
+            except Exception as e:
+                # A reply that could not be voiced must not end the call
+                print(f"⚠️ [{self.call_sid}] Reply failed, still listening: {e}")
+
+            return await listening
+        except (StageTimeout, RateLimited) as e:
+            print(f"⚠️ [{self.call_sid}] {e}")
+            return ""
+        finally:
+            listening.cancel()
+
+    async def handle_input(self, user_text: str):
+        """
+        Agent step on this call's executor (it writes bookings to storage).
+
+        Awaited to completion, with no stage timeout; the filler covers
+        a slow step.
+        """
+        self.language = detect_caller_language(user_text, self.language)
+        # The agent matches English keywords: "डॉक्टर कुमार" -> "doctor kumar"
+        user_text = convert_for_agent(user_text, self.language, doctor_names())
+        with tracer.span("handle_input"):
+            reply = await self.agent_steps.run(
+                profiler.call, self.call_sid, self.agent.handle_input, user_text
+            )
+        return reply, self.agent.last_render
+
+    # --------------------------------------------------
+
+    async def converse(self):
+        no_response = 0
+        set_priority(GREETING)
+        user_text = await self.respond(R.GREETING)
+
+        while not self.ended:
+            if not user_text:
+                no_response += 1
+                if no_response >= 2:
+                    break
+                user_text = await self.respond(R.NO_RESPONSE_PROMPT)
+                continue
+
+            no_response = 0
+            self.turns += 1
+            if self.speculator:
+                reply, render = await self.speculator.cover(
+                    self.handle_input(user_text), self.agent.filler()
+                )
+                self.speculator.prefetch(self.agent.predict_next())
+            else:
+                reply, render = await self.handle_input(user_text)
+            set_priority(BOOKING if self.agent.booking_in_progress() else TURN)
+            user_text = await self.respond(reply, render)
+
+    async def run(self):
+        """
+        Serve the call until the caller hangs up or the dialogue ends.
+        """
+        reader = asyncio.create_task(self.read_media())
+        sender = asyncio.create_task(self.player.run_sender())
+        conversation = asyncio.create_task(self.converse())
+        tasks = (reader, sender, conversation)
+        try:
+            # A hang-up (reader) or a dead socket (sender) ends the call
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            if self.speculator:
+                self.speculator.discard()
+            self.agent_steps.shutdown()
+
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"⚠️ [{self.call_sid}] Call ended with error: {result!r}")
@@ -0,0 +1,115 @@
+"""
+Telephony Media Frames
+μ-law codec and Twilio-style media stream messages
+
+Telephony carriers send 8 kHz G.711 μ-law audio in 20 ms frames
+(160 bytes), base64-encoded inside JSON websocket messages:
+
+    {"event": "start", "start": {"streamSid": "...", "callSid": "..."}}
+    {"event": "media", "streamSid": "...", "media": {"payload": "<base64>"}}
+    {"event": "stop",  "streamSid": "..."}
+
+Encoding and decoding are table lookups over whole frames.
+"""
+
+import base64
+import json
+
+import numpy as np
+
+
+TELEPHONY_RATE = 8000
+FRAME_MS = 20
+FRAME_BYTES = TELEPHONY_RATE * FRAME_MS // 1000  # 160 samples, 1 byte each
+
+_BIAS = 0x84
+_CLIP = 32635
+
+
+def _build_decode_table() -> np.ndarray:
+    u = ~np.arange(256, dtype=np.int32) & 0xFF
+    sign = u & 0x80
+    exponent = (u >> 4) & 0x07
+    mantissa = u & 0x0F
+    magnitude = (((mantissa << 3) + _BIAS) << exponent) - _BIAS
+    return np.where(sign, -magnitude, magnitude).astype(np.int16)
+
+
+def _build_encode_table() -> np.ndarray:
+    """
+    μ-law byte for every 14-bit magnitude-with-sign (pcm >> 2).
+    """
+    pcm = np.arange(-8192, 8192, dtype=np.int32) << 2
+    sign = np.where(pcm < 0, 0x80, 0)
+    magnitude = np.minimum(np.abs(pcm), _CLIP) + _BIAS
+    exponent = np.floor(np.log2(magnitude >> 7 | 1)).astype(np.int32)
+    exponent = np.clip(exponent, 0, 7)
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    return (~(sign | (exponent << 4) | mantissa) & 0xFF).astype(np.uint8)
+
+
+ULAW_DECODE = _build_decode_table()
+ULAW_ENCODE = _build_encode_table()
+
+
+def ulaw_decode(data: bytes) -> np.ndarray:
+    return ULAW_DECODE[np.frombuffer(data, dtype=np.uint8)]
+
+
+def ulaw_encode(pcm: np.ndarray) -> bytes:
+    index = (pcm.astype(np.int32) >> 2) + 8192
+    return ULAW_ENCODE[index].tobytes()
+
+
+def resample(pcm: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """
+    Integer-ratio resampling (box filter down, repeat up) with a
+    linear-interpolation fallback for other ratios.
+    """
+    if src_rate == dst_rate or not len(pcm):
+        return pcm
+    if src_rate % dst_rate == 0:
+        k = src_rate // dst_rate
+        n = len(pcm) // k * k
+        return pcm[:n].reshape(-1, k).mean(axis=1).astype(np.int16)
+    if dst_rate % src_rate == 0:
+        return np.repeat(pcm, dst_rate // src_rate)
+    n_out = int(len(pcm) * dst_rate / src_rate)
+    x = np.linspace(0, len(pcm) - 1, n_out)
+    return np.interp(x, np.arange(len(pcm)), pcm).astype(np.int16)
+
+
+# --------------------------------------------------
+# Messages
+# --------------------------------------------------
+
+def parse_message(raw) -> dict:
+    return json.loads(raw)
+
+
+def media_payload(message: dict) -> bytes:
+    return base64.b64decode(message["media"]["payload"])
+
+
+def media_message(stream_sid: str, frame: bytes) -> str:
+    return json.dumps({
+        "event": "media",
+        "streamSid": stream_sid,
+        "media": {"payload": base64.b64encode(frame).decode("ascii")},
+    })
+
+
+def start_message(stream_sid: str, call_sid: str) -> str:
+    return json.dumps({
+        "event": "start",
+        "streamSid": stream_sid,
+        "start": {"streamSid": stream_sid, "callSid": call_sid},
+    })
+
+
+def clear_message(stream_sid: str) -> str:
+    return json.dumps({"event": "clear", "streamSid": stream_sid})
+
+
+def stop_message(stream_sid: str) -> str:
+    return json.dumps({"event": "stop", "streamSid": stream_sid})
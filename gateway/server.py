@@ -0,0 +1,233 @@
+"""
+Multi-call Voice Gateway
+Serves many concurrent calls over websocket media streams
+
+Telephony providers (e.g. Twilio Media Streams) open one websocket
+per call and exchange 8 kHz μ-law frames (see gateway/media.py).
+Every call gets its own CallSession; the HTTP pool, TTS voices and
+TTS cache are shared by all calls in the process. TTS is requested
+at 8 kHz so reply audio only needs μ-law encoding, not resampling.
+
+    python -m gateway.server --port 8765 --max-calls 200
+    python -m gateway.server --deepgram-url http://127.0.0.1:8787   # mock
+
+Profile a live call by its callSid through the control socket:
+
+    PROFILE_SOCKET=/tmp/gateway.sock python -m gateway.server
+    python -m telemetry.profiling /tmp/gateway.sock profile start CA42 cprofile
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+import websockets
+from dotenv import load_dotenv
+
+from gateway import media
+from gateway.call_session import CallSession
+from hospital_agent import response as R
+from hospital_agent.availability import roster_values
+from hospital_agent.storage import ID_ALPHABET
+from net.http_pool import DEEPGRAM_BASE_URL, HTTPPool
+from net.rate_limit import BACKGROUND, RateLimiter, set_priority
+from stt.async_deepgram_stt import AsyncDeepgramSTT
+from tts.async_deepgram_tts import AsyncDeepgramTTS
+from tts.speech_pipeline import prompt_sentences
+from tts.template_renderer import TemplateRenderer
+from tts.tts_cache import CachedTTS, TTSCache
+from tts.tts_router import TTSRouter
+from tts.voice_pool import VoicePool
+from runtime.background import BackgroundTasks, export_metrics
+from telemetry.tracing import tracer
+from telemetry.profiling import profiler
+
+try:
+    from tts.local_tts import LocalTTS
+except ImportError:  # pyttsx3 not installed: no local fallback voice
+    LocalTTS = None
+
+
+# Close code for "try again later" when the gateway is full
+OVER_CAPACITY = 1013
+
+
+class VoiceGateway:
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = DEEPGRAM_BASE_URL,
+        max_calls: int = 200,
+        inbound_frames: int = 50,
+        outbound_frames: int = 25,
+        cache_dir: str = ".tts_cache",
+        log_calls: bool = True,
+        rate_limit: float = None,
+    ):
+        """
+        rate_limit caps Deepgram requests per second across all calls.
+        """
+        self.max_calls = max_calls
+        self.log_calls = log_calls
+        self.inbound_frames = inbound_frames
+        self.outbound_frames = outbound_frames
+
+        self.limiter = RateLimiter("deepgram", rate_limit) if rate_limit else None
+        self.http_pool = HTTPPool(
+            api_key, base_url=base_url, max_connections=max_calls, max_concurrency=max_calls, limiter=self.limiter
+        )
+        tts_cache = TTSCache(cache_dir)
+        self.voices = VoicePool(
+            lambda voice: CachedTTS(
+                AsyncDeepgramTTS(self.http_pool, model=voice, sample_rate=media.TELEPHONY_RATE),
+                tts_cache,
+            ),
+            default_limit=max_calls,
+        )
+        # Without a local voice the router just waits for Deepgram
+        self.tts = TTSRouter(
+            self.voices,
+            fallback=LocalTTS(sample_rate=media.TELEPHONY_RATE) if LocalTTS else None,
+            hedge_ms=400,
+            deadline_ms=1500,
+        )
+        self.templates = TemplateRenderer(self.voices.engine("en"))
+
+        self.calls = {}
+        self.total_calls = 0
+        self.rejected_calls = 0
+        self.background = BackgroundTasks()
+
+    # --------------------------------------------------
+
+    async def _wait_for_start(self, ws):
+        async for raw in ws:
+            message = media.parse_message(raw)
+            if message.get("event") == "start":
+                return message["start"]
+        return None
+
+    async def handle(self, ws):
+        start = await self._wait_for_start(ws)
+        if start is None:
+            return
+
+        if len(self.calls) >= self.max_calls:
+            self.rejected_calls += 1
+            await ws.close(OVER_CAPACITY, "over capacity")
+            return
+
+        session = CallSession(
+            ws,
+            start["streamSid"],
+            start.get("callSid", start["streamSid"]),
+            stt=AsyncDeepgramSTT(self.http_pool),
+            tts=self.tts,
+            templates=self.templates,
+            inbound_frames=self.inbound_frames,
+            outbound_frames=self.outbound_frames,
+            # Caller ID, if the stream is set up with <Parameter name="from" value="{{From}}"/>
+            caller_phone=start.get("customParameters", {}).get("from"),
+        )
+
+        self.calls[session.stream_sid] = session
+        self.total_calls += 1
+        started = time.perf_counter()
+        if self.log_calls:
+            print(f"📞 Call {session.call_sid} started ({len(self.calls)} active)")
+        try:
+            await session.run()
+        finally:
+            del self.calls[session.stream_sid]
+            if self.log_calls:
+                print(
+                    f"📴 Call {session.call_sid} ended after {time.perf_counter() - started:.0f} s, "
+                    f"{session.turns} turns, {session.dropped_frames} frames dropped"
+                )
+            await ws.close()
+
+    # --------------------------------------------------
+
+    async def _warm_up(self):
+        set_priority(BACKGROUND)
+        await self.tts.warm(prompt_sentences(R.FIXED_PROMPTS))
+        await self.templates.warm(R.TEMPLATES, roster_values(), spell=ID_ALPHABET)
+
+    async def serve(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 8765,
+        metrics_file: str = None,
+        control_socket: str = None,
+        path: str = None,
+    ):
+        """
+        Start serving; returns the websockets server.
+
+        With path, listen on that unix socket instead (a supervisor
+        worker, see gateway/supervisor.py).
+        """
+        self.background.spawn("tts-warmup", self._warm_up())
+        tracer.flush_every = None  # the exporter flushes off the loop
+        self.background.spawn("metrics-export", export_metrics(metrics_file))
+        if control_socket:
+            self.background.spawn("profiling-control", profiler.serve(control_socket))
+        # Base64 μ-law barely compresses; permessage-deflate only costs CPU
+        if path:
+            return await websockets.unix_serve(
+                self.handle, path, max_queue=self.inbound_frames, compression=None
+            )
+        return await websockets.serve(
+            self.handle, host, port, max_queue=self.inbound_frames, compression=None
+        )
+
+    async def close(self):
+        await self.background.close()
+        await profiler.close()
+        await self.http_pool.close()
+
+
+# ------------------------------------------------------
+# Entrypoint
+# ------------------------------------------------------
+
+async def _main(args):
+    load_dotenv()
+    tracer.trace_file = os.getenv("TRACE_FILE")
+    gateway = VoiceGateway(
+        os.getenv("DEEPGRAM_API_KEY", "mock-key"),
+        base_url=args.deepgram_url,
+        max_calls=args.max_calls,
+        rate_limit=args.rate_limit,
+    )
+    server = await gateway.serve(
+        args.host, args.port,
+        metrics_file=os.getenv("METRICS_FILE"),
+        control_socket=os.getenv("PROFILE_SOCKET"),
+    )
+    profiler.install_signals()
+    print(f"🏥 Voice gateway listening on ws://{args.host}:{args.port} (max {args.max_calls} calls)")
+    try:
+        await asyncio.Future()
+    finally:
+        server.close()
+        await gateway.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-calls", type=int, default=200)
+    parser.add_argument("--deepgram-url", default=DEEPGRAM_BASE_URL)
+    parser.add_argument(
+        "--rate-limit", type=float, default=float(os.getenv("DEEPGRAM_RATE_LIMIT", "0")) or None,
+        help="Deepgram requests per second across all calls",
+    )
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        print("\n👋 Gateway stopped.")
@@ -0,0 +1,347 @@
+"""
+Gateway Supervisor
+Shards calls across worker processes by consistent hashing
+
+One gateway process is bound to one core (agent NLU, μ-law DSP and
+JSON are GIL-bound), so the supervisor runs N VoiceGateway workers,
+each on its own unix socket, and owns the public port. For every
+new connection it reads the HTTP upgrade request, takes the call ID
+from the URL and relays the raw TCP stream to the worker that owns
+that ID on a hash ring. The supervisor never parses media frames;
+its per-call work is one routing decision plus byte copying.
+
+Configure the provider's stream URL with the call ID, e.g.
+
+    wss://agents.example.com/media/{CallSid}      (or ?callSid=...)
+
+Connections without one are spread round-robin over the ring.
+
+The ring has vnodes points per worker, so each worker owns ~1/N of
+the ID space, and a worker that dies only moves its own calls to the
+next worker on the ring until it is restarted. Bookings are shared
+through the SQLite store (hospital_agent/storage.py), whose unique
+slot index rules out double bookings across workers. A Deepgram
+--rate-limit is split evenly, each worker limiting its own share.
+
+    python -m gateway.supervisor --workers 4 --port 8765
+"""
+
+import argparse
+import asyncio
+import bisect
+import hashlib
+import itertools
+import multiprocessing
+import os
+import signal
+import tempfile
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from dotenv import load_dotenv
+
+from net.http_pool import DEEPGRAM_BASE_URL
+
+
+# ------------------------------------------------------
+# Hash ring
+# ------------------------------------------------------
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    def __init__(self, nodes=(), vnodes: int = 64):
+        self.vnodes = vnodes
+        self._points = []
+        self._owners = []
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> set:
+        return set(self._owners)
+
+    def add(self, node):
+        for i in range(self.vnodes):
+            point = _hash(f"{node}#{i}")
+            at = bisect.bisect(self._points, point)
+            self._points.insert(at, point)
+            self._owners.insert(at, node)
+
+    def remove(self, node):
+        keep = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in keep]
+        self._owners = [o for _, o in keep]
+
+    def walk(self, key: str):
+        """
+        Distinct nodes clockwise from key: the owner, then fallbacks.
+        """
+        if not self._points:
+            return
+        start = bisect.bisect(self._points, _hash(key))
+        seen = set()
+        for i in range(len(self._points)):
+            owner = self._owners[(start + i) % len(self._points)]
+            if owner not in seen:
+                seen.add(owner)
+                yield owner
+
+    def node(self, key: str):
+        return next(self.walk(key), None)
+
+
+def call_key(head: bytes):
+    """
+    Call ID from an HTTP upgrade request: ?callSid= or /media/<id>.
+    """
+    try:
+        target = head.split(b"\r\n", 1)[0].split(b" ")[1].decode("latin-1")
+    except IndexError:
+        return None
+    url = urlsplit(target)
+    query = parse_qs(url.query)
+    for name in ("callSid", "call_sid", "call"):
+        if query.get(name):
+            return query[name][0]
+    segments = [s for s in url.path.split("/") if s]
+    return segments[-1] if len(segments) > 1 else None
+
+
+# ------------------------------------------------------
+# Workers
+# ------------------------------------------------------
+
+def _suffixed(value, index):
+    return f"{value}.{index}" if value else None
+
+
+async def _serve_worker(index: int, path: str, options: dict):
+    from gateway.server import VoiceGateway
+    from telemetry.profiling import profiler
+    from telemetry.tracing import tracer
+
+    # Per-worker trace, metrics and control files
+    tracer.trace_file = _suffixed(os.getenv("TRACE_FILE"), index)
+    gateway = VoiceGateway(
+        os.getenv("DEEPGRAM_API_KEY", "mock-key"),
+        base_url=options["deepgram_url"],
+        max_calls=options["max_calls"],
+        cache_dir=options["cache_dir"],
+        log_calls=options["log_calls"],
+        rate_limit=options["rate_limit"],
+    )
+    server = await gateway.serve(
+        path=path,
+        metrics_file=_suffixed(os.getenv("METRICS_FILE"), index),
+        control_socket=_suffixed(os.getenv("PROFILE_SOCKET"), index),
+    )
+    profiler.install_signals()
+    try:
+        await asyncio.Future()
+    finally:
+        server.close()
+        await gateway.close()
+
+
+def _worker_main(index: int, path: str, options: dict):
+    load_dotenv()
+    try:
+        asyncio.run(_serve_worker(index, path, options))
+    except KeyboardInterrupt:
+        pass
+
+
+# ------------------------------------------------------
+# Supervisor
+# ------------------------------------------------------
+
+class Supervisor:
+    def __init__(
+        self,
+        workers: int = None,
+        deepgram_url: str = DEEPGRAM_BASE_URL,
+        max_calls: int = 200,
+        cache_dir: str = ".tts_cache",
+        log_calls: bool = True,
+        socket_dir: str = None,
+        rate_limit: float = None,
+    ):
+        """
+        max_calls is per worker; rate_limit (requests/s) is for all workers.
+        """
+        self.n_workers = workers or os.cpu_count() or 1
+        self.options = {
+            "rate_limit": rate_limit / self.n_workers if rate_limit else None,
+            "deepgram_url": deepgram_url,
+            "max_calls": max_calls,
+            "cache_dir": cache_dir,
+            "log_calls": log_calls,
+        }
+        self.socket_dir = socket_dir or tempfile.mkdtemp(prefix="gateway-workers-")
+        self.paths = [os.path.join(self.socket_dir, f"worker-{i}.sock") for i in range(self.n_workers)]
+        self.ring = HashRing(range(self.n_workers))
+
+        self.processes = [None] * self.n_workers
+        self.routed = [0] * self.n_workers
+        self.restarts = 0
+        self._context = multiprocessing.get_context("spawn")
+        self._round_robin = itertools.count()
+        self._monitor = None
+        self._server = None
+
+    # --------------------------------------------------
+
+    def _spawn(self, index: int):
+        if os.path.exists(self.paths[index]):
+            os.remove(self.paths[index])
+        process = self._context.Process(
+            target=_worker_main,
+            args=(index, self.paths[index], self.options),
+            name=f"gateway-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        self.processes[index] = process
+
+    async def _wait_ready(self, index: int, timeout: float = 60.0):
+        deadline = time.monotonic() + timeout
+        while not os.path.exists(self.paths[index]):
+            if not self.processes[index].is_alive() or time.monotonic() > deadline:
+                raise RuntimeError(f"Gateway worker {index} failed to start")
+            await asyncio.sleep(0.05)
+
+    async def _watch_workers(self, interval_s: float = 1.0):
+        """
+        Restart dead workers; their calls fall through to the next node meanwhile.
+        """
+        while True:
+            await asyncio.sleep(interval_s)
+            for index, process in enumerate(self.processes):
+                if process.is_alive():
+                    continue
+                print(f"⚠️ Gateway worker {index} exited ({process.exitcode}), restarting")
+                self.restarts += 1
+                self._spawn(index)
+                try:
+                    await self._wait_ready(index)
+                except RuntimeError as e:
+                    print(f"⚠️ {e}")
+
+    # --------------------------------------------------
+
+    async def _route(self, reader, writer):
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 10.0)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+            writer.close()
+            return
+
+        key = call_key(head) or f"rr-{next(self._round_robin)}"
+        upstream = None
+        for index in self.ring.walk(key):
+            try:
+                upstream = await asyncio.open_unix_connection(self.paths[index])
+                break
+            except OSError:
+                continue  # worker down: next node on the ring
+
+        if upstream is None:
+            writer.write(b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n\r\n")
+            await writer.drain()
+            writer.close()
+            return
+
+        self.routed[index] += 1
+        up_reader, up_writer = upstream
+        up_writer.write(head)
+        await asyncio.gather(
+            self._pipe(reader, up_writer),
+            self._pipe(up_reader, writer),
+            return_exceptions=True,
+        )
+
+    @staticmethod
+    async def _pipe(reader, writer):
+        try:
+            while data := await reader.read(65536):
+                writer.write(data)
+                await writer.drain()
+        finally:
+            writer.close()
+
+    # --------------------------------------------------
+
+    async def serve(self, host: str = "0.0.0.0", port: int = 8765):
+        """
+        Start the workers and the public listener; returns the server.
+        """
+        for index in range(self.n_workers):
+            self._spawn(index)
+        await asyncio.gather(*(self._wait_ready(i) for i in range(self.n_workers)))
+
+        self._monitor = asyncio.create_task(self._watch_workers())
+        self._server = await asyncio.start_server(self._route, host, port)
+        return self._server
+
+    async def close(self, timeout: float = 10.0):
+        if self._monitor is not None:
+            self._monitor.cancel()
+        if self._server is not None:
+            self._server.close()
+
+        # SIGINT lets each worker close its gateway cleanly
+        for process in self.processes:
+            if process is not None and process.is_alive():
+                os.kill(process.pid, signal.SIGINT)
+        deadline = time.monotonic() + timeout
+        for process in self.processes:
+            if process is None:
+                continue
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+
+
+# ------------------------------------------------------
+# Entrypoint
+# ------------------------------------------------------
+
+async def _main(args):
+    supervisor = Supervisor(
+        workers=args.workers,
+        deepgram_url=args.deepgram_url,
+        max_calls=args.max_calls,
+        rate_limit=args.rate_limit,
+    )
+    await supervisor.serve(args.host, args.port)
+    print(
+        f"🏥 Voice gateway listening on ws://{args.host}:{args.port} "
+        f"({supervisor.n_workers} workers, max {args.max_calls} calls each)"
+    )
+    try:
+        await asyncio.Future()
+    finally:
+        await supervisor.close()
+        print(f"📊 Calls routed per worker: {supervisor.routed}, restarts: {supervisor.restarts}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-calls", type=int, default=200, help="per worker")
+    parser.add_argument("--deepgram-url", default=DEEPGRAM_BASE_URL)
+    parser.add_argument(
+        "--rate-limit", type=float, default=float(os.getenv("DEEPGRAM_RATE_LIMIT", "0")) or None,
+        help="Deepgram requests per second, shared by all workers",
+    )
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        print("\n👋 Gateway stopped.")
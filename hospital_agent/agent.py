@@ -6,23 +6,56 @@ Final wording fix: availability stated before asking date
 from hospital_agent.state import ConversationState
 from hospital_agent.intent import (
     is_booking,
+    is_cancel,
+    is_reschedule,
     is_yes,
     extract_department,
     extract_doctor_name,
     extract_date,
     extract_slot,
     extract_patient_name,
+    extract_stated_name,
+    extract_appointment_id,
+    extract_phone,
+)
+from hospital_agent.availability import departments, get_doctors, get_available_slots
+from hospital_agent.storage import (
+    SlotTaken,
+    booked_slots,
+    cancel_appointment,
+    find_appointment,
+    generate_appointment_id,
+    reschedule_appointment,
+    save_appointment,
+)
+from hospital_agent import response as R
+
+
+# The caller is partway through booking, moving or cancelling
+BOOKING_STATES = (
+    ConversationState.CONFIRM_APPOINTMENT,
+    ConversationState.COLLECT_DATE,
+    ConversationState.OFFER_SLOTS,
+    ConversationState.COLLECT_PATIENT_NAME,
+    ConversationState.RESCHEDULE_FLOW,
+    ConversationState.CANCEL_FLOW,
 )
-from hospital_agent.availability import get_doctors, get_available_slots
-from hospital_agent.storage import save_appointment, generate_appointment_id
 
 
 class HospitalAppointmentAgent:
-    def __init__(self, memory):
+    def __init__(self, memory, caller_phone: str = None):
         self.memory = memory
         self.state = ConversationState.INTENT_SELECTION
         self.context = {}
 
+        # Caller ID, stored with bookings for phone + name lookups
+        phone = extract_phone(caller_phone) if caller_phone else None
+        if phone:
+            self.context["phone"] = phone
+
+        # (template, fields) behind the last reply, for template TTS
+        self.last_render = None
+
     # ==================================================
     # ENTRY
     # ==================================================
@@ -30,11 +63,12 @@ class HospitalAppointmentAgent:
     def handle_input(self, user_text: str) -> str:
         text = user_text.lower().strip()
         self.memory.add_message("user", user_text)
+        self.last_render = None
         if "fee" in text or "fees" in text or "consultation" in text:
                 doctor = self._resolve_doctor(text)
                 if doctor:
-                    return f"The consultation fee for {doctor['name']} is {doctor['fee']} rupees."
-                return "I couldn't find that doctor in our records."
+                    return self._render(R.CONSULTATION_FEE, doctor=doctor["name"], fee=doctor["fee"])
+                return R.DOCTOR_NOT_FOUND
 
         if self.state == ConversationState.INTENT_SELECTION:
             return self._intent_selection(text)
@@ -57,13 +91,99 @@ class HospitalAppointmentAgent:
         if self.state == ConversationState.COLLECT_PATIENT_NAME:
             return self._collect_patient_name(text)
 
+        if self.state == ConversationState.CANCEL_FLOW:
+            return self._cancel(text)
+
+        if self.state == ConversationState.RESCHEDULE_FLOW:
+            return self._find_for_reschedule(text)
+
         return self._close()
 
+    def _resolve_doctor(self, text: str):
+        """
+        Doctor named in text: this department first, then the roster.
+        """
+        doctors = self.context.get("doctors") or []
+        roster = doctors + [d for dept in departments() for d in get_doctors(dept)]
+        name = extract_doctor_name(text, roster)
+        if name:
+            return next(d for d in roster if d["name"] == name)
+        return self.context.get("doctor")
+
+    def _render(self, template: str, **fields) -> str:
+        self.last_render = (template, fields)
+        return R.render(template, **fields)
+
+    # ==================================================
+    # SPECULATION (read-only: no state, context or storage changes)
+    # ==================================================
+
+    def predict_next(self) -> list:
+        """
+        Likely next replies as (template, fields) for prefetching.
+
+        Fields that depend on the caller's next answer are left out;
+        the voice layer warms what it can and renders complete ones.
+        """
+        state, ctx = self.state, self.context
+
+        if state in (ConversationState.INTENT_SELECTION, ConversationState.COLLECT_DEPARTMENT):
+            # Doctor lists are resolved before the department is named
+            return [
+                (R.DEPARTMENT_DOCTORS, {"doctors": [d["name"] for d in get_doctors(dept)]})
+                for dept in departments()
+            ]
+
+        if state == ConversationState.SELECT_DOCTOR and ctx.get("doctors"):
+            doctors = ctx["doctors"]
+            senior = max(doctors, key=lambda d: d["experience"])
+            return [(R.DOCTOR_AVAILABLE, {"doctor": d["name"]}) for d in doctors] + [
+                (R.MOST_EXPERIENCED, {"doctor": senior["name"], "experience": senior["experience"]})
+            ]
+
+        if state == ConversationState.CONFIRM_APPOINTMENT and ctx.get("doctor"):
+            return [(R.DOCTOR_AVAILABLE, {"doctor": ctx["doctor"]["name"]})]
+
+        if state == ConversationState.COLLECT_DATE and ctx.get("doctor"):
+            # Date still unknown: warm the slot list for this doctor
+            return [(R.SLOTS_ON_DATE, {"slots": get_available_slots(ctx["doctor"])})]
+
+        if state == ConversationState.COLLECT_PATIENT_NAME:
+            return [(R.APPOINTMENT_CONFIRMED, {})]
+
+        if state == ConversationState.CANCEL_FLOW and ctx.get("cancel"):
+            found = ctx["cancel"]
+            return [(R.APPOINTMENT_CANCELLED, {k: found[k] for k in ("doctor", "date", "time")})]
+
+        return []
+
+    def filler(self) -> str:
+        """
+        Phrase to cover the step the next handle_input will run.
+        """
+        if self.state == ConversationState.COLLECT_DATE:
+            return R.FILLER_SEARCH
+        if self.state == ConversationState.COLLECT_PATIENT_NAME:
+            return R.FILLER_COMMIT
+        return R.FILLER_DEFAULT
+
+    def booking_in_progress(self) -> bool:
+        return self.state in BOOKING_STATES
+
     # ==================================================
     # INTENT
     # ==================================================
 
     def _intent_selection(self, text):
+        # Before booking: "cancel my appointment" also says "appointment"
+        if is_cancel(text):
+            self.state = ConversationState.CANCEL_FLOW
+            return self._cancel(text)
+
+        if is_reschedule(text):
+            self.state = ConversationState.RESCHEDULE_FLOW
+            return self._find_for_reschedule(text)
+
         if is_booking(text):
             dept = extract_department(text)
             if dept:
@@ -71,9 +191,9 @@ class HospitalAppointmentAgent:
                 return self._department_availability()
 
             self.state = ConversationState.COLLECT_DEPARTMENT
-            return "Which department would you like to consult?"
+            return R.ASK_DEPARTMENT_NAME
 
-        return "How may I help you with your appointment today?"
+        return R.HELP_PROMPT
 
     # ==================================================
     # DEPARTMENT
@@ -82,7 +202,7 @@ class HospitalAppointmentAgent:
     def _collect_department(self, text):
         dept = extract_department(text)
         if not dept:
-            return "Please tell me the department name."
+            return R.REPEAT_DEPARTMENT
 
         self.context["department"] = dept
         return self._department_availability()
@@ -92,12 +212,7 @@ class HospitalAppointmentAgent:
         self.context["doctors"] = doctors
         self.state = ConversationState.SELECT_DOCTOR
 
-        names = ", ".join(d["name"] for d in doctors)
-        return (
-            "let me look the Available doctors in this department are "
-            f"{names}. "
-            "Do you have a preferred doctor?"
-        )
+        return self._render(R.DEPARTMENT_DOCTORS, doctors=[d["name"] for d in doctors])
 
     # ==================================================
     # DOCTOR
@@ -113,10 +228,7 @@ class HospitalAppointmentAgent:
             self.context["doctor"] = doctor
             self.state = ConversationState.COLLECT_DATE
 
-            return (
-                f"{doctor['name']} is available. "
-                "Do you have a specific date you would like to visit?"
-            )
+            return self._render(R.DOCTOR_AVAILABLE, doctor=doctor["name"])
 
         # Senior doctor
         if any(k in text for k in ["senior", "experienced", "most experienced", "best"]):
@@ -124,13 +236,13 @@ class HospitalAppointmentAgent:
             self.context["doctor"] = doctor
             self.state = ConversationState.CONFIRM_APPOINTMENT
 
-            return (
-                f"{doctor['name']} has {doctor['experience']} years of experience "
-                "and is the most experienced doctor in this department. "
-                f"Would you like to book an appointment with {doctor['name']}?"
+            return self._render(
+                R.MOST_EXPERIENCED,
+                doctor=doctor["name"],
+                experience=doctor["experience"],
             )
 
-        return "Please tell me the doctor’s name."
+        return R.REPEAT_DOCTOR
 
     # ==================================================
     # CONFIRM
@@ -140,13 +252,10 @@ class HospitalAppointmentAgent:
         if is_yes(text):
             self.state = ConversationState.COLLECT_DATE
             d = self.context["doctor"]
-            return (
-                f"{d['name']} is available. "
-                "Do you have a specific date you would like to visit?"
-            )
+            return self._render(R.DOCTOR_AVAILABLE, doctor=d["name"])
 
         self.state = ConversationState.SELECT_DOCTOR
-        return "Alright. Would you like to choose another doctor?"
+        return R.CHOOSE_ANOTHER_DOCTOR
 
     # ==================================================
     # DATE
@@ -155,14 +264,23 @@ class HospitalAppointmentAgent:
     def _collect_date(self, text):
         date = extract_date(text)
         if not date:
-            return "Please tell me the exact date you would like to visit."
+            return R.REPEAT_DATE
 
         self.context["date"] = date
-        slots = get_available_slots(self.context["doctor"])
+        slots = self._free_slots()
+        if not slots:
+            return self._render(R.NO_SLOTS_ON_DATE, date=date)
+
         self.context["slots"] = slots
         self.state = ConversationState.OFFER_SLOTS
 
-        return f"Available slots on {date} are {', '.join(slots)}. Which one works?"
+        return self._render(R.SLOTS_ON_DATE, date=date, slots=slots)
+
+    def _free_slots(self):
+        # Bookings from every agent process share one store
+        doctor = self.context["doctor"]
+        taken = booked_slots(doctor["name"], self.context["date"])
+        return [s for s in get_available_slots(doctor) if s not in taken]
 
     # ==================================================
     # SLOT
@@ -171,11 +289,18 @@ class HospitalAppointmentAgent:
     def _offer_slots(self, text):
         slot = extract_slot(text, self.context["slots"])
         if not slot:
-            return "Please select one of the available time slots."
+            return R.REPEAT_SLOT
 
         self.context["time"] = slot
+        if self.context.get("reschedule"):
+            return self._reschedule()
+
+        if self.context.get("patient_name"):
+            # Re-offered after a clash: the name is already known
+            return self._book()
+
         self.state = ConversationState.COLLECT_PATIENT_NAME
-        return "May I have the patient’s full name to confirm the booking?"
+        return R.ASK_PATIENT_NAME
 
     # ==================================================
     # PATIENT
@@ -184,24 +309,172 @@ class HospitalAppointmentAgent:
     def _collect_patient_name(self, text):
         name = extract_patient_name(text)
         if not name:
-            return "Please repeat the patient’s full name."
+            return R.REPEAT_PATIENT_NAME
+
+        self.context["patient_name"] = name
+        return self._book()
 
-        appt_id = generate_appointment_id()
-        save_appointment({
-            "appointment_id": appt_id,
-            "patient_name": name,
+    def _book(self):
+        appointment = {
+            "appointment_id": generate_appointment_id(),
+            "patient_name": self.context["patient_name"],
             "doctor": self.context["doctor"]["name"],
             "department": self.context["department"],
             "date": self.context["date"],
             "time": self.context["time"],
             "status": "CONFIRMED",
-        })
+            "phone": self.context.get("phone"),
+        }
+        try:
+            save_appointment(appointment)
+        except SlotTaken:
+            return self._slot_taken()
+
+        self.state = ConversationState.CLOSE
+        return self._render(R.APPOINTMENT_CONFIRMED, appt_id=appointment["appointment_id"])
+
+    def _slot_taken(self):
+        # Another call took the slot since it was offered
+        date, taken = self.context["date"], self.context.pop("time")
+        slots = self._free_slots()
+        if not slots:
+            self.state = ConversationState.COLLECT_DATE
+            return self._render(R.NO_SLOTS_ON_DATE, date=date)
 
-        return (
-            f"Your appointment is confirmed. "
-            f"Your appointment ID is {appt_id}. "
-            "We look forward to seeing you."
+        self.context["slots"] = slots
+        self.state = ConversationState.OFFER_SLOTS
+        return self._render(R.SLOT_TAKEN, time=taken, date=date, slots=slots)
+
+    # ==================================================
+    # CANCEL / RESCHEDULE
+    # ==================================================
+
+    def _lookup_key(self, text):
+        """
+        Appointment ID, or phone (spoken or caller ID) and patient name.
+
+        A name is taken only after "my name is", or as the whole answer
+        to ASK_LOOKUP_NAME; any other sentence is not a name.
+        """
+        appt_id = extract_appointment_id(text)
+        if appt_id:
+            return {"appointment_id": appt_id}
+
+        phone = extract_phone(text) or self.context.get("lookup_phone") or self.context.get("phone")
+        if self.context.pop("asked_name", False) and not extract_phone(text):
+            name = extract_patient_name(text)
+        else:
+            name = extract_stated_name(text)
+
+        if phone and name:
+            return {"phone": phone, "patient_name": name}
+        return None
+
+    def _ask_lookup(self, text):
+        """
+        Prompt for what the lookup still needs.
+        """
+        phone = extract_phone(text) or self.context.get("lookup_phone") or self.context.get("phone")
+        if not phone:
+            return R.ASK_APPOINTMENT_LOOKUP
+        self.context.update(lookup_phone=phone, asked_name=True)
+        return R.ASK_LOOKUP_NAME
+
+    def _cancel(self, text):
+        if self.context.get("cancel"):
+            return self._confirm_cancel(text)
+
+        key = self._lookup_key(text)
+        if not key:
+            return self._ask_lookup(text)
+
+        if "appointment_id" in key:
+            # The caller named the booking: lookup and cancel in one
+            # statement, so the slot is free at once
+            return self._cancelled(cancel_appointment(**key))
+
+        # Phone + name may match a booking the caller did not mean:
+        # read it back before cancelling
+        appointment = find_appointment(**key)
+        if appointment is None:
+            return R.APPOINTMENT_NOT_FOUND
+
+        self.context["cancel"] = appointment
+        return self._render(
+            R.CANCEL_FOUND,
+            doctor=appointment["doctor"],
+            date=appointment["date"],
+            time=appointment["time"],
+        )
+
+    def _confirm_cancel(self, text):
+        if is_yes(text):
+            appointment = self.context.pop("cancel")
+            return self._cancelled(cancel_appointment(appointment_id=appointment["appointment_id"]))
+
+        del self.context["cancel"]
+        return R.ASK_APPOINTMENT_LOOKUP
+
+    def _cancelled(self, appointment):
+        if appointment is None:
+            return R.APPOINTMENT_NOT_FOUND
+
+        self.state = ConversationState.CLOSE
+        return self._render(
+            R.APPOINTMENT_CANCELLED,
+            doctor=appointment["doctor"],
+            date=appointment["date"],
+            time=appointment["time"],
+        )
+
+    def _find_for_reschedule(self, text):
+        key = self._lookup_key(text)
+        if not key:
+            return self._ask_lookup(text)
+
+        appointment = find_appointment(**key)
+        if appointment is None:
+            return R.APPOINTMENT_NOT_FOUND
+
+        roster = [d for dept in departments() for d in get_doctors(dept)]
+        doctor = next((d for d in roster if d["name"] == appointment["doctor"]), None)
+        if doctor is None:
+            self.state = ConversationState.INTENT_SELECTION
+            return R.DOCTOR_NOT_FOUND
+
+        self.context.update(reschedule=appointment, doctor=doctor, department=appointment["department"])
+        self.state = ConversationState.COLLECT_DATE
+        return self._render(
+            R.RESCHEDULE_FOUND,
+            doctor=doctor["name"],
+            date=appointment["date"],
+            time=appointment["time"],
+        )
+
+    def _reschedule(self):
+        appointment = self.context["reschedule"]
+        try:
+            # One UPDATE moves the booking and frees the old slot
+            moved = reschedule_appointment(
+                appointment["appointment_id"], self.context["date"], self.context["time"]
+            )
+        except SlotTaken:
+            return self._slot_taken()
+
+        if moved is None:
+            # Cancelled elsewhere since we found it
+            del self.context["reschedule"]
+            self.state = ConversationState.RESCHEDULE_FLOW
+            return R.APPOINTMENT_NOT_FOUND
+
+        self.state = ConversationState.CLOSE
+        return self._render(
+            R.APPOINTMENT_RESCHEDULED,
+            doctor=moved["doctor"],
+            date=moved["date"],
+            time=moved["time"],
+            appt_id=moved["appointment_id"],
         )
 
     def _close(self):
-        return "Thank you for calling CityCare Hospital. Have a pleasant day."
+        return R.CLOSING
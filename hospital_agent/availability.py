@@ -53,12 +53,32 @@ AVAILABILITY = {
 }
 
 
+def departments() -> list[str]:
+    return list(AVAILABILITY)
+
+
 def get_doctors(department: str) -> list[dict]:
     return AVAILABILITY.get(department, [])
 
 
+def doctor_names() -> list[str]:
+    return [d["name"] for doctors in AVAILABILITY.values() for d in doctors]
+
+
 def get_available_slots(doctor: dict) -> list[str]:
     slots = []
     for times in doctor["slots"].values():
         slots.extend(times)
     return slots
+
+
+def roster_values() -> list[str]:
+    """
+    Every doctor name, fee, experience and slot, as spoken strings.
+    """
+    return sorted({
+        str(v)
+        for doctors in AVAILABILITY.values()
+        for d in doctors
+        for v in [d["name"], d["fee"], d["experience"]] + get_available_slots(d)
+    })
@@ -46,20 +46,22 @@ def is_no(text: str) -> bool:
 # --------------------------------------------------
 
 def extract_department(text: str):
-    departments = [
-        "cardiology",
-        "orthopedics",
-        "neurology",
-        "dermatology",
-        "ent",
-        "general medicine",
-        "pediatrics",
-        "gynecology",
-    ]
-
-    for dept in departments:
-        if dept in text:
-            return dept.title()
+    departments = {
+        "cardiology": "Cardiology",
+        "orthopedics": "Orthopedics",
+        "neurology": "Neurology",
+        "dermatology": "Dermatology",
+        "ent": "Ent",
+        "general medicine": "General",
+        "general": "General",
+        "pediatrics": "Pediatrics",
+        "gynecology": "Gynecology",
+    }
+
+    for phrase, dept in departments.items():
+        # Whole words only: "appointment" must not match "ent"
+        if re.search(rf"\b{phrase}\b", text):
+            return dept
 
     return None
 
@@ -118,6 +120,41 @@ def extract_patient_name(text: str):
     return None
 
 
+def extract_stated_name(text: str):
+    """
+    Name only when introduced: 'my number is ... and my name is asha rao'.
+
+    Unlike extract_patient_name, a bare short phrase is not a name.
+    """
+    m = re.search(r"name is ([a-zA-Z ]+)", text)
+    if not m:
+        return None
+    name = re.split(r"\b(?:and|my|phone|number)\b", m.group(1))[0].strip()
+    return name.title() or None
+
+
+def extract_appointment_id(text: str):
+    """
+    'APT-20260210182031', 'a p t 2026 0210 1820 31 4F2' -> 'APT-...'
+    """
+    compact = re.sub(r"[\s\-.]", "", text.lower())
+    m = re.search(r"apt(\d{14}(?:[0-9a-f]{3})?)", compact)
+    if m:
+        return "APT-" + m.group(1).upper()
+    return None
+
+
+def extract_phone(text: str):
+    """
+    Last 10 digits of a spoken or caller-ID number ('+91 98765 43210').
+    """
+    joined = re.sub(r"(?<=\d)[\s\-]+(?=\d)", "", text)
+    m = re.search(r"\d{10,13}", joined)
+    if m:
+        return m.group(0)[-10:]
+    return None
+
+
 def extract_date(text: str):
     text = text.lower()
 
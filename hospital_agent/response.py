@@ -51,3 +51,129 @@ def booking_success():
 
 def close():
     return "Thank you. Have a good day."
+
+
+# --------------------------------------------------
+# HospitalAppointmentAgent prompts
+# --------------------------------------------------
+# Fixed lines are spoken verbatim and are good TTS cache candidates.
+# Templates use str.format fields; the voice layer synthesizes the
+# static fragments once and only the fields at runtime.
+
+GREETING = (
+    "Hello, this is the hospital appointment desk. "
+    "How may I help you today?"
+)
+NO_RESPONSE_PROMPT = "Hello, can you hear me?"
+
+HELP_PROMPT = "How may I help you with your appointment today?"
+ASK_DEPARTMENT_NAME = "Which department would you like to consult?"
+REPEAT_DEPARTMENT = "Please tell me the department name."
+REPEAT_DOCTOR = "Please tell me the doctor’s name."
+CHOOSE_ANOTHER_DOCTOR = "Alright. Would you like to choose another doctor?"
+REPEAT_DATE = "Please tell me the exact date you would like to visit."
+REPEAT_SLOT = "Please select one of the available time slots."
+ASK_PATIENT_NAME = "May I have the patient’s full name to confirm the booking?"
+REPEAT_PATIENT_NAME = "Please repeat the patient’s full name."
+DOCTOR_NOT_FOUND = "I couldn't find that doctor in our records."
+CLOSING = "Thank you for calling CityCare Hospital. Have a pleasant day."
+ASK_APPOINTMENT_LOOKUP = "Please tell me your appointment ID, or your phone number and full name."
+ASK_LOOKUP_NAME = "Please tell me the patient's full name, or the appointment ID."
+APPOINTMENT_NOT_FOUND = (
+    "I couldn't find a confirmed appointment with those details. "
+    "Please tell me the appointment ID, or your phone number and full name."
+)
+
+# Fillers played while a slow step runs
+FILLER_DEFAULT = "One moment, please."
+FILLER_SEARCH = "Let me check the availability."
+FILLER_COMMIT = "Let me book that for you."
+
+FIXED_PROMPTS = [
+    GREETING,
+    NO_RESPONSE_PROMPT,
+    HELP_PROMPT,
+    ASK_DEPARTMENT_NAME,
+    REPEAT_DEPARTMENT,
+    REPEAT_DOCTOR,
+    CHOOSE_ANOTHER_DOCTOR,
+    REPEAT_DATE,
+    REPEAT_SLOT,
+    ASK_PATIENT_NAME,
+    REPEAT_PATIENT_NAME,
+    DOCTOR_NOT_FOUND,
+    CLOSING,
+    ASK_APPOINTMENT_LOOKUP,
+    ASK_LOOKUP_NAME,
+    APPOINTMENT_NOT_FOUND,
+    FILLER_DEFAULT,
+    FILLER_SEARCH,
+    FILLER_COMMIT,
+]
+
+CONSULTATION_FEE = "The consultation fee for {doctor} is {fee} rupees."
+DEPARTMENT_DOCTORS = (
+    "let me look the Available doctors in this department are {doctors}. "
+    "Do you have a preferred doctor?"
+)
+DOCTOR_AVAILABLE = (
+    "{doctor} is available. "
+    "Do you have a specific date you would like to visit?"
+)
+MOST_EXPERIENCED = (
+    "{doctor} has {experience} years of experience "
+    "and is the most experienced doctor in this department. "
+    "Would you like to book an appointment with {doctor}?"
+)
+SLOTS_ON_DATE = "Available slots on {date} are {slots}. Which one works?"
+SLOT_TAKEN = (
+    "Sorry, {time} on {date} was just booked. "
+    "The remaining slots are {slots}. Which one works?"
+)
+NO_SLOTS_ON_DATE = "There are no free slots on {date}. Would another date work?"
+APPOINTMENT_CONFIRMED = (
+    "Your appointment is confirmed. "
+    "Your appointment ID is {appt_id}. "
+    "We look forward to seeing you."
+)
+APPOINTMENT_CANCELLED = (
+    "Your appointment with {doctor} on {date} at {time} has been cancelled. "
+    "Thank you for letting us know."
+)
+CANCEL_FOUND = (
+    "I found your appointment with {doctor} on {date} at {time}. "
+    "Shall I cancel it?"
+)
+RESCHEDULE_FOUND = (
+    "I found your appointment with {doctor} on {date} at {time}. "
+    "Which date would you like to move it to?"
+)
+APPOINTMENT_RESCHEDULED = (
+    "Your appointment with {doctor} is moved to {date} at {time}. "
+    "Your appointment ID is still {appt_id}."
+)
+
+TEMPLATES = [
+    CONSULTATION_FEE,
+    DEPARTMENT_DOCTORS,
+    DOCTOR_AVAILABLE,
+    MOST_EXPERIENCED,
+    SLOTS_ON_DATE,
+    SLOT_TAKEN,
+    NO_SLOTS_ON_DATE,
+    APPOINTMENT_CONFIRMED,
+    APPOINTMENT_CANCELLED,
+    CANCEL_FOUND,
+    RESCHEDULE_FOUND,
+    APPOINTMENT_RESCHEDULED,
+]
+
+
+def render(template: str, **fields) -> str:
+    """
+    Fill a template; list values are read out comma-separated.
+    """
+    return template.format(**{
+        k: ", ".join(v) if isinstance(v, (list, tuple)) else v
+        for k, v in fields.items()
+    })
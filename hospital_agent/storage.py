@@ -1,50 +1,308 @@
 """
-Simple file-based appointment storage
+Appointment storage
+SQLite, shared by every agent process on the host
+
+One row per appointment. A partial unique index on (doctor, date,
+time) over CONFIRMED rows makes a double booking impossible even
+when several worker processes commit at once: the losing INSERT
+fails and save_appointment raises SlotTaken. WAL mode lets readers
+run while a booking commits; each thread keeps its own connection.
+
+Bookings are looked up by appointment ID (primary key) or by phone
+and patient name (by_phone_name index); several bookings for the
+same phone and name resolve to the first one made (dates are
+free-form text and do not sort). Cancelling and rescheduling are
+each a single UPDATE ... RETURNING: the row leaves (or moves within)
+the slot index in the same statement, so a freed slot can be booked
+by the next caller at once and no read-modify-write race is
+possible.
+
+Bookings from the old appointments.json can be imported with:
+
+    python -m hospital_agent.storage --import appointments.json
 """
 
 import json
 import os
+import secrets
+import sqlite3
+import string
+import threading
 from datetime import datetime
 
-DATA_FILE = "appointments.json"
+from telemetry.tracing import tracer
+
+# Overridable so simulations and tests never touch the live file
+DATA_FILE = os.getenv("APPOINTMENTS_FILE", "appointments.db")
+
+# IDs are ID_PREFIX-<timestamp><3 uppercase hex digits>
+ID_PREFIX = "APT"
+ID_ALPHABET = ID_PREFIX + string.digits + "ABCDEF"
+
+FIELDS = ("appointment_id", "patient_name", "doctor", "department", "date", "time", "status", "phone")
+
+TABLE = """
+CREATE TABLE IF NOT EXISTS appointments (
+    appointment_id TEXT PRIMARY KEY,
+    patient_name   TEXT NOT NULL,
+    doctor         TEXT NOT NULL,
+    department     TEXT,
+    date           TEXT NOT NULL,
+    time           TEXT NOT NULL,
+    status         TEXT NOT NULL,
+    phone          TEXT
+);
+"""
+
+INDEXES = """
+CREATE UNIQUE INDEX IF NOT EXISTS slot_taken
+    ON appointments (doctor, date, time) WHERE status = 'CONFIRMED';
+CREATE INDEX IF NOT EXISTS by_patient
+    ON appointments (patient_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS by_phone_name
+    ON appointments (phone, patient_name COLLATE NOCASE) WHERE phone IS NOT NULL;
+"""
 
+# Columns named by SQLite when an INSERT/UPDATE violates a unique key
+SLOT_COLUMNS = "appointments.doctor, appointments.date, appointments.time"
+ID_COLUMN = "appointments.appointment_id"
 
-def _load_data():
-    if not os.path.exists(DATA_FILE):
-        return []
+_local = threading.local()
 
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
 
+class SlotTaken(RuntimeError):
+    def __init__(self, doctor: str, date: str, time: str):
+        super().__init__(f"{doctor} is already booked on {date} at {time}")
+        self.doctor = doctor
+        self.date = date
+        self.time = time
 
-def _save_data(data):
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+
+def _connect() -> sqlite3.Connection:
+    """
+    This thread's connection to DATA_FILE (reopened if it changed).
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.path == DATA_FILE:
+        return conn
+    if conn is not None:
+        conn.close()
+
+    conn = sqlite3.connect(DATA_FILE, timeout=10.0, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(TABLE)
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(appointments)")}
+    if "phone" not in columns:
+        # Databases created before phone lookups
+        conn.execute("ALTER TABLE appointments ADD COLUMN phone TEXT")
+    conn.executescript(INDEXES)
+    _local.conn, _local.path = conn, DATA_FILE
+    return conn
+
+
+def _clash(error: sqlite3.IntegrityError):
+    """
+    "slot" or "id" for a unique-key violation, None for anything else.
+    """
+    message = str(error)
+    if SLOT_COLUMNS in message:
+        return "slot"
+    if ID_COLUMN in message:
+        return "id"
+    return None
+
+
+def close():
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
 
 
 def generate_appointment_id():
     ts = datetime.now().strftime("%Y%m%d%H%M%S")
-    return f"APT-{ts}"
+    # Suffix keeps IDs unique across processes booking in the same second
+    return f"{ID_PREFIX}-{ts}{secrets.token_hex(2)[:3].upper()}"
 
 
 def save_appointment(appointment: dict):
-    data = _load_data()
-    data.append(appointment)
-    _save_data(data)
+    """
+    Insert a booking; raises SlotTaken if the slot is already booked.
+
+    A clashing appointment_id is replaced in the dict and retried.
+    """
+    with tracer.span("save_appointment"):
+        conn = _connect()
+        for _ in range(5):
+            try:
+                conn.execute(
+                    f"INSERT INTO appointments ({', '.join(FIELDS)}) VALUES ({', '.join('?' * len(FIELDS))})",
+                    [appointment.get(f) for f in FIELDS],
+                )
+                return
+            except sqlite3.IntegrityError as e:
+                clash = _clash(e)
+                if clash == "slot":
+                    raise SlotTaken(appointment["doctor"], appointment["date"], appointment["time"]) from e
+                if clash != "id":
+                    raise
+                appointment["appointment_id"] = generate_appointment_id()
+        raise RuntimeError("Could not allocate a unique appointment ID")
+
+
+def booked_slots(doctor: str, date: str) -> set:
+    rows = _connect().execute(
+        "SELECT time FROM appointments WHERE doctor = ? AND date = ? AND status = 'CONFIRMED'",
+        (doctor, date),
+    )
+    return {row["time"] for row in rows}
 
 
 def find_appointment_by_name(name: str):
-    data = _load_data()
-    for appt in data:
-        if appt["patient_name"].lower() == name.lower() and appt["status"] == "CONFIRMED":
-            return appt
-    return None
+    row = _connect().execute(
+        "SELECT * FROM appointments WHERE patient_name = ? COLLATE NOCASE AND status = 'CONFIRMED' "
+        "ORDER BY rowid LIMIT 1",
+        (name,),
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def _lookup(appointment_id: str = None, phone: str = None, patient_name: str = None):
+    """
+    WHERE clause and parameters for the caller's confirmed booking.
+    """
+    if appointment_id:
+        return "appointment_id = ? AND status = 'CONFIRMED'", [appointment_id]
+    if phone and patient_name:
+        return (
+            "phone = ? AND patient_name = ? COLLATE NOCASE AND status = 'CONFIRMED'",
+            [phone, patient_name],
+        )
+    raise ValueError("Look up by appointment_id, or by phone and patient_name")
+
+
+def find_appointment(appointment_id: str = None, phone: str = None, patient_name: str = None):
+    """
+    The confirmed booking with this ID, or the first made for phone + name.
+    """
+    where, params = _lookup(appointment_id, phone, patient_name)
+    row = _connect().execute(
+        f"SELECT * FROM appointments WHERE {where} ORDER BY rowid LIMIT 1", params
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def cancel_appointment(appointment_id: str = None, phone: str = None, patient_name: str = None):
+    """
+    Cancel the booking find_appointment would return; returns it or None.
+    """
+    where, params = _lookup(appointment_id, phone, patient_name)
+    with tracer.span("save_appointment", op="cancel"):
+        row = _connect().execute(
+            "UPDATE appointments SET status = 'CANCELLED' WHERE rowid = "
+            f"(SELECT rowid FROM appointments WHERE {where} ORDER BY rowid LIMIT 1) "
+            "RETURNING *",
+            params,
+        ).fetchone()
+    return dict(row) if row else None
+
+
+def reschedule_appointment(appointment_id: str, date: str, time: str):
+    """
+    Move a confirmed booking to another slot of the same doctor.
+
+    Returns the updated booking, or None if it is no longer confirmed;
+    raises SlotTaken if the new slot is booked.
+    """
+    with tracer.span("save_appointment", op="reschedule"):
+        try:
+            row = _connect().execute(
+                "UPDATE appointments SET date = ?, time = ? "
+                "WHERE appointment_id = ? AND status = 'CONFIRMED' RETURNING *",
+                (date, time, appointment_id),
+            ).fetchone()
+        except sqlite3.IntegrityError as e:
+            if _clash(e) != "slot":
+                raise
+            doctor = _connect().execute(
+                "SELECT doctor FROM appointments WHERE appointment_id = ?", (appointment_id,)
+            ).fetchone()
+            raise SlotTaken(doctor["doctor"] if doctor else None, date, time) from e
+    return dict(row) if row else None
 
 
 def update_appointment(appointment_id: str, updates: dict):
-    data = _load_data()
-    for appt in data:
-        if appt["appointment_id"] == appointment_id:
-            appt.update(updates)
-            break
-    _save_data(data)
+    fields = [f for f in updates if f in FIELDS and f != "appointment_id"]
+    if not fields:
+        return
+    _connect().execute(
+        f"UPDATE appointments SET {', '.join(f'{f} = ?' for f in fields)} WHERE appointment_id = ?",
+        [updates[f] for f in fields] + [appointment_id],
+    )
+
+
+# --------------------------------------------------
+
+def import_appointments(appointments) -> tuple:
+    """
+    Bulk insert every row in one transaction.
+
+    A row clashing with a confirmed slot is kept with status CONFLICT.
+    A row whose appointment_id is already taken (old IDs had one-second
+    resolution) is given a new ID. Any other integrity error aborts
+    the import.
+
+    Returns (conflicting rows, renumbered rows).
+    """
+    conn = _connect()
+    conflicts = renumbered = 0
+    insert = f"INSERT INTO appointments ({', '.join(FIELDS)}) VALUES ({', '.join('?' * len(FIELDS))})"
+    status, appointment_id = FIELDS.index("status"), FIELDS.index("appointment_id")
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for appt in appointments:
+            row = [appt.get(f) for f in FIELDS]
+            while True:
+                try:
+                    conn.execute(insert, row)
+                    break
+                except sqlite3.IntegrityError as e:
+                    clash = _clash(e)
+                    if clash == "slot" and row[status] != "CONFLICT":
+                        conflicts += 1
+                        row[status] = "CONFLICT"
+                    elif clash == "id":
+                        renumbered += 1
+                        row[appointment_id] = generate_appointment_id()
+                    else:
+                        raise
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return conflicts, renumbered
+
+
+def clear():
+    """
+    Delete every appointment (simulations and benchmarks).
+    """
+    _connect().execute("DELETE FROM appointments")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--import", dest="source", required=True, help="appointments.json to import")
+    args = parser.parse_args()
+
+    with open(args.source, encoding="utf-8") as f:
+        records = json.load(f)
+    conflicts, renumbered = import_appointments(records)
+    print(
+        f"📥 Imported {len(records)} appointments into {DATA_FILE} "
+        f"({conflicts} double bookings marked CONFLICT, {renumbered} duplicate IDs renumbered)"
+    )
@@ -1,8 +1,236 @@
 """
 Language Detection Module
 Detects language from text input
+
+Native-script text is classified by a histogram of Unicode blocks:
+each Indic script occupies its own aligned 128-code-point block, so
+ord(ch) >> 7 identifies the script with one shift. Romanized text
+("mujhe kal appointment chahiye") is scored with a character
+trigram model built once at import from the small seed corpora
+below. Both paths take microseconds per utterance;
+detect_languages() scores a whole batch with one matrix lookup.
+
+detect_caller_language() is what a call runs on each transcript:
+short romanized replies ("yes", "12 march") keep the call's current
+language instead of resetting it to English, and a longer one only
+switches when it clearly out-scores that language, so English with
+Indic names ("Dr Kumar is fine") stays English.
 """
 
+import math
+
+import numpy as np
+
+
+SUPPORTED_LANGUAGES = ("en", "hi", "ta", "te", "kn", "ml")
+
+# (ord(ch) >> 7) -> language
+SCRIPT_BLOCKS = {
+    0x0900 >> 7: "hi",  # Devanagari
+    0x0B80 >> 7: "ta",  # Tamil
+    0x0C00 >> 7: "te",  # Telugu
+    0x0C80 >> 7: "kn",  # Kannada
+    0x0D00 >> 7: "ml",  # Malayalam
+}
+
+# Romanized seed text per language (booking-desk vocabulary)
+SEED_CORPUS = {
+    "en": """
+        i want to book an appointment with the doctor
+        is the cardiologist available tomorrow morning
+        my name is john and i have a fever
+        what time slots are free on monday
+        please cancel my appointment for friday
+        how much is the consultation fee
+        can i see someone today in the evening
+        yes that works for me thank you
+        no i would like a different doctor please
+        my son has a bad cough and a headache
+        which department should i go to
+        could you repeat the date again
+        i need to reschedule because i am busy
+        who is the most experienced doctor here
+        okay book it for the afternoon
+    """,
+    "hi": """
+        mujhe doctor se milna hai
+        kal subah ka appointment chahiye
+        mera naam rahul hai
+        kya aaj shaam ko slot khaali hai
+        dil ke doctor se baat karni hai
+        mujhe bukhar hai aur sar dard ho raha hai
+        aap kaun se din available hain
+        theek hai dhanyavaad
+        haan wahi chahiye
+        nahi mujhe dusra doctor chahiye
+        fees kitni hai
+        mere bete ki tabiyat kharab hai
+        kripya appointment book kar dijiye
+        main kal aa sakta hoon
+        kaunsa samay theek rahega
+    """,
+    "ta": """
+        enakku doctor paakkanum
+        naalai kaalai appointment venum
+        en peyar kumar
+        indru maalai slot irukka
+        enakku kaichal irukku
+        thalai vali romba irukku
+        neenga eppo varuveenga
+        sari nandri
+        aamaa adhu podhum
+        illai vera doctor venum
+        fees evvalavu
+        en magan udambu sariyillai
+        dayavu seidhu appointment book pannunga
+        naan naalaikku varen
+        endha neram sariyaa irukkum
+    """,
+    "te": """
+        naaku doctor ni kalavaali
+        repu udayam appointment kaavaali
+        naa peru ravi
+        ee roju saayantram slot undaa
+        naaku jvaram ga undi
+        thala noppi chaala undi
+        meeru eppudu vastaaru
+        sare dhanyavaadaalu
+        avunu adi chaalu
+        ledu vere doctor kaavaali
+        fees entha
+        maa abbaayiki aarogyam baaledu
+        dayachesi appointment book cheyyandi
+        nenu repu vastaanu
+        e samayam baguntundi
+    """,
+    "kn": """
+        nanage doctor na nodabeku
+        naale beligge appointment beku
+        nanna hesaru suresh
+        indu sanje slot ideya
+        nanage jvara ide
+        tale novu tumba ide
+        neevu yaavaga baruttiri
+        sari dhanyavaadagalu
+        houdu adu saaku
+        illa bere doctor beku
+        fees eshtu
+        nanna maganige hushaarilla
+        dayavittu appointment book maadi
+        naanu naale bartini
+        yaava samaya sari aagutte
+    """,
+    "ml": """
+        enikku doctor ne kananam
+        naale raavile appointment venam
+        ente peru anil
+        innu vaikunneram slot undo
+        enikku pani undu
+        thala vedana valare kooduthal aanu
+        ningal eppozhaanu varunnathu
+        shari nanni
+        athe athu mathi
+        alla vere doctor venam
+        fees ethra aanu
+        ente makanu sukhamilla
+        dayavaayi appointment book cheyyu
+        njan naale varaam
+        ethu samayam nallathaanu
+    """,
+}
+
+# Log-prior nudging short or ambiguous romanized text to English
+ENGLISH_PRIOR = 1.0
+
+# Romanized transcripts shorter than this keep the call's language
+MIN_SWITCH_WORDS = 3
+
+# Log-score lead over the call's language needed to switch away from it
+SWITCH_MARGIN = 9.0
+
+
+# --------------------------------------------------
+# Trigram model (built once at import)
+# --------------------------------------------------
+
+def _trigrams(text: str):
+    for word in text.lower().split():
+        word = "".join(ch for ch in word if ch.isalpha())
+        if not word:
+            continue
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            yield padded[i: i + 3]
+
+
+def _build_model(corpus: dict, alpha: float = 0.5):
+    counts = {lang: {} for lang in SUPPORTED_LANGUAGES}
+    for lang, text in corpus.items():
+        for gram in _trigrams(text):
+            counts[lang][gram] = counts[lang].get(gram, 0) + 1
+
+    vocab = sorted({g for c in counts.values() for g in c})
+    index = {g: i + 1 for i, g in enumerate(vocab)}  # row 0 = unseen
+
+    table = np.zeros((len(vocab) + 1, len(SUPPORTED_LANGUAGES)), dtype=np.float32)
+    for j, lang in enumerate(SUPPORTED_LANGUAGES):
+        c = counts[lang]
+        denom = sum(c.values()) + alpha * (len(vocab) + 1)
+        table[0, j] = math.log(alpha / denom)
+        for gram, i in index.items():
+            table[i, j] = math.log((c.get(gram, 0) + alpha) / denom)
+
+    # Per-row tuples for the scalar path (faster than numpy on one text)
+    rows = {g: tuple(float(x) for x in table[i]) for g, i in index.items()}
+    return index, table, rows, tuple(float(x) for x in table[0])
+
+
+_INDEX, _TABLE, _ROWS, _UNSEEN = _build_model(SEED_CORPUS)
+_PRIOR = np.array([ENGLISH_PRIOR if lang == "en" else 0.0 for lang in SUPPORTED_LANGUAGES], dtype=np.float32)
+
+
+# --------------------------------------------------
+# Detection
+# --------------------------------------------------
+
+def _script_language(text: str):
+    """
+    Language of the dominant Indic script, or None for Latin text.
+    """
+    if text.isascii():
+        return None
+
+    hist = {}
+    for ch in text:
+        block = ord(ch) >> 7
+        if block in SCRIPT_BLOCKS:
+            hist[block] = hist.get(block, 0) + 1
+
+    if not hist:
+        return None
+    return SCRIPT_BLOCKS[max(hist, key=hist.get)]
+
+
+def _roman_scores(text: str):
+    """
+    Log-score per SUPPORTED_LANGUAGES entry, or None without letters.
+    """
+    rows = [_ROWS.get(gram, _UNSEEN) for gram in _trigrams(text)]
+    if not rows:
+        return None
+
+    scores = [sum(column) for column in zip(*rows)]
+    scores[0] += ENGLISH_PRIOR
+    return scores
+
+
+def _roman_language(text: str) -> str:
+    scores = _roman_scores(text)
+    if scores is None:
+        return "en"
+    return SUPPORTED_LANGUAGES[scores.index(max(scores))]
+
+
 def detect_language(text: str) -> str:
     """
     Detect language from text.
@@ -14,6 +242,67 @@ def detect_language(text: str) -> str:
     Returns:
         Language code (e.g., 'en', 'hi')
     """
-    # Placeholder implementation
-    # TODO: Integrate with langdetect or similar library
-    return "en"
+    if not text or not text.strip():
+        return "en"
+    return _script_language(text) or _roman_language(text)
+
+
+def detect_caller_language(text: str, current: str = "en") -> str:
+    """
+    Language for the rest of a call after this transcript.
+
+    Native script always decides; romanized text only switches the
+    language once it has MIN_SWITCH_WORDS words and leads the current
+    language by SWITCH_MARGIN.
+    """
+    if not text or not text.strip():
+        return current
+    script = _script_language(text)
+    if script:
+        return script
+    if sum(1 for word in text.split() if any(ch.isalpha() for ch in word)) < MIN_SWITCH_WORDS:
+        return current
+
+    scores = dict(zip(SUPPORTED_LANGUAGES, _roman_scores(text) or ()))
+    if not scores:
+        return current
+    best = max(scores, key=scores.get)
+    if current in scores and scores[best] - scores[current] < SWITCH_MARGIN:
+        return current
+    return best
+
+
+def detect_languages(texts) -> list[str]:
+    """
+    Detect many texts at once.
+
+    Native-script texts use the script histogram; all romanized
+    texts are scored together with one gather over the trigram
+    table and a segmented sum.
+    """
+    results = [None] * len(texts)
+    rows, offsets, pending = [], [], []
+
+    for k, text in enumerate(texts):
+        if not text or not text.strip():
+            results[k] = "en"
+            continue
+        lang = _script_language(text)
+        if lang:
+            results[k] = lang
+            continue
+
+        grams = [_INDEX.get(g, 0) for g in _trigrams(text)]
+        if not grams:
+            results[k] = "en"
+            continue
+        offsets.append(len(rows))
+        rows.extend(grams)
+        pending.append(k)
+
+    if pending:
+        scores = np.add.reduceat(_TABLE[rows], offsets, axis=0) + _PRIOR
+        for k, best in zip(pending, scores.argmax(axis=1)):
+            results[k] = SUPPORTED_LANGUAGES[best]
+
+    return results
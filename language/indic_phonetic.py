@@ -1,11 +1,59 @@
 """
 Indic Phonetic Module
 Converts text to phonetic representation for Indic languages
+
+convert_for_agent() goes one step further for the booking agent,
+whose intent and entity matching is keyed on English words: native
+words it knows ("बुक" -> "buk") are replaced by those keywords
+("book"), and names by the roster spelling they sound like
+("कुमार" -> "kumaar" -> "kumar").
 """
 
+import re
+
+from language.transliteration import native_to_roman
+
+
+# Romanized native-script words -> the agent's English keywords
+AGENT_KEYWORDS = {
+    # doctor
+    "doktar": "doctor", "daaktar": "doctor", "taaktar": "doctor", "doktare": "doctor",
+    # booking intents
+    "buk": "book", "puk": "book", "bukk": "book",
+    "apoimtamemt": "appointment", "apaayimtmemt": "appointment",
+    "appaayintment": "appointment", "appoyinrmenr": "appointment",
+    "kaimsal": "cancel", "kenchal": "cancel", "radd": "cancel", "rattu": "cancel",
+    "riishedyuul": "reschedule",
+    # departments
+    "kaardiyolojii": "cardiology", "kaartiyaalaji": "cardiology", "kaartiyolaji": "cardiology",
+    "kaardiyaalajii": "cardiology", "kaardiyaalaji": "cardiology",
+    "nyuurolojii": "neurology", "niyuuraalaji": "neurology",
+    "orthopediks": "orthopedics", "aarttopetiks": "orthopedics",
+    "darmetolojii": "dermatology",
+    "piidiyaatriks": "pediatrics",
+    "gaayanekolojii": "gynecology",
+    "janaral": "general",
+    "siiniyar": "senior", "chiiniyar": "senior", "anubhavii": "experienced",
+    "phiis": "fee", "hpiis": "fee",
+    # dates
+    "aaj": "today", "inru": "today", "iiroju": "today", "ivattu": "today",
+    "kal": "tomorrow", "naalai": "tomorrow", "repu": "tomorrow", "naale": "tomorrow",
+    # yes / no
+    "haan": "yes", "haam": "yes", "aamaam": "yes", "aam": "yes", "avunu": "yes",
+    "haudu": "yes", "ate": "yes", "thiik": "okay", "chari": "okay",
+    "nahiim": "no", "illai": "no", "illa": "no", "kaadu": "no", "ventaam": "no",
+}
+
+_NATIVE_WORD = re.compile(r"[ऀ-ൿ]+")
+
+
 def convert_to_phonetic(text: str, language: str) -> str:
     """
     Convert text to phonetic representation.
+
+    Native-script words are romanized ("मुझे" -> "mujhe") so
+    English-keyed matching and voices can handle them; Latin text
+    is returned unchanged.
     
     Args:
         text: Input text
@@ -14,6 +62,39 @@ def convert_to_phonetic(text: str, language: str) -> str:
     Returns:
         Phonetic representation
     """
-    # Placeholder implementation
-    # TODO: Add phonetic conversion logic
-    return text
+    return native_to_roman(text, language)
+
+
+def _skeleton(word: str) -> str:
+    """
+    Consonants without h or repeats: "kumaar" and "kumar" -> "kmr".
+    """
+    consonants = re.sub(r"[aeiouh]", "", word)
+    return re.sub(r"(.)\1+", r"\1", consonants)
+
+
+def convert_for_agent(text: str, language: str, names=()) -> str:
+    """
+    Transcript as the agent matches it; Latin words are left as is.
+
+    names are roster names ("Dr. Kumar"); a native word whose
+    romanization has the same consonants as one of their words is
+    replaced by that word.
+    """
+    if not text or text.isascii():
+        return text
+
+    spellings = {}
+    for name in names:
+        for word in name.lower().replace("dr.", "").split():
+            spellings.setdefault(_skeleton(word), word)
+
+    def agent_word(match):
+        roman = convert_to_phonetic(match.group(), language)
+        if roman in AGENT_KEYWORDS:
+            return AGENT_KEYWORDS[roman]
+        skeleton = _skeleton(roman)
+        # One consonant ("shaa" -> "s") is too little to go on
+        return spellings.get(skeleton, roman) if len(skeleton) > 1 else roman
+
+    return _NATIVE_WORD.sub(agent_word, text)
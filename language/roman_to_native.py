@@ -3,6 +3,9 @@ Roman to Native Script Module
 Converts Roman/Latin script to native Indic scripts
 """
 
+from language.transliteration import roman_to_native
+
+
 def convert_roman_to_native(text: str, language: str) -> str:
     """
     Convert Roman script to native Indic script.
@@ -14,6 +17,4 @@ def convert_roman_to_native(text: str, language: str) -> str:
     Returns:
         Text in native script
     """
-    # Placeholder implementation
-    # TODO: Add conversion logic for each language
-    return text
+    return roman_to_native(text, language)
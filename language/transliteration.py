@@ -0,0 +1,301 @@
+"""
+Indic Transliteration Engine
+Table-driven roman <-> native conversion for hi/ta/te/kn/ml
+
+The five scripts share the ISCII-derived Unicode layout: the same
+letter sits at the same offset inside each script's 128-code-point
+block (ka is base + 0x15 everywhere). One set of roman rules is
+therefore compiled into a per-language trie by adding the block
+base; letters a script lacks (Tamil has no kha/ga/gha...) fall
+back to the nearest letter it has.
+
+Roman input is consumed by greedy longest match over the trie
+("chh" before "ch" before "c"). Conversions are memoized per
+(language, token), so a recurring word costs one dict lookup.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+
+SCRIPT_BASE = {
+    "hi": 0x0900,  # Devanagari
+    "ta": 0x0B80,  # Tamil
+    "te": 0x0C00,  # Telugu
+    "kn": 0x0C80,  # Kannada
+    "ml": 0x0D00,  # Malayalam
+}
+
+# Rule kinds
+VOWEL = "v"
+CONSONANT = "c"
+SIGN = "m"
+
+VIRAMA = 0x4D
+ANUSVARA = 0x02
+NUKTA = 0x3C
+
+# Native-only letters and marks: offset -> (kind, roman)
+EXTRA_MARKS = {
+    0x01: (SIGN, "n"),  # candrabindu
+    0x03: (SIGN, "h"),  # visarga
+    0x11: (VOWEL, "o"),  # candra o ("ऑफिस")
+    0x19: (CONSONANT, "ng"),  # nga (Tamil "பண்ணுங்க")
+    0x31: (CONSONANT, "r"),  # Tamil rra ("இன்று")
+    0x45: (SIGN, "e"),  # candra e sign (loanwords)
+    0x49: (SIGN, "o"),  # candra o sign ("डॉक्टर")
+}
+
+# roman -> (independent vowel offset, vowel sign offset or None)
+VOWELS = {
+    "a": (0x05, None),
+    "aa": (0x06, 0x3E), "A": (0x06, 0x3E),
+    "i": (0x07, 0x3F),
+    "ii": (0x08, 0x40), "ee": (0x08, 0x40), "I": (0x08, 0x40),
+    "u": (0x09, 0x41),
+    "uu": (0x0A, 0x42), "oo": (0x0A, 0x42), "U": (0x0A, 0x42),
+    "Ri": (0x0B, 0x43),
+    "e": (0x0E, 0x46), "E": (0x0F, 0x47),
+    "ai": (0x10, 0x48),
+    "o": (0x12, 0x4A), "O": (0x13, 0x4B),
+    "au": (0x14, 0x4C), "ou": (0x14, 0x4C),
+}
+
+# Hindi has no short e/o: e and o are the long vowels
+HINDI_VOWELS = {"e": (0x0F, 0x47), "o": (0x13, 0x4B)}
+
+CONSONANTS = {
+    "k": 0x15, "q": 0x15, "kh": 0x16, "g": 0x17, "gh": 0x18,
+    "ch": 0x1A, "c": 0x15, "chh": 0x1B, "j": 0x1C, "z": 0x1C, "jh": 0x1D, "ny": 0x1E,
+    "T": 0x1F, "Th": 0x20, "D": 0x21, "Dh": 0x22, "N": 0x23,
+    "t": 0x24, "th": 0x25, "d": 0x26, "dh": 0x27, "n": 0x28,
+    "p": 0x2A, "ph": 0x2B, "f": 0x2B, "b": 0x2C, "bh": 0x2D, "m": 0x2E,
+    "y": 0x2F, "r": 0x30, "l": 0x32, "L": 0x33, "v": 0x35, "w": 0x35,
+    "sh": 0x36, "Sh": 0x37, "s": 0x38, "h": 0x39,
+}
+
+# zha (Tamil/Malayalam only)
+ZHA = {"zh": 0x34}
+
+# Nearest available letter for scripts missing one
+FALLBACK = {
+    0x16: 0x15, 0x17: 0x15, 0x18: 0x15,
+    0x1B: 0x1A, 0x1D: 0x1C,
+    0x20: 0x1F, 0x21: 0x1F, 0x22: 0x1F,
+    0x25: 0x24, 0x26: 0x24, 0x27: 0x24,
+    0x2B: 0x2A, 0x2C: 0x2A, 0x2D: 0x2A,
+    0x0B: 0x30, 0x43: 0x41,
+}
+
+_ROMAN_TOKEN = re.compile(r"[A-Za-z]+")
+_NATIVE_TOKEN = re.compile(r"[\u0900-\u0D7F]+")
+
+
+def _letter(base: int, offset: int) -> str:
+    """
+    Character at offset in the script, or its fallback.
+    """
+    for off in (offset, FALLBACK.get(offset)):
+        if off is None:
+            continue
+        ch = chr(base + off)
+        if unicodedata.name(ch, None):
+            return ch
+    return ""
+
+
+# --------------------------------------------------
+# Compiled tables
+# --------------------------------------------------
+
+class Transliterator:
+    def __init__(self, language: str):
+        if language not in SCRIPT_BASE:
+            raise RuntimeError(f"No transliteration tables for {language!r}")
+        self.language = language
+        base = SCRIPT_BASE[language]
+
+        vowels = dict(VOWELS)
+        consonants = dict(CONSONANTS)
+        if language == "hi":
+            vowels.update(HINDI_VOWELS)
+        if language in ("ta", "ml"):
+            consonants.update(ZHA)
+
+        self.virama = chr(base + VIRAMA)
+        # Hindi drops the inherent vowel at word end ("kal" -> कल)
+        # and a written final "a" is long ("mera" -> मेरा)
+        self.final_virama = language != "hi"
+        self.final_aa = _letter(base, 0x3E) if language == "hi" else None
+        # Tamil: dental na starts words and precedes ta, else alveolar
+        self.na, self.medial_na = (
+            (chr(base + 0x28), chr(base + 0x29)) if language == "ta" else (None, None)
+        )
+
+        # roman -> (kind, independent or consonant char, vowel sign)
+        rules = {"M": (SIGN, chr(base + ANUSVARA), None)}
+        for roman, (independent, sign) in vowels.items():
+            rules[roman] = (
+                VOWEL,
+                _letter(base, independent),
+                _letter(base, sign) if sign is not None else "",
+            )
+        for roman, offset in consonants.items():
+            rules[roman] = (CONSONANT, _letter(base, offset), None)
+
+        self.trie = self._build_trie(rules)
+        self.max_key = max(len(k) for k in rules)
+        self.reverse = self._build_reverse(base, vowels, consonants)
+
+    @staticmethod
+    def _build_trie(rules: dict) -> dict:
+        trie = {}
+        for roman, value in rules.items():
+            node = trie
+            for ch in roman:
+                node = node.setdefault(ch, {})
+            node[None] = value
+        return trie
+
+    def _build_reverse(self, base: int, vowels: dict, consonants: dict) -> dict:
+        """
+        Native char -> (kind, roman); the first lowercase spelling wins.
+        """
+        reverse = {
+            chr(base + VIRAMA): (VIRAMA, ""),
+            chr(base + NUKTA): (NUKTA, ""),
+            chr(base + ANUSVARA): (SIGN, "m"),
+        }
+        for offset, (kind, roman) in EXTRA_MARKS.items():
+            ch = chr(base + offset)
+            if unicodedata.name(ch, None):
+                reverse[ch] = (kind, roman)
+        if self.medial_na:
+            reverse[self.medial_na] = (CONSONANT, "n")
+        for roman, (independent, sign) in sorted(vowels.items(), key=lambda kv: kv[0].isupper()):
+            for offset, kind in ((independent, VOWEL), (sign, SIGN)):
+                if offset is None:
+                    continue
+                ch = chr(base + offset)
+                if unicodedata.name(ch, None) and ch not in reverse:
+                    reverse[ch] = (kind, roman.lower())
+        for roman, offset in sorted(consonants.items(), key=lambda kv: kv[0].isupper()):
+            ch = chr(base + offset)
+            if unicodedata.name(ch, None) and ch not in reverse:
+                reverse[ch] = (CONSONANT, roman.lower())
+        return reverse
+
+    # --------------------------------------------------
+
+    def _match(self, token: str, i: int):
+        """
+        Greedy longest match at token[i]; (length, rule) or (1, None).
+        """
+        node = self.trie
+        best = (1, None)
+        for j in range(i, min(len(token), i + self.max_key)):
+            node = node.get(token[j])
+            if node is None:
+                break
+            if None in node:
+                best = (j - i + 1, node[None])
+        return best
+
+    def to_native(self, token: str) -> str:
+        out = []
+        pending = False  # last output was a bare consonant
+        i = 0
+        while i < len(token):
+            length, rule = self._match(token, i)
+            i += length
+
+            if rule is None:
+                out.append(token[i - length: i])
+                pending = False
+                continue
+
+            kind, char, sign = rule
+            if kind == CONSONANT:
+                if char == self.na and i - length > 0 and token[i: i + 1] not in ("t", "d"):
+                    char = self.medial_na
+                if pending:
+                    out.append(self.virama)
+                out.append(char)
+                pending = True
+            elif kind == VOWEL:
+                if pending:
+                    if self.final_aa and i == len(token) and i - length > 1 and not sign:
+                        sign = self.final_aa
+                    out.append(sign)
+                else:
+                    out.append(char)
+                pending = False
+            else:
+                out.append(char)
+                pending = False
+
+        if pending and self.final_virama:
+            out.append(self.virama)
+        return "".join(out)
+
+    def to_roman(self, text: str) -> str:
+        out = []
+        inherent = False  # an "a" is owed for the last consonant
+        for ch in text:
+            kind, roman = self.reverse.get(ch, (None, ch))
+
+            if kind == SIGN and inherent and roman not in ("m", "n", "h"):
+                out.append(roman)
+                inherent = False
+                continue
+            if kind == VIRAMA:
+                inherent = False
+                continue
+            if kind == NUKTA:
+                continue
+
+            if inherent:
+                if kind is None and not self.final_virama:
+                    pass  # word end: Hindi schwa deletion
+                else:
+                    out.append("a")
+            out.append(roman)
+            inherent = kind == CONSONANT
+
+        if inherent and self.final_virama:
+            out.append("a")
+        if self.final_aa and len(text) > 1 and text.endswith(self.final_aa):
+            out[-1] = "a"
+        return "".join(out)
+
+
+# --------------------------------------------------
+# Memoized entry points
+# --------------------------------------------------
+
+@lru_cache(maxsize=None)
+def get_transliterator(language: str) -> Transliterator:
+    return Transliterator(language)
+
+
+@lru_cache(maxsize=16384)
+def _native_token(language: str, token: str) -> str:
+    return get_transliterator(language).to_native(token)
+
+
+@lru_cache(maxsize=16384)
+def _roman_word(language: str, word: str) -> str:
+    return get_transliterator(language).to_roman(word)
+
+
+def roman_to_native(text: str, language: str) -> str:
+    if language not in SCRIPT_BASE or not text:
+        return text
+    return _ROMAN_TOKEN.sub(lambda m: _native_token(language, m.group()), text)
+
+
+def native_to_roman(text: str, language: str) -> str:
+    if language not in SCRIPT_BASE or not text or text.isascii():
+        return text
+    return _NATIVE_TOKEN.sub(lambda m: _roman_word(language, m.group()), text)
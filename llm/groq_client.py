@@ -1,13 +1,19 @@
 import os
 import asyncio
-from groq import Groq
+from groq import Groq, RateLimitError
 from dotenv import load_dotenv
 
+from net.rate_limit import RateLimiter
+
 load_dotenv()
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 assert GROQ_API_KEY, "Missing GROQ_API_KEY"
 
+# Optional requests/s cap, shared by every GroqLLM in the process
+GROQ_RATE_LIMIT = float(os.getenv("GROQ_RATE_LIMIT", "0"))
+limiter = RateLimiter("groq", GROQ_RATE_LIMIT) if GROQ_RATE_LIMIT else None
+
 
 SYSTEM_PROMPT = (
     "You are a course lead qualification voice agent.\n"
@@ -26,8 +32,14 @@ class GroqLLM:
     Behavior is IDENTICAL to the previous version.
     """
 
-    def __init__(self, model: str = "llama-3.1-8b-instant"):
-        self.client = Groq(api_key=GROQ_API_KEY)
+    def __init__(self, model: str = "llama-3.1-8b-instant", limiter: RateLimiter = limiter, retries: int = 2):
+        self.limiter = limiter
+        self.retries = retries
+        # With a limiter, 429 back-off is ours rather than the SDK's
+        if limiter is None:
+            self.client = Groq(api_key=GROQ_API_KEY)
+        else:
+            self.client = Groq(api_key=GROQ_API_KEY, max_retries=0)
         self.model = model
 
     async def generate(self, prompt: str) -> str:
@@ -36,11 +48,25 @@ class GroqLLM:
         Runs the blocking SDK call in a thread executor.
         """
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            self._sync_generate,
-            prompt
-        )
+        if self.limiter is None:
+            return await loop.run_in_executor(
+                None,
+                self._sync_generate,
+                prompt
+            )
+
+        for attempt in range(self.retries + 1):
+            await self.limiter.acquire()
+            try:
+                return await loop.run_in_executor(None, self._sync_generate, prompt)
+            except RateLimitError as e:
+                try:
+                    retry_after = float(e.response.headers.get("retry-after", 1.0))
+                except ValueError:
+                    retry_after = 1.0
+                self.limiter.throttle(retry_after)
+                if attempt == self.retries:
+                    raise
 
     def _sync_generate(self, prompt: str) -> str:
         response = self.client.chat.completions.create(
@@ -2,20 +2,60 @@
 Hospital Appointment Booking Voice Agent
 Deepgram STT + Deepgram TTS
 Silence-based recording
+
+Every stage runs as a task on the event loop: device waits run on
+the bounded device-io pool, storage and cache writes on disk-io,
+and each stage has a timeout that cancels it (and stops the device)
+instead of stalling the call. TTS warm-up and metrics export run
+as background tasks beside the conversation.
+
+Profiling (telemetry.profiling) is switched on at runtime with
+SIGUSR1/SIGUSR2 or commands on the PROFILE_SOCKET unix socket.
+
+A slow agent step is covered by a cached filler phrase, and the
+agent's likely next replies are rendered while the current one
+plays.
 """
 
 import os
+import time
 import asyncio
 from dotenv import load_dotenv
 
 from hospital_agent.agent import HospitalAppointmentAgent
 from memory.memory import ConversationMemory
+from language.detect_language import detect_caller_language
+from language.indic_phonetic import convert_for_agent
 
-from audio.recorder import SilenceRecorder
+from audio.callback_recorder import CallbackRecorder
+from audio.vad import AdaptiveVAD
 from audio.playback import AudioPlayer
-
-from stt.deepgram_stt import DeepgramSTT
-from tts.deepgram_tts import DeepgramTTS
+from audio.encoding import CompactEncoder
+
+from net.http_pool import HTTPPool
+from net.rate_limit import BACKGROUND, BOOKING, GREETING, TURN, RateLimited, RateLimiter, set_priority
+from stt.async_deepgram_stt import AsyncDeepgramSTT
+from stt.pipelined_stt import PipelinedTranscriber
+from tts.async_deepgram_tts import AsyncDeepgramTTS
+from tts.tts_cache import CachedTTS, TTSCache
+from tts.tts_router import TTSRouter
+from tts.voice_pool import VoicePool
+from tts.speech_pipeline import SpeechPipeline, prompt_sentences
+from tts.template_renderer import TemplateRenderer
+from tts.speculation import Speculator
+
+from hospital_agent import response as R
+from hospital_agent.availability import doctor_names, roster_values
+from hospital_agent.storage import ID_ALPHABET
+from telemetry.tracing import tracer
+from telemetry.profiling import profiler
+from runtime.background import BackgroundTasks, export_metrics
+from runtime.executors import BoundedExecutor, StageTimeout, run_device, with_timeout
+
+try:
+    from tts.local_tts import LocalTTS
+except ImportError:  # pyttsx3 not installed: no local fallback voice
+    LocalTTS = None
 
 
 # ------------------------------------------------------
@@ -29,6 +69,34 @@ DEEPGRAM_API_KEY = os.getenv("DEEPGRAM_API_KEY")
 if not DEEPGRAM_API_KEY:
     raise RuntimeError("DEEPGRAM_API_KEY not set in .env")
 
+# Optional client-side cap on Deepgram requests per second
+DEEPGRAM_RATE_LIMIT = float(os.getenv("DEEPGRAM_RATE_LIMIT", "0"))
+
+# Optional tracing output: per-span JSON lines / Prometheus text
+tracer.trace_file = os.getenv("TRACE_FILE")
+METRICS_FILE = os.getenv("METRICS_FILE")
+# Optional profiling control socket
+PROFILE_SOCKET = os.getenv("PROFILE_SOCKET")
+
+# Optional compact upload: "flac", "opus" or "wav" (trim only).
+# When unset, audio is streamed to STT while recording.
+STT_CODEC = os.getenv("STT_CODEC")
+
+# Continuous caller speech needed to interrupt a prompt
+BARGE_IN_MS = 300
+
+# Upper bound per stage of a turn (seconds)
+STAGE_TIMEOUTS = {
+    # start timeout + max recording + STT
+    "listen": 30.0,
+    "speak": 90.0,
+}
+
+METRICS_INTERVAL_S = 15.0
+
+# Field values worth pre-rendering for template replies
+ROSTER_VALUES = roster_values()
+
 
 # ------------------------------------------------------
 # Voice Agent
@@ -40,75 +108,195 @@ class HospitalVoiceAgent:
         self.memory.start_session("hospital_session_001")
 
         self.agent = HospitalAppointmentAgent(memory=self.memory)
+        # Agent steps run one at a time, off the shared disk pool
+        self.agent_steps = BoundedExecutor("agent", max_workers=1, max_pending=2)
 
-        self.recorder = SilenceRecorder(
+        self.recorder = CallbackRecorder(
             start_timeout_ms=5000,
             silence_threshold=350.0,
-            silence_duration_ms=900,
+            # AdaptiveVAD's 200 ms hangover makes this ~900 ms end-to-end
+            silence_duration_ms=700,
             max_record_ms=12000,
+            vad=AdaptiveVAD(sample_rate=16000),
+            pre_roll_ms=300,
         )
 
-        self.stt = DeepgramSTT(DEEPGRAM_API_KEY)
-        self.tts = DeepgramTTS(DEEPGRAM_API_KEY)
-        self.player = AudioPlayer(sample_rate=24000)
+        # One keep-alive pool shared by STT and TTS
+        limiter = RateLimiter("deepgram", DEEPGRAM_RATE_LIMIT) if DEEPGRAM_RATE_LIMIT else None
+        self.http_pool = HTTPPool(DEEPGRAM_API_KEY, limiter=limiter)
+        self.stt = AsyncDeepgramSTT(self.http_pool)
+        # One cached engine per language; cache keys include the voice
+        tts_cache = TTSCache()
+        self.voices = VoicePool(
+            lambda voice: CachedTTS(AsyncDeepgramTTS(self.http_pool, model=voice), tts_cache),
+            limits={"en": 8},
+        )
+        self.cached_tts = self.voices.engine("en")
+        # Local voice if Deepgram misses the latency budget
+        self.tts = TTSRouter(
+            self.voices,
+            fallback=LocalTTS(sample_rate=24000) if LocalTTS else None,
+            hedge_ms=400,
+            deadline_ms=1500,
+        )
+        self.transcriber = PipelinedTranscriber(self.recorder, self.stt, run_blocking=run_device)
+        self.encoder = (
+            CompactEncoder(
+                STT_CODEC,
+                sample_rate=self.recorder.sample_rate,
+                silence_threshold=self.recorder.silence_threshold,
+            )
+            if STT_CODEC
+            else None
+        )
+        self.player = AudioPlayer(sample_rate=24000, run_blocking=run_device)
+        # Fragments must all come from one voice, so bypass the router
+        self.templates = TemplateRenderer(self.cached_tts)
+        self.speech = SpeechPipeline(self.tts, self.player, pause_ms=150)
+        self.speculator = Speculator(self.templates, self.player, filler_after_ms=250)
 
         self.no_response_count = 0
+        # Caller's language; picks the TTS voice
+        self.language = "en"
+
+        self.background = BackgroundTasks()
+
+        # Barge-in state, shared with the capture thread
+        self.speaking = False
+        self.barged_in = False
 
     # --------------------------------------------------
 
-    async def speak(self, text: str):
+    def _on_barge_in(self):
         """
-        Speak text with precise sentence-level pauses
+        Called from the capture thread when the caller starts talking.
         """
-        print(f"\n🤖 AGENT: {text}")
+        if self.speaking:
+            self.barged_in = True
+            self.player.stop()
+            print("✋ Caller barged in, stopping playback.")
 
-        lower = text.lower()
-        trigger = "let me check the availability"
+    # --------------------------------------------------
 
-        if trigger in lower:
-            # Find the end of the sentence that contains the trigger
-            start = lower.find(trigger)
-            sentence_end = text.find(".", start)
+    async def speak(self, text: str, render=None):
+        """
+        Speak text with sentence-level pipelining and pauses.
 
-            if sentence_end != -1:
-                sentence_end += 1  # include the period
+        render is the agent's (template, fields) for this reply; when
+        given, the reply is stitched from cached fragment audio.
+        """
+        print(f"\n🤖 AGENT: {text}")
+        self.speaking = True
+        self.barged_in = False
+        try:
+            # Template fragments are cached in the English voice only
+            if render and self.language == "en":
+                try:
+                    audio = self.speculator.take(render) or await self.templates.render(*render)
+                except Exception as e:
+                    print(f"⚠️ Template audio failed, synthesizing reply: {e}")
+                else:
+                    await self.player.play_async(audio)
+                    return
+
+            # Sentence N+1 is synthesized while sentence N plays
+            await self.speech.speak(
+                text, should_continue=lambda: not self.barged_in, language=self.language
+            )
+        finally:
+            self.speaking = False
 
-                first_sentence = text[:sentence_end].strip()
-                remaining_text = text[sentence_end:].strip()
+    # --------------------------------------------------
 
-                # 1️⃣ Speak the full acknowledgment sentence
-                audio = self.tts.synthesize(first_sentence)
-                self.player.play(audio)
+    async def listen_and_transcribe(self, barge_in: bool = False) -> str:
+        kwargs = {}
+        if barge_in:
+            kwargs = dict(
+                hold=lambda: self.speaking,
+                on_speech=self._on_barge_in,
+                barge_in_ms=BARGE_IN_MS,
+            )
+
+        if self.encoder:
+            transcript = (await self._transcribe_compact(**kwargs)).strip()
+        else:
+            # Audio is uploaded while it is being recorded
+            transcript = (await self.transcriber.listen_and_transcribe(**kwargs)).strip()
 
-                # ⏱️ 1-second pause AFTER sentence completion
-                await asyncio.sleep(1)
+        if transcript:
+            print(f"📝 STT RESULT: {transcript}")
+        else:
+            print("📝 STT RESULT: <empty>")
 
-                # 2️⃣ Speak the remaining content (if any)
-                if remaining_text:
-                    audio = self.tts.synthesize(remaining_text)
-                    self.player.play(audio)
+        return transcript
 
-                return
+    async def _transcribe_compact(self, **barge_in) -> str:
+        pcm = await run_device(self.recorder.record_pcm, **barge_in)
 
-        # Default behavior
-        audio = self.tts.synthesize(text)
-        self.player.play(audio)
+        start = time.perf_counter()
+        # FLAC/Opus encoding is CPU work; keep it off the loop too
+        audio_bytes, mimetype, report = await asyncio.to_thread(self.encoder.prepare, pcm)
+        transcript = await self.stt.transcribe(audio_bytes, mimetype)
 
-    # --------------------------------------------------
+        print(f"📦 {report}")
+        print(f"🧠 Transcribed in {1000 * (time.perf_counter() - start):.0f} ms")
+        return transcript
 
-    async def listen_and_transcribe(self) -> str:
-        print("🎙️ Listening for user speech...")
-        audio_bytes = self.recorder.record()
+    async def _warm_up(self):
+        set_priority(BACKGROUND)
+        await self.voices.warm_voices()
+        await self.tts.warm(prompt_sentences(R.FIXED_PROMPTS))
+        await self.templates.warm(R.TEMPLATES, ROSTER_VALUES, spell=ID_ALPHABET)
 
-        print("🧠 Transcribing user speech...")
-        transcript = self.stt.transcribe(audio_bytes).strip()
+    # --------------------------------------------------
 
-        if transcript:
-            print(f"📝 STT RESULT: {transcript}")
-        else:
-            print("📝 STT RESULT: <empty>")
+    async def respond(self, text: str, render=None) -> str:
+        """
+        Speak while already listening, so the caller can barge in.
+        """
+        self.speaking = True
+        tracer.begin_turn(self.memory.current_session)
+        listening = asyncio.create_task(
+            with_timeout(
+                "listen",
+                self.listen_and_transcribe(barge_in=True),
+                STAGE_TIMEOUTS["listen"],
+                on_timeout=self.recorder.cancel,
+            )
+        )
+        try:
+            try:
+                await with_timeout(
+                    "speak", self.speak(text, render), STAGE_TIMEOUTS["speak"], on_timeout=self.player.stop
+                )
+            except (StageTimeout, RateLimited) as e:
+                print(f"⚠️ {e}")
+            except Exception as e:
+                # A reply that could not be voiced must not end the call
+                print(f"⚠️ Reply failed, still listening: {e}")
+
+            return await listening
+        except (StageTimeout, RateLimited) as e:
+            print(f"⚠️ {e}")
+            return ""
+        finally:
+            listening.cancel()
+
+    async def handle_input(self, user_text: str):
+        """
+        Run the agent (which writes to storage) on this call's executor.
 
-        return transcript
+        There is no stage timeout: the step is awaited until its storage
+        write is done, and the speculator's filler covers a slow one.
+        """
+        self.language = detect_caller_language(user_text, self.language)
+        # The agent matches English keywords: "डॉक्टर कुमार" -> "doctor kumar"
+        user_text = convert_for_agent(user_text, self.language, doctor_names())
+        with tracer.span("handle_input"):
+            reply = await self.agent_steps.run(
+                profiler.call, self.memory.current_session, self.agent.handle_input, user_text
+            )
+        return reply, self.agent.last_render
 
     # --------------------------------------------------
 
@@ -117,19 +305,26 @@ class HospitalVoiceAgent:
         print("🏥 Hospital Appointment Booking Voice Agent")
         print("=" * 60)
 
-        await self.speak(
-            "Hello, this is the hospital appointment desk. "
-            "How may I help you today?"
-        )
+        # One capture stream for the whole call (pre-roll, no reopen delay)
+        self.recorder.open()
 
-        while True:
-            user_text = await self.listen_and_transcribe()
+        # Fill the TTS cache and export metrics beside the conversation
+        self.background.spawn("tts-warmup", self._warm_up())
+        tracer.flush_every = None  # the exporter flushes off the loop
+        self.background.spawn("metrics-export", export_metrics(METRICS_FILE, METRICS_INTERVAL_S))
+        profiler.install_signals()
+        if PROFILE_SOCKET:
+            self.background.spawn("profiling-control", profiler.serve(PROFILE_SOCKET))
 
+        set_priority(GREETING)
+        user_text = await self.respond(R.GREETING)
+
+        while True:
             if not user_text:
                 self.no_response_count += 1
 
                 if self.no_response_count == 1:
-                    await self.speak("Hello, can you hear me?")
+                    user_text = await self.respond(R.NO_RESPONSE_PROMPT)
                     continue
 
                 if self.no_response_count >= 2:
@@ -139,16 +334,41 @@ class HospitalVoiceAgent:
             self.no_response_count = 0
             print(f"\n👤 HUMAN: {user_text}")
 
-            response = self.agent.handle_input(user_text)
-            await self.speak(response)
+            response, render = await self.speculator.cover(
+                self.handle_input(user_text), self.agent.filler()
+            )
+            self.speculator.prefetch(self.agent.predict_next())
+            set_priority(BOOKING if self.agent.booking_in_progress() else TURN)
+            user_text = await self.respond(response, render)
+
+    # --------------------------------------------------
+
+    async def close(self):
+        # Cancels warm-up; the exporter writes its final snapshot
+        await self.background.close()
+        await profiler.close()
+        self.recorder.cancel()
+        self.recorder.close()
+        self.agent_steps.shutdown()
+        await self.http_pool.close()
+
+        print(f"\n📊 Turn latency\n{tracer.summary()}")
 
 
 # ------------------------------------------------------
 # Entrypoint
 # ------------------------------------------------------
 
+async def _main():
+    voice_agent = HospitalVoiceAgent()
+    try:
+        await voice_agent.run()
+    finally:
+        await voice_agent.close()
+
+
 if __name__ == "__main__":
     try:
-        asyncio.run(HospitalVoiceAgent().run())
+        asyncio.run(_main())
     except KeyboardInterrupt:
         print("\n👋 Call ended.")
@@ -0,0 +1 @@
+"""Networking Module"""
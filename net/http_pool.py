@@ -0,0 +1,136 @@
+"""
+Shared HTTP Connection Pool
+One keep-alive client for all Deepgram REST calls
+
+Every session on the event loop borrows connections from the
+same pool, so TLS handshakes are paid once and the number of
+in-flight requests stays bounded.
+
+With a RateLimiter (net/rate_limit.py) every request first takes a
+token from it, and a 429 pauses the limiter for Retry-After before
+the request is retried. A streamed body cannot be replayed, so its
+429 is raised as RateLimited, like a request the limiter shed.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+
+from net.rate_limit import RateLimited, RateLimiter, current_priority
+
+
+DEEPGRAM_BASE_URL = "https://api.deepgram.com"
+
+
+class HTTPPool:
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = DEEPGRAM_BASE_URL,
+        max_connections: int = 32,
+        max_concurrency: int = 32,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 30.0,
+        limiter: RateLimiter = None,
+        retries: int = 2,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.limiter = limiter
+        self.retries = retries
+
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._timeout = httpx.Timeout(timeout, connect=5.0)
+
+        self._client = None
+        self._semaphore = None
+
+    # --------------------------------------------------
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Lazily create the client so it binds to the running loop.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Token {self.api_key}"},
+                limits=self._limits,
+                timeout=self._timeout,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    # --------------------------------------------------
+
+    def _rate_limited(self, response: httpx.Response, attempt: int, replayable: bool) -> bool:
+        """
+        Pause the limiter on a 429; True if the request should be retried.
+        """
+        if response.status_code != 429 or self.limiter is None:
+            return False
+        try:
+            retry_after = float(response.headers.get("Retry-After", 1.0))
+        except ValueError:
+            retry_after = 1.0
+        self.limiter.throttle(retry_after)
+        if not replayable:
+            raise RateLimited(self.limiter.name, current_priority(), retry_after)
+        return attempt < self.retries
+
+    async def post(self, path: str, **kwargs) -> httpx.Response:
+        """
+        POST and read the full body, holding one concurrency slot.
+        """
+        client = self.client
+        replayable = not hasattr(kwargs.get("content"), "__aiter__")
+        for attempt in range(self.retries + 1):
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            async with self._semaphore:
+                response = await client.post(path, **kwargs)
+            if self._rate_limited(response, attempt, replayable):
+                continue
+            response.raise_for_status()
+            return response
+
+    @asynccontextmanager
+    async def stream(self, path: str, **kwargs):
+        """
+        POST and yield the response before the body is read.
+
+        The concurrency slot is held until the body is consumed.
+        """
+        client = self.client
+        replayable = not hasattr(kwargs.get("content"), "__aiter__")
+        for attempt in range(self.retries + 1):
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            async with self._semaphore:
+                async with client.stream("POST", path, **kwargs) as response:
+                    if self._rate_limited(response, attempt, replayable):
+                        continue
+                    response.raise_for_status()
+                    yield response
+                    return
+
+    # --------------------------------------------------
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
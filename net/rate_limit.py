@@ -0,0 +1,201 @@
+"""
+Shared Rate Limiter
+Token bucket with a priority queue for upstream API calls
+
+One limiter per upstream API is shared by every session calling
+it (Deepgram STT and TTS through the HTTPPool, Groq in
+llm/groq_client.py), so bursts from many calls are smoothed before
+the provider answers them with 429s.
+
+Requests that find no token wait in a priority queue: a caller in
+the middle of a booking is served before a new caller's greeting,
+and speculative or warm-up renders go last. Each priority has a
+maximum wait; a request whose estimated wait already exceeds it is
+shed at once with RateLimited, and one still queued at its deadline
+is dropped the same way, so a slow upstream turns into fast failures
+instead of a growing backlog.
+
+A 429 from the provider calls throttle(retry_after), which sets the
+bucket to a not-before point retry_after seconds away, so no request
+is sent before the provider allows. Several requests rejected
+together push that point out once, not once per request.
+
+The priority of a request comes from the calling task's context:
+
+    set_priority(BOOKING)    # later requests from this task
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import time
+
+from telemetry.tracing import tracer
+
+
+# Lower is served first
+BOOKING = 0
+TURN = 1
+GREETING = 2
+BACKGROUND = 3
+
+PRIORITY_NAMES = {BOOKING: "booking", TURN: "turn", GREETING: "greeting", BACKGROUND: "background"}
+
+# Longest a request may queue for a token, per priority (seconds)
+MAX_WAIT = {BOOKING: 4.0, TURN: 2.0, GREETING: 1.5, BACKGROUND: 30.0}
+
+_priority = contextvars.ContextVar("request_priority", default=TURN)
+
+
+def set_priority(priority: int):
+    """
+    Priority of upstream requests made by the current task from now on.
+    """
+    _priority.set(priority)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+class RateLimited(RuntimeError):
+    def __init__(self, name: str, priority: int, wait_s: float):
+        super().__init__(
+            f"{name} rate limit: {PRIORITY_NAMES.get(priority, priority)} request shed "
+            f"(needed ~{wait_s:.1f}s)"
+        )
+        self.priority = priority
+        self.wait_s = wait_s
+
+
+class RateLimiter:
+    def __init__(self, name: str, rate: float, burst: float = None, max_wait: dict = None):
+        """
+        rate is requests per second; burst defaults to one second's worth.
+        """
+        self.name = name
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.max_wait = {**MAX_WAIT, **(max_wait or {})}
+
+        self.shed = 0
+        self.throttled = 0
+
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._queue = []  # [priority, seq, future]
+        self._seq = itertools.count()
+        self._timer = None
+
+    # --------------------------------------------------
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _waiting(self, up_to: int = None) -> int:
+        return sum(
+            1 for p, _, fut in self._queue
+            if not fut.done() and (up_to is None or p <= up_to)
+        )
+
+    def _publish(self):
+        tracer.gauge(f"{self.name}_queue_depth", self._waiting())
+        tracer.gauge(f"{self.name}_shed_total", self.shed)
+        tracer.gauge(f"{self.name}_throttled_total", self.throttled)
+
+    @property
+    def depth(self) -> int:
+        return self._waiting()
+
+    # --------------------------------------------------
+
+    async def acquire(self, priority: int = None):
+        """
+        Wait for a token; raises RateLimited past the priority's deadline.
+        """
+        if priority is None:
+            priority = current_priority()
+        start = time.monotonic()
+        self._refill(start)
+
+        if self._tokens >= 1 and not self._waiting():
+            self._tokens -= 1
+            tracer.record("rate_wait", 0.0, api=self.name, priority=PRIORITY_NAMES.get(priority))
+            return
+
+        # Everyone at this priority or better goes first
+        ahead = self._waiting(up_to=priority)
+        estimate = (ahead + 1 - self._tokens) / self.rate
+        limit = self.max_wait.get(priority, MAX_WAIT[TURN])
+        if estimate > limit:
+            self.shed += 1
+            self._publish()
+            raise RateLimited(self.name, priority, estimate)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, [priority, next(self._seq), future])
+        self._publish()
+        self._schedule()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), limit)
+        except asyncio.TimeoutError:
+            if not future.done():
+                future.cancel()
+                self.shed += 1
+                self._publish()
+                raise RateLimited(self.name, priority, time.monotonic() - start) from None
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted as we were cancelled: hand the token back
+                self._tokens += 1
+                self._schedule()
+            future.cancel()
+            raise
+
+        tracer.record("rate_wait", time.monotonic() - start, api=self.name, priority=PRIORITY_NAMES.get(priority))
+        self._publish()
+
+    def throttle(self, retry_after: float):
+        """
+        The provider answered 429: send nothing for retry_after seconds.
+
+        Idempotent for 429s that arrive together: the bucket is set to
+        the debt that refills in retry_after, never pushed below it.
+        """
+        self.throttled += 1
+        self._refill(time.monotonic())
+        self._tokens = min(self._tokens, -retry_after * self.rate)
+        self._publish()
+        self._schedule(reset=True)
+
+    # --------------------------------------------------
+
+    def _schedule(self, reset: bool = False):
+        if reset and self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._timer is None:
+            self._dispatch()
+
+    def _dispatch(self):
+        """
+        Grant tokens to queued requests, best priority first.
+        """
+        self._timer = None
+        self._refill(time.monotonic())
+        while self._queue:
+            future = self._queue[0][2]
+            if future.done():
+                heapq.heappop(self._queue)
+                continue
+            if self._tokens < 1:
+                break
+            heapq.heappop(self._queue)
+            self._tokens -= 1
+            future.set_result(None)
+
+        if self._queue:
+            delay = (1 - self._tokens) / self.rate
+            self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
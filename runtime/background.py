@@ -0,0 +1,55 @@
+"""
+Background Tasks
+Named long-running tasks that live beside the calls
+
+Warm-up, metrics export and similar jobs run as tasks on the same
+loop as the calls. Failures are logged instead of disappearing
+with the task, and close() cancels whatever is still running.
+"""
+
+import asyncio
+
+from runtime.executors import run_disk
+from telemetry.tracing import tracer
+
+
+class BackgroundTasks:
+    def __init__(self):
+        self.tasks = {}
+
+    def spawn(self, name: str, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro, name=name)
+        self.tasks[name] = task
+        task.add_done_callback(self._done)
+        return task
+
+    def _done(self, task: asyncio.Task):
+        if self.tasks.get(task.get_name()) is task:
+            del self.tasks[task.get_name()]
+        if not task.cancelled() and task.exception() is not None:
+            print(f"⚠️ Background task {task.get_name()} failed: {task.exception()!r}")
+
+    async def close(self):
+        tasks = list(self.tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def export_metrics(path: str = None, interval_s: float = 15.0):
+    """
+    Periodically flush the trace file and rewrite the metrics file.
+    """
+    try:
+        while True:
+            await asyncio.sleep(interval_s)
+            await _export(path)
+    finally:
+        # Final export on shutdown (also when cancelled)
+        await asyncio.shield(_export(path))
+
+
+async def _export(path):
+    await run_disk(tracer.flush)
+    if path:
+        await run_disk(tracer.write_prometheus, path)
@@ -0,0 +1,89 @@
+"""
+Bounded Executors and Stage Timeouts
+Keep blocking device and disk work off the event loop
+
+Two dedicated thread pools replace the loop's default executor:
+
+device   capture waits and playback waits (sounddevice)
+disk     storage writes, TTS cache writes, trace/metrics export
+
+Each pool admits at most max_pending jobs; further callers wait on
+the loop (not a thread), so a stuck device or slow disk cannot pile
+up unbounded work. Jobs run in a copy of the caller's context, so
+tracing spans keep their session/turn.
+
+A call's agent steps run on its own one-worker BoundedExecutor, so
+two steps of the same call never touch the agent at once and one
+slow call cannot hold a shared worker.
+
+with_timeout() bounds one stage of a turn and cancels it on expiry.
+It is not used for agent steps: cancelling the wait cannot stop the
+worker thread, which would go on to write the booking after the
+caller was told it failed.
+"""
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StageTimeout(RuntimeError):
+    def __init__(self, stage: str, timeout: float):
+        super().__init__(f"{stage} timed out after {timeout:.1f} s")
+        self.stage = stage
+        self.timeout = timeout
+
+
+class BoundedExecutor:
+    def __init__(self, name: str, max_workers: int, max_pending: int):
+        self.name = name
+        self.max_pending = max_pending
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._slots = None
+        self._loop = None
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_pending)
+        return self._slots
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) on the pool once a slot is free.
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        async with self._semaphore():
+            return await loop.run_in_executor(self.pool, call)
+
+    def shutdown(self, wait: bool = False):
+        self.pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Process-wide pools
+device = BoundedExecutor("device-io", max_workers=4, max_pending=8)
+disk = BoundedExecutor("disk-io", max_workers=2, max_pending=64)
+
+
+async def run_device(fn, *args, **kwargs):
+    return await device.run(fn, *args, **kwargs)
+
+
+async def run_disk(fn, *args, **kwargs):
+    return await disk.run(fn, *args, **kwargs)
+
+
+async def with_timeout(stage: str, awaitable, timeout: float, on_timeout=None):
+    """
+    Await with a deadline; on expiry cancel it, call on_timeout()
+    (e.g. stop the device) and raise StageTimeout.
+    """
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError:
+        if on_timeout is not None:
+            on_timeout()
+        raise StageTimeout(stage, timeout) from None
@@ -0,0 +1 @@
+"""Simulation Module"""
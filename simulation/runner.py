@@ -0,0 +1,229 @@
+"""
+Offline Conversation Simulation
+Scripted turns through HospitalAppointmentAgent at CPU speed
+
+A corpus is a JSONL file, one conversation per line:
+
+    {"id": "c1",
+     "turns": ["book cardiology", {"wav": "audio/doctor.wav"}, ""],
+     "expect": ["Dr. Kumar", "is available", null]}
+
+Text turns go straight to the agent; WAV turns (paths relative to
+the corpus) go through a local STT stub first; "" is a silent turn,
+handled like main.py (one re-prompt, then the call ends). expect
+holds a substring per turn (null to skip); an optional caller_phone
+acts as caller ID. There are no devices, network calls or sleeps,
+so a conversation costs only agent time.
+
+Conversations are spread over a process pool in chunks. Each worker
+books into its own temporary appointments database, emptied before
+every conversation, so results do not depend on scheduling. Replies
+are written to --out as JSONL, one conversation per line.
+
+    python -m simulation.runner --synthesize 5000 corpus.jsonl
+    python -m simulation.runner corpus.jsonl --out results.jsonl --workers 8
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from hospital_agent import response as R
+from hospital_agent import storage
+from hospital_agent.agent import HospitalAppointmentAgent
+from hospital_agent.availability import departments, get_doctors, get_available_slots
+from memory.memory import ConversationMemory
+from simulation.stt_stub import load_stt
+from telemetry.tracing import tracer
+
+
+# ------------------------------------------------------
+# One conversation
+# ------------------------------------------------------
+
+def run_conversation(conversation: dict, stt=None, base_dir: str = ".") -> dict:
+    """
+    Play one scripted conversation; returns its turns and failures.
+    """
+    memory = ConversationMemory()
+    memory.start_session(conversation["id"])
+    agent = HospitalAppointmentAgent(memory=memory, caller_phone=conversation.get("caller_phone"))
+
+    expect = conversation.get("expect") or []
+    result = {"id": conversation["id"], "turns": [], "failures": []}
+    silent = 0
+
+    try:
+        for i, turn in enumerate(conversation["turns"]):
+            if isinstance(turn, dict):
+                if stt is None:
+                    raise RuntimeError("WAV turn without an STT stub")
+                user_text = stt.transcribe(os.path.join(base_dir, turn["wav"])).strip()
+            else:
+                user_text = turn.strip()
+
+            if user_text:
+                silent = 0
+                reply = agent.handle_input(user_text)
+            else:
+                silent += 1
+                if silent >= 2:
+                    break
+                reply = R.NO_RESPONSE_PROMPT
+
+            result["turns"].append({"user": user_text, "agent": reply, "state": agent.state.value})
+
+            wanted = expect[i] if i < len(expect) else None
+            if wanted and wanted not in reply:
+                result["failures"].append({"turn": i, "expected": wanted, "got": reply})
+    except Exception as e:
+        result["error"] = repr(e)
+
+    return result
+
+
+# ------------------------------------------------------
+# Process pool
+# ------------------------------------------------------
+
+_worker = {}
+
+
+def _init_worker(stt_spec, data_dir, base_dir):
+    storage.DATA_FILE = os.path.join(data_dir, f"appointments-{os.getpid()}.db")
+    # Spans would only pile up in the worker's memory
+    tracer.enabled = False
+    _worker["stt"] = load_stt(stt_spec)
+    _worker["base_dir"] = base_dir
+
+
+def _run_chunk(conversations):
+    results = []
+    for conversation in conversations:
+        storage.clear()
+        results.append(run_conversation(conversation, _worker["stt"], _worker["base_dir"]))
+    return results
+
+
+def simulate(conversations, workers: int = None, stt_spec: str = None, base_dir: str = ".", chunksize: int = 64):
+    """
+    Run conversations across a process pool; yields results in order.
+    """
+    conversations = list(conversations)
+    chunks = [conversations[i: i + chunksize] for i in range(0, len(conversations), chunksize)]
+    data_dir = tempfile.mkdtemp(prefix="simulation-")
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(stt_spec, data_dir, base_dir),
+        ) as pool:
+            for results in pool.map(_run_chunk, chunks):
+                yield from results
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def load_corpus(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# ------------------------------------------------------
+# Synthetic corpus
+# ------------------------------------------------------
+
+MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+PATIENTS = ["Asha Rao", "Vikram Singh", "Meena Iyer", "Rahul Das", "Priya Nair", "Arjun Menon"]
+
+
+def _booking(rng, index: int) -> dict:
+    dept = rng.choice(departments())
+    doctors = get_doctors(dept)
+    turns = [f"I want to book an appointment in {dept.lower()}"]
+    expect = [doctors[0]["name"]]
+
+    if rng.random() < 0.3:
+        other = rng.choice(doctors)
+        surname = other["name"].split()[-1].lower()
+        turns.append(f"what is the consultation fee for doctor {surname}")
+        expect.append(f"{other['fee']} rupees")
+
+    if rng.random() < 0.3:
+        doctor = max(doctors, key=lambda d: d["experience"])
+        turns += ["I would like the most experienced doctor", "yes please"]
+        expect += ["most experienced", "is available"]
+    else:
+        doctor = rng.choice(doctors)
+        turns.append(f"doctor {doctor['name'].split()[-1].lower()}")
+        expect.append("is available")
+
+    if rng.random() < 0.1:
+        turns.append("")
+        expect.append(R.NO_RESPONSE_PROMPT)
+
+    slot = rng.choice(get_available_slots(doctor))
+    turns += [
+        f"{rng.randint(1, 28)} {rng.choice(MONTHS)}",
+        slot.lower(),
+        f"my name is {rng.choice(PATIENTS)}",
+    ]
+    expect += [slot, "full name", "appointment is confirmed"]
+
+    return {"id": f"sim-{index:06d}", "turns": turns, "expect": expect}
+
+
+def synthesize_corpus(path: str, count: int, seed: int = 7):
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(json.dumps(_booking(rng, i)) + "\n")
+    print(f"Wrote {count} conversations to {path}")
+
+
+# ------------------------------------------------------
+# Entrypoint
+# ------------------------------------------------------
+
+def _main(args):
+    corpus = load_corpus(args.corpus)
+    base_dir = os.path.dirname(os.path.abspath(args.corpus))
+
+    start = time.perf_counter()
+    turns = failures = errors = 0
+    with open(args.out, "w", encoding="utf-8") as out:
+        for result in simulate(corpus, args.workers, args.stt, base_dir, args.chunksize):
+            turns += len(result["turns"])
+            failures += bool(result["failures"])
+            errors += "error" in result
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    elapsed = time.perf_counter() - start
+
+    print(f"{'conversations':>14} {'turns':>8} {'failed':>7} {'errors':>7} {'seconds':>8} {'conv/s':>9} {'turns/s':>9}")
+    print(
+        f"{len(corpus):>14} {turns:>8} {failures:>7} {errors:>7} {elapsed:>8.2f} "
+        f"{len(corpus) / elapsed:>9.0f} {turns / elapsed:>9.0f}"
+    )
+    print(f"📄 Replies written to {args.out}")
+    return 1 if failures or errors else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("corpus", help="conversation corpus (JSONL)")
+    parser.add_argument("--out", default="simulation_results.jsonl")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=64, help="conversations per task")
+    parser.add_argument("--stt", help="STT stub for WAV turns as module:attr (default: sidecar transcripts)")
+    parser.add_argument("--synthesize", type=int, metavar="N", help="write N synthetic conversations to corpus and exit")
+    args = parser.parse_args()
+
+    if args.synthesize:
+        synthesize_corpus(args.corpus, args.synthesize)
+    else:
+        raise SystemExit(_main(args))
@@ -0,0 +1,60 @@
+"""
+Local STT Stubs
+Turn WAV files into transcripts without a network call
+
+A stub is any object with transcribe(path) -> str. The default
+reads the transcript from a sidecar file next to the WAV
+(caller_01.wav -> caller_01.txt) or from transcripts.json in the
+same directory, after checking the WAV is mono 16-bit PCM. Plug in
+another one (e.g. an offline recognizer) with --stt module:Class.
+"""
+
+import importlib
+import json
+import os
+import wave
+
+
+class SidecarSTT:
+    def __init__(self):
+        self._indexes = {}
+
+    def _index(self, directory: str) -> dict:
+        if directory not in self._indexes:
+            path = os.path.join(directory, "transcripts.json")
+            index = {}
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    index = json.load(f)
+            self._indexes[directory] = index
+        return self._indexes[directory]
+
+    def transcribe(self, path: str) -> str:
+        with wave.open(path, "rb") as wf:
+            if wf.getsampwidth() != 2 or wf.getnchannels() != 1:
+                raise RuntimeError(f"{path}: expected mono 16-bit PCM")
+
+        sidecar = os.path.splitext(path)[0] + ".txt"
+        if os.path.exists(sidecar):
+            with open(sidecar, encoding="utf-8") as f:
+                return f.read().strip()
+
+        directory, name = os.path.split(path)
+        transcript = self._index(directory).get(name)
+        if transcript is None:
+            raise RuntimeError(f"{path}: no transcript (.txt sidecar or transcripts.json)")
+        return transcript
+
+
+def load_stt(spec: str = None):
+    """
+    Build an STT stub from "module:attr"; SidecarSTT if spec is None.
+    """
+    if not spec:
+        return SidecarSTT()
+
+    module_name, _, attr = spec.partition(":")
+    if not attr:
+        raise RuntimeError(f"STT stub must look like module:attr, got {spec!r}")
+    factory = getattr(importlib.import_module(module_name), attr)
+    return factory()
@@ -0,0 +1,69 @@
+"""
+Deepgram Speech-to-Text (Turn-based, async)
+Uses the shared HTTP pool instead of the blocking SDK call
+"""
+
+import time
+
+from net.http_pool import HTTPPool
+from telemetry.tracing import tracer
+
+
+async def _single_chunk(view: memoryview):
+    yield view
+
+
+class AsyncDeepgramSTT:
+    def __init__(self, pool: HTTPPool, model: str = "nova-2", language: str = "en"):
+        self.pool = pool
+        self.params = {
+            "model": model,
+            "smart_format": "true",
+            "language": language,
+        }
+
+    async def transcribe(self, audio_bytes: bytes, mimetype: str = "audio/wav") -> str:
+        """
+        Transcribe audio bytes without blocking the event loop.
+        """
+        return await self._post(audio_bytes, mimetype)
+
+    async def transcribe_stream(self, chunks, mimetype: str = "audio/wav") -> str:
+        """
+        Transcribe an async iterator of audio bytes.
+
+        The body is sent with chunked transfer encoding, so the upload
+        runs while the audio is still being captured.
+        """
+        return await self._post(chunks, mimetype)
+
+    # --------------------------------------------------
+
+    async def _post(self, content, mimetype: str) -> str:
+        if isinstance(content, memoryview):
+            # Zero-copy recorder output; stream it instead of copying to bytes
+            content = _single_chunk(content)
+
+        # Only the time after the last byte is sent is STT latency;
+        # a streamed body is uploaded while the caller is talking
+        sent_at = [time.perf_counter()]
+
+        async def timed(chunks):
+            async for chunk in chunks:
+                yield chunk
+            sent_at[0] = time.perf_counter()
+
+        if not isinstance(content, (bytes, bytearray)):
+            content = timed(content)
+
+        response = await self.pool.post(
+            "/v1/listen",
+            params=self.params,
+            content=content,
+            headers={"Content-Type": mimetype},
+        )
+        tracer.record("stt", time.perf_counter() - sent_at[0])
+
+        return (
+            response.json()["results"]["channels"][0]["alternatives"][0]["transcript"]
+        )
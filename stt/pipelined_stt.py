@@ -0,0 +1,71 @@
+"""
+Pipelined Turn-based STT
+Uploads audio to Deepgram while the caller is still speaking
+
+The recorder runs in a worker thread and hands each chunk to the
+event loop; the chunks are streamed as the request body, and the
+request is finalized as soon as the recorder detects end of speech.
+Only the tail of the upload and Deepgram's processing remain on the
+critical path, not the whole utterance.
+"""
+
+import asyncio
+import contextvars
+import threading
+
+from audio.wav import wav_header
+
+
+class PipelinedTranscriber:
+    def __init__(self, recorder, stt, run_blocking=None):
+        """
+        run_blocking: async runner for the capture loop, e.g.
+        runtime.executors.run_device; the loop's default pool if None.
+        """
+        self.recorder = recorder
+        self.stt = stt
+        self.run_blocking = run_blocking
+
+    async def listen_and_transcribe(self, **barge_in) -> str:
+        """
+        Record and transcribe one turn; barge_in is passed to iter_chunks().
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+
+        def produce():
+            try:
+                for chunk in self.recorder.iter_chunks(**barge_in):
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk.tobytes())
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+
+        async def body():
+            yield wav_header(self.recorder.sample_rate, self.recorder.channels)
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    return
+                yield chunk
+
+        if self.run_blocking is not None:
+            producer = asyncio.ensure_future(self.run_blocking(produce))
+        else:
+            # Copy the context so capture spans carry the current turn
+            producer = loop.run_in_executor(None, contextvars.copy_context().run, produce)
+        try:
+            transcript = await self.stt.transcribe_stream(body())
+        except BaseException:
+            # Don't keep capturing (up to max_record_ms) for a dead request
+            stop.set()
+            cancel = getattr(self.recorder, "cancel", None)
+            if cancel is not None:
+                cancel()
+            raise
+        finally:
+            await producer
+
+        return transcript
@@ -0,0 +1,463 @@
+"""
+On-demand Profiling
+Per-session CPU profiles, memory snapshots and event-loop lag
+
+Everything is off until switched on at runtime, so a slow call can
+be profiled without a restart:
+
+    profile   cProfile or a stack sampler around one session's (or
+              every session's) handle_input calls. cProfile dumps
+              .pstats (snakeviz, gprof2dot, flameprof); the sampler
+              dumps collapsed stacks (.folded: flamegraph.pl,
+              speedscope, inferno).
+    memory    tracemalloc snapshots filtered to ConversationMemory and
+              storage: .tracemalloc (Snapshot.load), a .folded file
+              weighted by bytes, and a text top/diff report.
+    lag       event-loop lag into the "loop_lag" histogram, plus a
+              watchdog thread that dumps the loop thread's stack
+              whenever the loop stalls.
+
+Switches:
+
+    SIGUSR1   toggle sampling of every session
+    SIGUSR2   memory snapshot (the first one starts tracemalloc)
+    control   line commands on a unix socket (PROFILE_SOCKET):
+
+        profile start [SESSION|*] [cprofile|sample]
+        profile stop [SESSION|*]
+        memory snapshot | memory stop
+        lag start [STALL_MS] | lag stop
+        status
+
+    python -m telemetry.profiling /tmp/agent.sock profile start CA42 cprofile
+"""
+
+import asyncio
+import cProfile
+import os
+import pstats
+import re
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+import traceback
+from collections import Counter
+
+from runtime.executors import run_disk
+from telemetry.tracing import tracer
+
+
+MEMORY_PATTERNS = ("*/memory/memory.py", "*/hospital_agent/storage.py")
+
+
+def _dump_path(out_dir: str, name: str, suffix: str) -> str:
+    os.makedirs(out_dir, exist_ok=True)
+    name = "all" if name == "*" else re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+    return os.path.join(out_dir, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}{suffix}")
+
+
+def _frame_name(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _write_folded(path: str, counts: Counter):
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, n in counts.most_common():
+            f.write(f"{stack} {n}\n")
+
+
+# ------------------------------------------------------
+# Session CPU profiles
+# ------------------------------------------------------
+
+class _Target:
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.profiles = {}
+        self.samples = Counter()
+        self.inflight = 0
+
+
+class SessionProfiler:
+    def __init__(self, out_dir: str, sample_interval_ms: float = 5.0):
+        self.out_dir = out_dir
+        self.sample_interval = sample_interval_ms / 1000
+
+        self._targets = {}
+        self._active = {}
+        self._lock = threading.Condition()
+        self._sampler = None
+
+    @property
+    def targets(self) -> dict:
+        return {key: t.mode for key, t in self._targets.items()}
+
+    # --------------------------------------------------
+
+    def start(self, session: str = "*", mode: str = "sample"):
+        if mode not in ("cprofile", "sample"):
+            raise RuntimeError(f"Unknown profile mode: {mode}")
+        with self._lock:
+            if session in self._targets:
+                raise RuntimeError(f"Already profiling {session}")
+            self._targets[session] = _Target(mode)
+            if mode == "sample" and self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample, name="profile-sampler", daemon=True)
+                self._sampler.start()
+
+    def stop(self, session: str = "*", timeout: float = 5.0) -> str:
+        """
+        Stop profiling session and dump its profile; returns the path.
+        """
+        with self._lock:
+            target = self._targets.pop(session, None)
+            if target is None:
+                raise RuntimeError(f"Not profiling {session}")
+            # Let in-flight calls finish before reading their profiles
+            self._lock.wait_for(lambda: not target.inflight, timeout)
+            samples = Counter(target.samples)
+
+        if target.mode == "sample":
+            path = _dump_path(self.out_dir, session, ".folded")
+            _write_folded(path, samples)
+            return path
+
+        path = _dump_path(self.out_dir, session, ".pstats")
+        profiles = list(target.profiles.values())
+        if profiles:
+            stats = pstats.Stats(profiles[0])
+            for profile in profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(path)
+        else:
+            cProfile.Profile().dump_stats(path)
+        return path
+
+    def stop_all(self) -> list:
+        return [self.stop(session) for session in list(self._targets)]
+
+    # --------------------------------------------------
+
+    def call(self, session: str, fn, *args, **kwargs):
+        """
+        Run fn (on a worker thread), profiled if session is targeted.
+        """
+        if not self._targets:
+            return fn(*args, **kwargs)
+
+        with self._lock:
+            target = self._targets.get(session) or self._targets.get("*")
+            if target is not None:
+                target.inflight += 1
+                if target.mode == "cprofile":
+                    profile = target.profiles.setdefault(session, cProfile.Profile())
+                else:
+                    self._active[threading.get_ident()] = (session, target)
+
+        if target is None:
+            return fn(*args, **kwargs)
+        try:
+            if target.mode == "cprofile":
+                return profile.runcall(fn, *args, **kwargs)
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active.pop(threading.get_ident(), None)
+                target.inflight -= 1
+                self._lock.notify_all()
+
+    def _sample(self):
+        call_code = SessionProfiler.call.__code__
+        while True:
+            time.sleep(self.sample_interval)
+            with self._lock:
+                if not any(t.mode == "sample" for t in self._targets.values()):
+                    self._sampler = None
+                    return
+                active = list(self._active.items())
+
+            frames = sys._current_frames()
+            samples = []
+            for ident, (session, target) in active:
+                frame = frames.get(ident)
+                stack = []
+                while frame is not None and frame.f_code is not call_code:
+                    stack.append(_frame_name(frame.f_code))
+                    frame = frame.f_back
+                if stack:
+                    samples.append((target, ";".join([session] + stack[::-1])))
+
+            with self._lock:
+                for target, stack in samples:
+                    target.samples[stack] += 1
+
+
+# ------------------------------------------------------
+# Memory snapshots
+# ------------------------------------------------------
+
+class MemorySnapshots:
+    def __init__(self, out_dir: str, frames: int = 25, patterns=MEMORY_PATTERNS, top: int = 25):
+        self.out_dir = out_dir
+        self.frames = frames
+        self.patterns = patterns
+        self.top = top
+        self._previous = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def snapshot(self) -> str:
+        """
+        Dump a filtered snapshot; starts tracemalloc on first use.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._previous = None
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(True, p, all_frames=True) for p in self.patterns]
+        )
+        path = _dump_path(self.out_dir, "memory", "")
+        snapshot.dump(path + ".tracemalloc")
+
+        folded = Counter()
+        for stat in snapshot.statistics("traceback"):
+            stack = ";".join(f"{os.path.basename(f.filename)}:{f.lineno}" for f in stat.traceback)
+            folded[stack] += stat.size
+        _write_folded(path + ".folded", folded)
+
+        with open(path + ".txt", "w", encoding="utf-8") as f:
+            f.write(f"Top {self.top} lines\n")
+            for stat in snapshot.statistics("lineno")[: self.top]:
+                f.write(f"{stat}\n")
+            if self._previous is not None:
+                f.write("\nGrowth since previous snapshot\n")
+                for stat in snapshot.compare_to(self._previous, "lineno")[: self.top]:
+                    f.write(f"{stat}\n")
+
+        self._previous = snapshot
+        return path + ".tracemalloc"
+
+    def stop(self):
+        tracemalloc.stop()
+        self._previous = None
+
+
+# ------------------------------------------------------
+# Event-loop lag
+# ------------------------------------------------------
+
+class LoopLagMonitor:
+    def __init__(self, out_dir: str, interval_ms: float = 100.0, stall_ms: float = 250.0):
+        self.out_dir = out_dir
+        self.interval = interval_ms / 1000
+        self.stall = stall_ms / 1000
+
+        self.max_lag = 0.0
+        self.stalls = 0
+        self.log_file = None
+
+        self._task = None
+        self._watchdog = None
+        self._stop = threading.Event()
+        self._beat = 0.0
+        self._loop_thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self, stall_ms: float = None):
+        """
+        Start on the running loop; must be called from the loop thread.
+        """
+        if self.running:
+            raise RuntimeError("Loop lag monitor already running")
+        if stall_ms is not None:
+            self.stall = stall_ms / 1000
+
+        self.max_lag = 0.0
+        self.stalls = 0
+        self.log_file = _dump_path(self.out_dir, "loop-stalls", ".log")
+        self._loop_thread = threading.get_ident()
+        self._beat = time.perf_counter()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._tick())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def _tick(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - start - self.interval)
+            tracer.record("loop_lag", lag)
+            self.max_lag = max(self.max_lag, lag)
+            self._beat = now
+
+    def _watch(self):
+        stalled = False
+        while not self._stop.wait(self.interval / 2):
+            late = time.perf_counter() - self._beat - self.interval
+            if late <= self.stall:
+                stalled = False
+                continue
+            if stalled:
+                continue
+
+            # The loop is blocked right now: record what it is running
+            stalled = True
+            self.stalls += 1
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = "".join(traceback.format_stack(frame)) if frame else "<no frame>\n"
+            with open(self.log_file, "a", encoding="utf-8") as f:
+                f.write(f"--- {time.strftime('%H:%M:%S')} loop stalled > {1000 * late:.0f} ms\n{stack}\n")
+
+    def stop(self) -> str:
+        if not self.running:
+            raise RuntimeError("Loop lag monitor not running")
+        self._task.cancel()
+        self._task = None
+        self._stop.set()
+        self._watchdog.join()
+        return self.log_file
+
+
+# ------------------------------------------------------
+# Control
+# ------------------------------------------------------
+
+class Profiler:
+    def __init__(self, out_dir: str = None):
+        out_dir = out_dir or os.getenv("PROFILE_DIR", "profiles")
+        self.sessions = SessionProfiler(out_dir)
+        self.memory = MemorySnapshots(out_dir)
+        self.loop_lag = LoopLagMonitor(out_dir)
+
+    def call(self, session: str, fn, *args, **kwargs):
+        return self.sessions.call(session, fn, *args, **kwargs)
+
+    # --------------------------------------------------
+
+    async def execute(self, line: str) -> str:
+        """
+        Run one control command; returns a one-line reply.
+        """
+        command, rest = tuple(line.split()[:2]), line.split()[2:]
+        try:
+            if command == ("profile", "start"):
+                session = rest[0] if rest else "*"
+                mode = rest[1] if len(rest) > 1 else "sample"
+                self.sessions.start(session, mode)
+                return f"profiling {session} ({mode})"
+
+            if command == ("profile", "stop"):
+                return f"wrote {await run_disk(self.sessions.stop, rest[0] if rest else '*')}"
+
+            if command == ("memory", "snapshot"):
+                return f"wrote {await run_disk(self.memory.snapshot)}"
+
+            if command == ("memory", "stop"):
+                self.memory.stop()
+                return "tracemalloc stopped"
+
+            if command == ("lag", "start"):
+                self.loop_lag.start(float(rest[0]) if rest else None)
+                return f"monitoring loop lag, stalls logged to {self.loop_lag.log_file}"
+
+            if command == ("lag", "stop"):
+                path = self.loop_lag.stop()
+                lag = self.loop_lag
+                return f"max lag {1000 * lag.max_lag:.0f} ms, {lag.stalls} stalls in {path}"
+
+            if command == ("status",):
+                return self.status()
+        except (RuntimeError, ValueError) as e:
+            return f"error: {e}"
+
+        return f"unknown command: {line.strip()}"
+
+    def status(self) -> str:
+        profiles = ", ".join(f"{s} ({m})" for s, m in self.sessions.targets.items()) or "off"
+        lag = f"on, max {1000 * self.loop_lag.max_lag:.0f} ms" if self.loop_lag.running else "off"
+        memory = "tracing" if self.memory.tracing else "off"
+        return f"profile: {profiles}; memory: {memory}; lag: {lag}"
+
+    def _on_signal(self, line: str):
+        async def run():
+            print(f"🔬 {await self.execute(line)}")
+
+        asyncio.get_running_loop().create_task(run())
+
+    def install_signals(self):
+        """
+        SIGUSR1 toggles sampling of all sessions, SIGUSR2 snapshots memory.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(
+                signal.SIGUSR1,
+                lambda: self._on_signal("profile stop *" if "*" in self.sessions.targets else "profile start *"),
+            )
+            loop.add_signal_handler(signal.SIGUSR2, lambda: self._on_signal("memory snapshot"))
+        except (AttributeError, NotImplementedError, RuntimeError):
+            # No POSIX signals here (Windows) or not the main thread
+            pass
+
+    async def serve(self, path: str):
+        """
+        Answer control commands on a unix socket until cancelled.
+        """
+        async def client(reader, writer):
+            try:
+                while line := await reader.readline():
+                    writer.write((await self.execute(line.decode()) + "\n").encode())
+                    await writer.drain()
+            finally:
+                writer.close()
+
+        if os.path.exists(path):
+            os.remove(path)
+        server = await asyncio.start_unix_server(client, path)
+        try:
+            await asyncio.Future()
+        finally:
+            server.close()
+            os.remove(path)
+
+    async def close(self):
+        """
+        Stop whatever is running and write its dumps.
+        """
+        if self.loop_lag.running:
+            self.loop_lag.stop()
+        for path in await run_disk(self.sessions.stop_all):
+            print(f"🔬 Wrote {path}")
+
+
+profiler = Profiler()
+
+
+# ------------------------------------------------------
+# Control client
+# ------------------------------------------------------
+
+async def _send(path: str, line: str) -> str:
+    reader, writer = await asyncio.open_unix_connection(path)
+    writer.write((line + "\n").encode())
+    await writer.drain()
+    reply = await reader.readline()
+    writer.close()
+    return reply.decode().strip()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(2)
+    print(asyncio.run(_send(sys.argv[1], " ".join(sys.argv[2:]))))
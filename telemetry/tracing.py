@@ -0,0 +1,228 @@
+"""
+Per-turn Latency Tracing
+Stage spans, latency histograms, Prometheus text and JSONL traces
+
+Stages of a voice turn:
+
+    capture           recorder armed -> turn captured
+    endpointing       trailing silence waited before the turn ended
+    stt               end of upload -> transcript
+    handle_input      agent NLU / dialogue step
+    save_appointment  storage write
+    tts_first_byte    TTS request -> first audio bytes
+    tts_complete      TTS request -> last audio bytes
+    playback          reply playback (start -> end or barge-in)
+
+Spans cost two perf_counter() calls, a bisect into fixed log-spaced
+buckets and (only with a trace file) one buffered dict, so tracing
+stays on in production. The session/turn a span belongs to comes
+from context variables set by begin_turn().
+
+Set tracer.trace_file to append one JSON line per span, and call
+write_prometheus() to export p50/p95/p99 (and gauges such as the
+rate limiter's queue depth) for a textfile collector.
+"""
+
+import bisect
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+STAGES = (
+    "capture",
+    "endpointing",
+    "stt",
+    "handle_input",
+    "save_appointment",
+    "tts_first_byte",
+    "tts_complete",
+    "playback",
+)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# 1 ms .. ~100 s, 4 buckets per doubling
+BUCKETS = tuple(0.001 * 2 ** (i / 4) for i in range(68))
+
+_session = contextvars.ContextVar("trace_session", default=None)
+_turn = contextvars.ContextVar("trace_turn", default=None)
+
+
+class Histogram:
+    def __init__(self, bounds=BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate by linear interpolation inside the target bucket.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.bounds[i - 1] if i else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.bounds[-1]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.bounds[-1]
+
+
+class Tracer:
+    def __init__(self, trace_file: str = None, flush_every: int = 256, enabled: bool = True):
+        """
+        flush_every=None leaves flushing to the caller (e.g. a
+        background exporter) instead of writing from record().
+        """
+        self.trace_file = trace_file
+        self.flush_every = flush_every
+        self.enabled = enabled
+
+        self.histograms = {}
+        self.gauges = {}
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._turns = 0
+
+    # --------------------------------------------------
+
+    def begin_turn(self, session: str = None) -> int:
+        """
+        Start a new turn in the current context; later spans carry it.
+        """
+        with self._lock:
+            self._turns += 1
+            turn = self._turns
+        if session is not None:
+            _session.set(session)
+        _turn.set(turn)
+        return turn
+
+    def record(self, stage: str, seconds: float, **attrs):
+        """
+        Record a duration measured elsewhere.
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            hist = self.histograms.get(stage)
+            if hist is None:
+                hist = self.histograms[stage] = Histogram()
+            hist.observe(seconds)
+
+            if self.trace_file:
+                self._buffer.append({
+                    "ts": time.time(),
+                    "session": _session.get(),
+                    "turn": _turn.get(),
+                    "stage": stage,
+                    "ms": round(1000 * seconds, 2),
+                    **attrs,
+                })
+                full = bool(self.flush_every) and len(self._buffer) >= self.flush_every
+            else:
+                full = False
+
+        if full:
+            self.flush()
+
+    def gauge(self, name: str, value: float):
+        """
+        Set a point-in-time value (queue depth, running totals).
+        """
+        if self.enabled:
+            self.gauges[name] = value
+
+    @contextmanager
+    def span(self, stage: str, **attrs):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, **attrs)
+
+    # --------------------------------------------------
+
+    def flush(self):
+        """
+        Append buffered spans to the JSON-lines trace file.
+        """
+        with self._lock:
+            records, self._buffer = self._buffer, []
+        if records and self.trace_file:
+            with open(self.trace_file, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(r) + "\n" for r in records))
+
+    def prometheus(self) -> str:
+        with self._lock:
+            snapshot = {
+                stage: (list(h.counts), h.count, h.sum, [h.quantile(q) for q in QUANTILES])
+                for stage, h in self.histograms.items()
+            }
+            gauges = dict(self.gauges)
+
+        lines = [
+            "# HELP voice_stage_seconds Latency of each voice turn stage.",
+            "# TYPE voice_stage_seconds histogram",
+        ]
+        for stage, (counts, count, total, _) in snapshot.items():
+            cumulative = 0
+            for bound, n in zip(BUCKETS, counts):
+                cumulative += n
+                lines.append(f'voice_stage_seconds_bucket{{stage="{stage}",le="{bound:.6g}"}} {cumulative}')
+            lines.append(f'voice_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {count}')
+            lines.append(f'voice_stage_seconds_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'voice_stage_seconds_count{{stage="{stage}"}} {count}')
+
+        lines += [
+            "# HELP voice_stage_quantile_seconds Estimated latency quantiles per stage.",
+            "# TYPE voice_stage_quantile_seconds gauge",
+        ]
+        for stage, (_, _, _, values) in snapshot.items():
+            for q, value in zip(QUANTILES, values):
+                lines.append(f'voice_stage_quantile_seconds{{stage="{stage}",quantile="{q}"}} {value:.6f}')
+
+        if gauges:
+            lines += [
+                "# HELP voice_gauge Current value of a gauge (e.g. rate limiter queue depth).",
+                "# TYPE voice_gauge gauge",
+            ]
+            lines += [f'voice_gauge{{name="{name}"}} {value:g}' for name, value in gauges.items()]
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """
+        Atomically replace path (node_exporter textfile collector).
+        """
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus())
+        os.replace(tmp, path)
+
+    def summary(self) -> str:
+        rows = [f"{'stage':>18} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"]
+        ordered = sorted(self.histograms, key=lambda s: STAGES.index(s) if s in STAGES else len(STAGES))
+        for stage in ordered:
+            h = self.histograms[stage]
+            p50, p95, p99 = (1000 * h.quantile(q) for q in QUANTILES)
+            rows.append(f"{stage:>18} {h.count:>6} {p50:>8.0f} {p95:>8.0f} {p99:>8.0f}")
+        return "\n".join(rows)
+
+
+# Process-wide tracer; entry points set trace_file from the environment
+tracer = Tracer()
@@ -0,0 +1,114 @@
+import pytest
+
+from hospital_agent import response as R
+from hospital_agent import storage
+from hospital_agent.agent import HospitalAppointmentAgent
+from hospital_agent.state import ConversationState
+from memory.memory import ConversationMemory
+
+
+@pytest.fixture(autouse=True)
+def appointments_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "DATA_FILE", str(tmp_path / "appointments.db"))
+    yield
+    storage.close()
+
+
+def agent(phone=None):
+    memory = ConversationMemory()
+    memory.start_session("test")
+    return HospitalAppointmentAgent(memory=memory, caller_phone=phone)
+
+
+def book(phone=None, name="Asha Rao", date="12 mar"):
+    caller = agent(phone)
+    for text in ["book cardiology", "doctor kumar", date]:
+        caller.handle_input(text)
+    slot = caller.context["slots"][0]
+    caller.handle_input(slot.lower())
+    assert "confirmed" in caller.handle_input(f"my name is {name}")
+    return storage.find_appointment_by_name(name)
+
+
+def test_cancel_by_phone_and_name_is_read_back_first():
+    booked = book(phone="+91 98765 43210")
+    assert booked["phone"] == "9876543210"
+
+    caller = agent()
+    assert "appointment ID" in caller.handle_input("I want to cancel my appointment")
+    # A phone number alone is not a name: ask for it
+    assert caller.handle_input("my phone is 98765 43210") == R.ASK_LOOKUP_NAME
+    assert "couldn't find" in caller.handle_input("Vikram Singh")
+    reply = caller.handle_input("my number is 98765 43210 and my name is asha rao")
+    assert "Shall I cancel it" in reply and booked["time"] in reply
+    assert storage.booked_slots(booked["doctor"], booked["date"]) == {booked["time"]}
+
+    reply = caller.handle_input("yes please")
+    assert "has been cancelled" in reply
+    assert caller.state == ConversationState.CLOSE
+
+    assert storage.booked_slots(booked["doctor"], booked["date"]) == set()
+    assert book(name="Rahul Das")["time"] == booked["time"]
+
+
+def test_declined_read_back_cancels_nothing():
+    booked = book(phone="9876543210")
+
+    caller = agent(phone="9876543210")
+    assert caller.handle_input("cancel it please") == R.ASK_LOOKUP_NAME
+    assert "Shall I cancel it" in caller.handle_input("Asha Rao")
+    assert caller.handle_input("no, a different one") == R.ASK_APPOINTMENT_LOOKUP
+    assert storage.booked_slots(booked["doctor"], booked["date"]) == {booked["time"]}
+
+
+def test_only_an_introduced_name_is_used_for_lookup():
+    caller = agent(phone="9876543210")
+    caller.handle_input("I want to cancel")
+    assert caller._lookup_key("my phone is 98765 43210") is None
+    assert caller._lookup_key("cancel it please") is None
+    assert caller._lookup_key("my name is asha rao") == {"phone": "9876543210", "patient_name": "Asha Rao"}
+
+
+def test_bookings_for_one_caller_resolve_to_the_first_made():
+    first = book(phone="9876543210", date="3 sep")
+    book(phone="9876543210", date="12 mar")
+    found = storage.find_appointment(phone="9876543210", patient_name="asha rao")
+    assert found["appointment_id"] == first["appointment_id"]
+
+
+def test_cancel_by_spoken_appointment_id_in_one_statement():
+    booked = book()
+    spoken = " ".join(booked["appointment_id"].replace("-", " "))
+
+    statements = []
+    storage._connect().set_trace_callback(statements.append)
+    reply = agent().handle_input(f"please cancel appointment {spoken}")
+    storage._connect().set_trace_callback(None)
+
+    assert "has been cancelled" in reply
+    assert len(statements) == 1 and statements[0].startswith("UPDATE")
+
+
+def test_reschedule_moves_the_booking_and_releases_the_old_slot():
+    booked = book(phone="9876543210")
+
+    caller = agent(phone="9876543210")
+    caller.handle_input("I need to reschedule")
+    assert "Which date" in caller.handle_input("Asha Rao")
+    caller.handle_input("14 mar")
+    new_slot = caller.context["slots"][1]
+    reply = caller.handle_input(new_slot.lower())
+
+    assert booked["appointment_id"] in reply and new_slot in reply
+    moved = storage.find_appointment(appointment_id=booked["appointment_id"])
+    assert (moved["date"], moved["time"]) != (booked["date"], booked["time"])
+    assert storage.booked_slots(booked["doctor"], booked["date"]) == set()
+
+
+def test_phone_lookup_uses_the_index():
+    plan = storage._connect().execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM appointments "
+        "WHERE phone = ? AND patient_name = ? COLLATE NOCASE AND status = 'CONFIRMED'",
+        ("9876543210", "Asha Rao"),
+    ).fetchall()
+    assert any("by_phone_name" in row["detail"] for row in plan)
@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from gateway.call_session import CallSession
+from hospital_agent import storage
+from runtime.executors import run_disk
+
+
+@pytest.fixture(autouse=True)
+def appointments_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "DATA_FILE", str(tmp_path / "appointments.db"))
+    yield
+    storage.close()
+
+
+class FakeTTS:
+    sample_rate = 8000
+
+
+def session():
+    return CallSession(ws=None, stream_sid="MZ1", call_sid="CA1", stt=None, tts=FakeTTS())
+
+
+def test_transcripts_set_the_reply_language():
+    call = session()
+
+    async def turns():
+        await call.handle_input("मुझे डॉक्टर से मिलना है")
+        after_hindi = call.language
+        await call.handle_input("12 march")
+        return after_hindi, call.language
+
+    assert asyncio.run(turns()) == ("hi", "hi")
+
+
+def test_native_transcripts_reach_the_agent_as_keywords():
+    call = session()
+    seen = []
+    call.agent.handle_input = lambda text: seen.append(text) or "ok"
+
+    asyncio.run(call.handle_input("मुझे डॉक्टर से मिलना है"))
+    assert seen == ["mujhe doctor se milana hai"]
+
+
+@pytest.mark.parametrize("turns", [
+    ["मुझे कार्डियोलॉजी में अपॉइंटमेंट बुक करना है", "डॉक्टर कुमार", "कल", "9 बजे"],
+    ["எனக்கு கார்டியாலஜி அப்பாயிண்ட்மென்ட் புக் பண்ணுங்க", "டாக்டர் குமார்", "நாளை", "9 மணி"],
+])
+def test_native_script_callers_can_book(turns):
+    call = session()
+
+    async def converse():
+        for text in turns:
+            await call.handle_input(text)
+
+    asyncio.run(converse())
+    assert call.agent.context["department"] == "Cardiology"
+    assert call.agent.context["doctor"]["name"] == "Dr. Kumar"
+    assert call.agent.context["time"] == "9:00 AM"
+
+
+def test_agent_steps_run_one_at_a_time_off_the_disk_pool():
+    call = session()
+    active, overlaps = [], []
+    release = threading.Event()
+
+    def slow_step(text):
+        active.append(text)
+        overlaps.append(len(active))
+        release.wait(timeout=5)
+        time.sleep(0.01)
+        active.remove(text)
+        return f"reply to {text}"
+
+    call.agent.handle_input = slow_step
+
+    async def turns():
+        steps = [asyncio.create_task(call.handle_input(t)) for t in ("one", "two")]
+        # The shared disk pool is not held up by a blocked agent step
+        await asyncio.wait_for(run_disk(lambda: None), timeout=1)
+        release.set()
+        return [reply for reply, _ in await asyncio.gather(*steps)]
+
+    assert asyncio.run(turns()) == ["reply to one", "reply to two"]
+    assert overlaps == [1, 1]
+    call.agent_steps.shutdown()
+
+
+def test_failed_reply_keeps_the_call_listening():
+    call = session()
+    cancelled = []
+    delay = 0.01
+
+    async def speak(text, render=None):
+        raise RuntimeError("TTS down")
+
+    async def listen(barge_in=False):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "hello"
+
+    call.speak, call.listen = speak, listen
+    assert asyncio.run(call.respond("Hi")) == "hello"
+
+    async def hang_up():
+        reply = asyncio.create_task(call.respond("Hi"))
+        await asyncio.sleep(0.01)
+        reply.cancel()
+        await asyncio.gather(reply, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    delay = 10
+    asyncio.run(hang_up())
+    assert cancelled == [True]
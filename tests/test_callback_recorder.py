@@ -0,0 +1,86 @@
+import io
+import threading
+import time
+import wave
+
+import numpy as np
+import pytest
+
+try:
+    from audio import callback_recorder
+except (ImportError, OSError):  # sounddevice or PortAudio missing
+    pytest.skip("sounddevice is not available", allow_module_level=True)
+
+
+CHUNK = 1600  # 100 ms at 16 kHz
+SILENCE = np.zeros((CHUNK, 1), dtype=np.int16)
+SPEECH = np.full((CHUNK, 1), 5000, dtype=np.int16)
+
+
+class FakeInputStream:
+    """
+    Stands in for PortAudio; the test pushes blocks into the callback.
+    """
+
+    def __init__(self, callback, **kwargs):
+        self.callback = callback
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    monkeypatch.setattr(callback_recorder.sd, "InputStream", FakeInputStream)
+    rec = callback_recorder.CallbackRecorder(pre_roll_ms=300, silence_duration_ms=500)
+    rec.open()
+    yield rec
+    rec.close()
+
+
+def feed(rec, blocks):
+    for block in blocks:
+        rec._callback(block, len(block), None, None)
+
+
+def record(rec, before, after):
+    """
+    Feed blocks, start a turn, feed more; return the turn's samples.
+    """
+    feed(rec, before)
+    result = {}
+    turn = threading.Thread(target=lambda: result.update(view=rec.record_view()))
+    turn.start()
+    while rec._endpoint is None:
+        time.sleep(0.001)
+    feed(rec, after)
+    turn.join(timeout=5)
+
+    with wave.open(io.BytesIO(bytes(result["view"]))) as wav:
+        return np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+
+
+def test_turn_starts_pre_roll_before_the_onset(recorder):
+    audio = record(recorder, [SILENCE] * 10, [SILENCE] * 3 + [SPEECH] * 5 + [SILENCE] * 5)
+
+    assert recorder.stop_reason == "silence"
+    # 300 ms of the quiet lead-in, then the speech
+    assert not audio[:4800].any()
+    assert (audio[4800:4800 + 5 * CHUNK] == 5000).all()
+
+
+def test_speech_before_the_turn_is_armed_is_kept(recorder):
+    record(recorder, [SILENCE] * 5, [SPEECH] * 2 + [SILENCE] * 5)
+
+    # The caller starts talking before the next record_view() call;
+    # the stream stayed open, so the ring already holds that audio
+    audio = record(recorder, [SILENCE] * 2 + [SPEECH] * 4, [SPEECH] * 2 + [SILENCE] * 5)
+
+    assert (audio[:4800 + 2 * CHUNK] == 5000).all()
+    assert recorder.stats.callbacks == 25
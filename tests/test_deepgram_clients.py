@@ -0,0 +1,56 @@
+import asyncio
+
+from benchmarks.mock_deepgram import STATS, start_mock_server
+from net.http_pool import HTTPPool
+from stt.async_deepgram_stt import AsyncDeepgramSTT
+from tts.async_deepgram_tts import AsyncDeepgramTTS
+
+
+def with_mock(scenario, **kwargs):
+    async def run():
+        runner, base_url = await start_mock_server(latency_ms=20, **kwargs)
+        pool = HTTPPool("mock-key", base_url=base_url, max_connections=4)
+        try:
+            return await scenario(pool), runner.app[STATS]
+        finally:
+            await pool.close()
+            await runner.cleanup()
+
+    return asyncio.run(run())
+
+
+def test_transcribe_bytes_and_memoryview():
+    async def scenario(pool):
+        stt = AsyncDeepgramSTT(pool)
+        return [
+            await stt.transcribe(b"RIFF-audio"),
+            await stt.transcribe(memoryview(b"RIFF-audio")),
+        ]
+
+    transcripts, stats = with_mock(scenario)
+    assert transcripts == ["book an appointment in cardiology"] * 2
+    assert stats["requests"] == 2
+
+
+def test_synthesize_and_stream_return_the_same_audio():
+    async def scenario(pool):
+        tts = AsyncDeepgramTTS(pool)
+        buffered = await tts.synthesize("Hello")
+        chunks = [chunk async for chunk in tts.stream("Hello")]
+        return buffered, chunks
+
+    (buffered, chunks), _ = with_mock(scenario, tts_ms=500, tts_realtime=50)
+    assert len(buffered) == 24000 // 2 * 2
+    assert len(chunks) > 1 and b"".join(chunks) == buffered
+
+
+def test_concurrent_sessions_share_one_client():
+    async def scenario(pool):
+        client = pool.client
+        sessions = [AsyncDeepgramSTT(pool), AsyncDeepgramSTT(pool, language="hi")]
+        results = await asyncio.gather(*(sessions[i % 2].transcribe(b"audio") for i in range(12)))
+        return results, pool.client is client
+
+    (results, shared), stats = with_mock(scenario)
+    assert len(results) == 12 and stats["requests"] == 12
+    assert shared
@@ -0,0 +1,57 @@
+import json
+import os
+
+from language.detect_language import detect_caller_language, detect_language, detect_languages
+
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "language_samples.json")
+
+
+def _samples():
+    with open(FIXTURE, encoding="utf-8") as f:
+        return [tuple(s) for s in json.load(f)]
+
+
+def test_native_scripts():
+    assert detect_language("मुझे डॉक्टर चाहिए") == "hi"
+    assert detect_language("எனக்கு மருத்துவர் வேண்டும்") == "ta"
+    assert detect_language("నాకు డాక్టర్ కావాలి") == "te"
+    assert detect_language("ನನಗೆ ವೈದ್ಯರು ಬೇಕು") == "kn"
+    assert detect_language("എനിക്ക് ഡോക്ടറെ വേണം") == "ml"
+
+
+def test_empty_and_english_default():
+    assert detect_language("") == "en"
+    assert detect_language("  ") == "en"
+    assert detect_language("123") == "en"
+    assert detect_language("book an appointment") == "en"
+
+
+def test_fixture_accuracy():
+    samples = _samples()
+    correct = sum(detect_language(text) == label for text, label in samples)
+    assert correct / len(samples) >= 0.9
+
+
+def test_batch_matches_single():
+    texts = [text for text, _ in _samples()] + ["", "ok"]
+    assert detect_languages(texts) == [detect_language(t) for t in texts]
+
+
+def test_short_replies_keep_the_call_language():
+    assert detect_caller_language("mujhe kal subah appointment chahiye") == "hi"
+    assert detect_caller_language("12 march", current="hi") == "hi"
+    assert detect_caller_language("haan", current="hi") == "hi"
+    assert detect_caller_language("", current="ta") == "ta"
+    # Native script and longer romanized text switch at once
+    assert detect_caller_language("हाँ", current="en") == "hi"
+    assert detect_caller_language("please book it for the afternoon", current="hi") == "en"
+
+
+def test_english_with_roster_names_stays_english():
+    for text in ["Dr Kumar is fine", "doctor kumar please", "my name is Meena Iyer",
+                 "book Dr Verma please", "Dr Kumar at ten", "is Dr Mehta available"]:
+        assert detect_caller_language(text, current="en") == "en", text
+    # Clearly romanized Indic still switches
+    assert detect_caller_language("naalai kaalai appointment venum") == "ta"
+    assert detect_caller_language("mera appointment cancel kar dijiye") == "hi"
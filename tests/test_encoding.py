@@ -0,0 +1,49 @@
+import io
+import wave
+
+import numpy as np
+import pytest
+
+from audio.encoding import CompactEncoder, trim_silence
+
+
+RATE = 16000
+
+
+def utterance(lead_s=1.0, speech_s=0.5, tail_s=1.0, amp=4000):
+    return np.concatenate([
+        np.zeros(int(lead_s * RATE), dtype=np.int16),
+        np.full(int(speech_s * RATE), amp, dtype=np.int16),
+        np.zeros(int(tail_s * RATE), dtype=np.int16),
+    ]).reshape(-1, 1)
+
+
+def test_trim_keeps_a_guard_around_speech():
+    pcm = utterance()
+    trimmed = trim_silence(pcm, RATE, threshold=350, guard_ms=150)
+
+    guard = int(0.15 * RATE)
+    assert len(trimmed) == int(0.5 * RATE) + 2 * guard
+    assert np.shares_memory(trimmed, pcm)
+    assert not trimmed[:guard].any() and trimmed[guard] == 4000
+
+
+def test_quiet_audio_is_never_trimmed_to_nothing():
+    pcm = utterance(amp=100)
+    assert trim_silence(pcm, RATE, threshold=350) is pcm
+
+
+def test_wav_encoder_sends_the_trimmed_utterance():
+    data, mimetype, report = CompactEncoder("wav").prepare(utterance())
+
+    assert mimetype == "audio/wav"
+    with wave.open(io.BytesIO(data)) as wav:
+        assert wav.getframerate() == RATE
+        assert wav.getnframes() == int(0.8 * RATE)
+    assert report.trimmed_ms == pytest.approx(1700)
+    assert report.sent_bytes == len(data) < report.raw_bytes
+
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError):
+        CompactEncoder("mp3")
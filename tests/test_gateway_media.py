@@ -0,0 +1,62 @@
+import asyncio
+import json
+
+import numpy as np
+
+from gateway import media
+from gateway.call_session import CallPlayer
+
+
+def test_ulaw_round_trip_within_quantization():
+    pcm = (np.sin(np.arange(8000) / 7) * 20000).astype(np.int16)
+    decoded = media.ulaw_decode(media.ulaw_encode(pcm))
+    error = np.abs(decoded.astype(np.int32) - pcm)
+    # μ-law step size grows with amplitude (~3% of the value)
+    assert (error <= np.abs(pcm) * 0.04 + 8).all()
+
+
+def test_resample_integer_ratios():
+    pcm = np.arange(24, dtype=np.int16)
+    assert len(media.resample(pcm, 24000, 8000)) == 8
+    assert len(media.resample(pcm[:8], 8000, 16000)) == 16
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+
+def test_player_frames_and_bounds_reply_audio():
+    ws = FakeSocket()
+    player = CallPlayer(ws, "MZ1", sample_rate=8000, outbound_frames=4, lead_ms=1000)
+
+    async def play():
+        sender = asyncio.create_task(player.run_sender())
+        # 0.5 s of audio plus an odd trailing byte
+        completed = await player.play_async(bytes(8000) + b"\x00")
+        sender.cancel()
+        return completed
+
+    assert asyncio.run(play())
+    frames = [media.media_payload(m) for m in ws.sent if m["event"] == "media"]
+    assert len(frames) == 25
+    assert all(len(f) == media.FRAME_BYTES for f in frames)
+    assert player.queue.maxsize == 4
+
+
+def test_barge_in_clears_queue():
+    ws = FakeSocket()
+    player = CallPlayer(ws, "MZ1", sample_rate=8000, outbound_frames=8)
+
+    async def interrupt():
+        for _ in range(5):
+            player.queue.put_nowait(b"\xff" * media.FRAME_BYTES)
+        player.stop()
+        await asyncio.sleep(0)
+
+    asyncio.run(interrupt())
+    assert player.queue.empty()
+    assert ws.sent == [{"event": "clear", "streamSid": "MZ1"}]
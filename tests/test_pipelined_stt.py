@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from audio.wav import HEADER_SIZE, STREAMING_SIZE
+from benchmarks.mock_deepgram import start_mock_server
+from net.http_pool import HTTPPool
+from stt.async_deepgram_stt import AsyncDeepgramSTT
+from stt.pipelined_stt import PipelinedTranscriber
+
+
+class FakeRecorder:
+    sample_rate = 16000
+    channels = 1
+
+    def __init__(self, chunks=5, delay=0.03):
+        self.chunks = chunks
+        self.delay = delay
+        self.done_at = None
+        self.barge_in = None
+        self.cancelled = False
+
+    def iter_chunks(self, **barge_in):
+        self.barge_in = barge_in
+        for i in range(self.chunks):
+            if self.cancelled:
+                break
+            time.sleep(self.delay)
+            yield np.full((1600, 1), i, dtype=np.int16)
+        self.done_at = time.perf_counter()
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class RecordingSTT:
+    def __init__(self):
+        self.received = []
+
+    async def transcribe_stream(self, chunks, mimetype="audio/wav"):
+        async for chunk in chunks:
+            self.received.append((time.perf_counter(), chunk))
+        return "ok"
+
+
+def test_upload_starts_before_recording_ends():
+    recorder, stt = FakeRecorder(), RecordingSTT()
+    transcriber = PipelinedTranscriber(recorder, stt)
+
+    assert asyncio.run(transcriber.listen_and_transcribe(barge_in_ms=200)) == "ok"
+    assert recorder.barge_in == {"barge_in_ms": 200}
+
+    header = stt.received[0][1]
+    assert len(header) == HEADER_SIZE
+    assert int.from_bytes(header[40:44], "little") == STREAMING_SIZE
+
+    audio = stt.received[1:]
+    assert len(audio) == 5
+    assert audio[0][0] < recorder.done_at
+    assert [np.frombuffer(c, dtype=np.int16)[0] for _, c in audio] == [0, 1, 2, 3, 4]
+
+
+class FailingSTT:
+    async def transcribe_stream(self, chunks, mimetype="audio/wav"):
+        async for _ in chunks:
+            raise ConnectionError("upload failed")
+
+
+def test_stt_failure_stops_capture():
+    recorder = FakeRecorder(chunks=100, delay=0.02)
+    transcriber = PipelinedTranscriber(recorder, FailingSTT())
+
+    started = time.perf_counter()
+    with pytest.raises(ConnectionError):
+        asyncio.run(transcriber.listen_and_transcribe())
+
+    # The full recording would take 2s
+    assert recorder.cancelled
+    assert time.perf_counter() - started < 0.5
+
+
+def test_streamed_upload_against_mock():
+    async def scenario():
+        runner, base_url = await start_mock_server(latency_ms=20)
+        pool = HTTPPool("mock-key", base_url=base_url)
+        try:
+            transcriber = PipelinedTranscriber(FakeRecorder(delay=0.01), AsyncDeepgramSTT(pool))
+            return await transcriber.listen_and_transcribe()
+        finally:
+            await pool.close()
+            await runner.cleanup()
+
+    assert asyncio.run(scenario()) == "book an appointment in cardiology"
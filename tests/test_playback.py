@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+try:
+    from audio import playback
+except (ImportError, OSError):  # sounddevice or PortAudio missing
+    pytest.skip("sounddevice is not available", allow_module_level=True)
+
+
+BLOCK = 240  # 10 ms at 24 kHz
+
+
+class FakeOutputStream:
+    """
+    Stands in for PortAudio; pull() runs one device callback.
+    """
+
+    def __init__(self, callback, finished_callback, blocksize, **kwargs):
+        self.callback = callback
+        self.finished_callback = finished_callback
+        self.blocksize = blocksize
+        self.played = []
+        self.finished = False
+
+    def start(self):
+        pass
+
+    def close(self):
+        pass
+
+    def pull(self) -> np.ndarray:
+        out = np.full((self.blocksize, 1), -1, dtype=np.int16)
+        try:
+            self.callback(out, self.blocksize, None, None)
+        except playback.sd.CallbackStop:
+            self.finished = True
+            self.finished_callback()
+        self.played.append(out[:, 0].copy())
+        return out[:, 0]
+
+
+@pytest.fixture
+def player(monkeypatch):
+    monkeypatch.setattr(playback.sd, "OutputStream", FakeOutputStream)
+    return playback.AudioPlayer(sample_rate=24000, blocksize=BLOCK, jitter_ms=20)
+
+
+def pcm(values):
+    return np.asarray(values, dtype=np.int16).tobytes()
+
+
+def test_output_waits_for_the_jitter_buffer(player):
+    player.begin_stream()
+    stream = player._stream
+
+    player.feed(pcm(np.arange(1, 301)))
+    assert not stream.pull().any()  # 300 of 480 samples buffered
+
+    player.feed(pcm(np.arange(301, 501)))
+    assert stream.pull().tolist() == list(range(1, BLOCK + 1))
+    assert stream.pull().tolist() == list(range(BLOCK + 1, 2 * BLOCK + 1))
+
+    # Running dry before end_stream() is an underrun, not the end
+    out = stream.pull()
+    assert out[:20].tolist() == list(range(481, 501)) and not out[20:].any()
+    assert player.underruns == 1 and not stream.finished
+
+    player.end_stream()
+    stream.pull()
+    assert stream.finished and player.wait()
+
+
+def test_samples_split_across_chunks_are_rejoined(player):
+    player.begin_stream()
+    data = pcm([1000, -2000, 3000] * 200)
+    for i in range(0, len(data), 7):
+        player.feed(data[i: i + 7])
+    player.end_stream()
+
+    played = np.concatenate([player._stream.pull() for _ in range(3)])
+    assert played[:600].tolist() == [1000, -2000, 3000] * 200
+
+
+def test_barge_in_closes_the_tts_stream(player):
+    closed = threading.Event()
+
+    async def tts():
+        try:
+            for _ in range(100):
+                yield pcm(np.ones(BLOCK))
+                await asyncio.sleep(0.005)
+        finally:
+            closed.set()
+
+    def device():
+        while player._stream is None:
+            time.sleep(0.001)
+        stream = player._stream
+        stream.pull()
+        player.stop()
+        while not stream.finished:
+            stream.pull()
+
+    async def speak():
+        completed = await player.play_stream(tts())
+        return completed, closed.is_set()
+
+    threading.Thread(target=device, daemon=True).start()
+    completed, closed_on_return = asyncio.run(speak())
+
+    assert not completed and player.interrupted
+    assert closed_on_return
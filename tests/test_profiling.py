@@ -0,0 +1,56 @@
+import asyncio
+import pstats
+import time
+import tracemalloc
+
+from telemetry.profiling import Profiler
+
+
+def busy_turn(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+    return "reply"
+
+
+def test_cprofile_is_scoped_to_one_session(tmp_path):
+    profiler = Profiler(str(tmp_path))
+    profiler.sessions.start("CA1", "cprofile")
+    assert profiler.call("CA1", busy_turn, 0.01) == "reply"
+    assert profiler.call("CA2", busy_turn, 0.01) == "reply"
+
+    stats = pstats.Stats(profiler.sessions.stop("CA1"))
+    calls = [v[1] for k, v in stats.stats.items() if k[2] == "busy_turn"]
+    assert calls == [1]
+
+
+def test_sampler_writes_folded_stacks(tmp_path):
+    profiler = Profiler(str(tmp_path))
+    profiler.sessions.start("*", "sample")
+    profiler.call("CA1", busy_turn, 0.1)
+    path = profiler.sessions.stop("*")
+
+    lines = open(path, encoding="utf-8").read().splitlines()
+    assert lines and all(line.startswith("CA1;busy_turn") for line in lines)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) > 5
+
+
+def test_control_commands_for_lag_and_memory(tmp_path):
+    async def scenario():
+        profiler = Profiler(str(tmp_path))
+        profiler.loop_lag.interval = 0.02
+        assert (await profiler.execute("lag start 50")).startswith("monitoring")
+        await asyncio.sleep(0.05)
+        busy_turn(0.3)  # block the loop
+        await asyncio.sleep(0.05)
+        reply = await profiler.execute("lag stop")
+
+        snapshot = await profiler.execute("memory snapshot")
+        await profiler.execute("memory stop")
+        return reply, profiler.loop_lag.log_file, snapshot
+
+    reply, log_file, snapshot = asyncio.run(scenario())
+    assert "1 stalls" in reply
+    assert "busy_turn" in open(log_file, encoding="utf-8").read()
+    assert snapshot.startswith("wrote ") and snapshot.endswith(".tracemalloc")
+    assert not tracemalloc.is_tracing()
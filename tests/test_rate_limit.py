@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+import pytest
+
+from benchmarks.mock_deepgram import STATS, start_mock_server
+from net.http_pool import HTTPPool
+from net.rate_limit import BOOKING, GREETING, TURN, RateLimited, RateLimiter
+from telemetry.tracing import tracer
+
+
+def test_bookings_are_served_before_greetings():
+    async def scenario():
+        limiter = RateLimiter("test", rate=20, burst=1)
+        await limiter.acquire(TURN)  # empty the bucket
+        served = []
+
+        async def request(name, priority):
+            await limiter.acquire(priority)
+            served.append(name)
+
+        greetings = [asyncio.create_task(request(f"greeting{i}", GREETING)) for i in range(3)]
+        await asyncio.sleep(0)
+        booking = asyncio.create_task(request("booking", BOOKING))
+        await asyncio.gather(*greetings, booking)
+        return served
+
+    assert asyncio.run(scenario())[0] == "booking"
+    assert tracer.histograms["rate_wait"].count >= 5
+
+
+def test_requests_past_their_deadline_are_shed():
+    async def scenario():
+        limiter = RateLimiter("test", rate=2, burst=1, max_wait={GREETING: 1.2})
+        await limiter.acquire(TURN)
+        results = await asyncio.gather(
+            *(limiter.acquire(GREETING) for _ in range(5)), return_exceptions=True
+        )
+        return limiter, results
+
+    limiter, results = asyncio.run(scenario())
+    shed = [r for r in results if isinstance(r, RateLimited)]
+    assert len(shed) == 3 and limiter.shed == 3
+    assert limiter.depth == 0
+    assert tracer.gauges["test_shed_total"] == 3
+
+
+def test_pool_backs_off_on_429_and_retries():
+    async def scenario():
+        runner, base_url = await start_mock_server(latency_ms=0, rate_limit=2)
+        limiter = RateLimiter("deepgram", rate=10, max_wait={TURN: 10.0})
+        pool = HTTPPool("mock-key", base_url=base_url, limiter=limiter)
+        try:
+            responses = await asyncio.gather(*(pool.post("/v1/listen", content=b"audio") for _ in range(4)))
+            return responses, limiter, runner.app[STATS]
+        finally:
+            await pool.close()
+            await runner.cleanup()
+
+    responses, limiter, stats = asyncio.run(scenario())
+    assert all(r.status_code == 200 for r in responses)
+    assert stats["throttled"] >= 1 and limiter.throttled == stats["throttled"]
+
+
+def test_streamed_body_429_is_raised_as_shed():
+    async def scenario():
+        runner, base_url = await start_mock_server(latency_ms=0, rate_limit=1)
+        pool = HTTPPool("mock-key", base_url=base_url, limiter=RateLimiter("deepgram", rate=10))
+
+        async def body():
+            yield b"audio"
+
+        try:
+            await pool.post("/v1/listen", content=b"audio")
+            await pool.post("/v1/listen", content=body())
+        finally:
+            await pool.close()
+            await runner.cleanup()
+
+    with pytest.raises(RateLimited):
+        asyncio.run(scenario())
+
+
+def test_simultaneous_429s_pause_once():
+    async def scenario():
+        limiter = RateLimiter("test", rate=10)
+        for _ in range(8):  # eight in-flight requests rejected together
+            limiter.throttle(1.0)
+        tokens = limiter._tokens
+        start = time.monotonic()
+        await limiter.acquire(BOOKING)
+        return tokens, time.monotonic() - start, limiter
+
+    tokens, waited, limiter = asyncio.run(scenario())
+    assert tokens == pytest.approx(-10, abs=0.1)
+    assert 0.9 < waited < 1.5
+    assert limiter.throttled == 8 and limiter.shed == 0
@@ -0,0 +1,49 @@
+import io
+import wave
+
+import numpy as np
+
+from audio.ring_buffer import PCMRingBuffer
+
+
+def read_wav(view):
+    with wave.open(io.BytesIO(bytes(view))) as wav:
+        assert wav.getframerate() == 16000
+        return np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+
+
+def test_wav_view_of_contiguous_range():
+    ring = PCMRingBuffer(100, 16000)
+    ring.write(np.arange(60, dtype=np.int16).reshape(-1, 1))
+
+    assert read_wav(ring.wav_view(10, 50)).tolist() == list(range(10, 50))
+
+
+def test_wav_view_across_the_wrap_point():
+    ring = PCMRingBuffer(100, 16000)
+    for start in range(0, 250, 25):
+        ring.write(np.arange(start, start + 25, dtype=np.int16).reshape(-1, 1))
+
+    # Absolute 180..240 sits at ring positions 80..99 then 0..39
+    assert read_wav(ring.wav_view(180, 240)).tolist() == list(range(180, 240))
+    # Anything already overwritten is clipped to the oldest sample
+    assert read_wav(ring.wav_view(0, 250)).tolist() == list(range(150, 250))
+
+
+def test_wav_view_leaves_the_ring_untouched():
+    ring = PCMRingBuffer(100, 16000)
+    ring.write(np.arange(1, 131, dtype=np.int16).reshape(-1, 1))
+    before = ring.samples.copy()
+
+    view = ring.wav_view(ring.write_pos - 5, ring.write_pos)
+    ring.wav_view(ring.oldest() + 1, ring.write_pos)
+    assert np.array_equal(ring.samples, before)
+
+    # The returned WAV survives the writer wrapping over that audio
+    ring.write(np.zeros((100, 1), dtype=np.int16))
+    assert read_wav(view).tolist() == list(range(126, 131))
+
+
+def test_empty_range():
+    ring = PCMRingBuffer(100, 16000)
+    assert read_wav(ring.wav_view(0, 0)).tolist() == []
@@ -0,0 +1,67 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from runtime.background import BackgroundTasks
+from runtime.executors import BoundedExecutor, StageTimeout, with_timeout
+
+
+def test_timeout_cancels_stage_and_runs_hook():
+    stopped = []
+
+    async def slow():
+        await asyncio.sleep(10)
+
+    async def run():
+        with pytest.raises(StageTimeout) as info:
+            await with_timeout("speak", slow(), 0.05, on_timeout=lambda: stopped.append(True))
+        return info.value
+
+    error = asyncio.run(run())
+    assert error.stage == "speak"
+    assert stopped == [True]
+
+
+def test_bounded_executor_limits_in_flight_jobs():
+    pool = BoundedExecutor("test-io", max_workers=8, max_pending=2)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def job():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+
+    async def run():
+        # The loop stays responsive while jobs queue for a slot
+        ticks = 0
+        jobs = asyncio.gather(*(pool.run(job) for _ in range(6)))
+        while not jobs.done():
+            ticks += 1
+            await asyncio.sleep(0.005)
+        return ticks
+
+    assert asyncio.run(run()) > 5
+    assert peak[0] == 2
+    pool.shutdown()
+
+
+def test_background_failures_are_reported(capsys):
+    async def boom():
+        raise ValueError("disk full")
+
+    async def run():
+        tasks = BackgroundTasks()
+        tasks.spawn("metrics-export", boom())
+        tasks.spawn("tts-warmup", asyncio.sleep(10))
+        await asyncio.sleep(0.01)
+        await tasks.close()
+        return tasks.tasks
+
+    assert asyncio.run(run()) == {}
+    assert "metrics-export failed" in capsys.readouterr().out
@@ -0,0 +1,75 @@
+import multiprocessing
+from collections import Counter
+
+from gateway.supervisor import HashRing, call_key
+from hospital_agent import storage
+from hospital_agent.agent import HospitalAppointmentAgent
+from memory.memory import ConversationMemory
+
+
+def test_ring_spreads_calls_and_only_moves_a_dead_workers_share():
+    ring = HashRing(range(4))
+    calls = [f"CA{i:05d}" for i in range(4000)]
+    owners = {call: ring.node(call) for call in calls}
+    assert all(800 < n < 1200 for n in Counter(owners.values()).values())
+
+    ring.remove(2)
+    moved = [call for call in calls if ring.node(call) != owners[call]]
+    assert moved and all(owners[call] == 2 for call in moved)
+    assert call_key(b"GET /media/CA42 HTTP/1.1\r\n\r\n") == "CA42"
+    assert call_key(b"GET /?callSid=CA7 HTTP/1.1\r\n\r\n") == "CA7"
+
+
+def _book_slot(path, patient, results):
+    storage.DATA_FILE = path
+    try:
+        storage.save_appointment({
+            "appointment_id": storage.generate_appointment_id(),
+            "patient_name": patient,
+            "doctor": "Dr. Kumar",
+            "department": "Cardiology",
+            "date": "12 Mar",
+            "time": "10 AM",
+            "status": "CONFIRMED",
+        })
+        results.put("booked")
+    except storage.SlotTaken:
+        results.put("taken")
+
+
+def test_concurrent_processes_cannot_double_book(tmp_path):
+    path = str(tmp_path / "appointments.db")
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    workers = [context.Process(target=_book_slot, args=(path, f"P{i}", results)) for i in range(6)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(30)
+
+    outcomes = Counter(results.get(timeout=5) for _ in workers)
+    assert outcomes == {"booked": 1, "taken": 5}
+
+
+def _agent_at_slot_offer(session):
+    memory = ConversationMemory()
+    memory.start_session(session)
+    agent = HospitalAppointmentAgent(memory=memory)
+    for text in ["book cardiology", "doctor kumar", "12 mar"]:
+        agent.handle_input(text)
+    return agent
+
+
+def test_losing_caller_is_offered_the_remaining_slots(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "DATA_FILE", str(tmp_path / "appointments.db"))
+    first, second = _agent_at_slot_offer("a"), _agent_at_slot_offer("b")
+    slot = second.context["slots"][0]
+
+    second.handle_input(slot.lower())
+    first.handle_input(slot.lower())
+    assert "confirmed" in first.handle_input("my name is Asha Rao")
+
+    reply = second.handle_input("my name is Rahul Das")
+    assert "was just booked" in reply and slot not in reply.split("remaining")[1]
+    assert "confirmed" in second.handle_input(second.context["slots"][0].lower())
+    storage.close()
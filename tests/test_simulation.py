@@ -0,0 +1,47 @@
+import random
+import wave
+
+from hospital_agent import response as R
+from simulation.runner import _booking, run_conversation, simulate
+from simulation.stt_stub import SidecarSTT
+
+
+def test_scripted_booking_with_fee_question():
+    result = run_conversation({
+        "id": "fee",
+        "turns": [
+            "I want to book an appointment in cardiology",
+            "what is the consultation fee for doctor mehta",
+            "doctor kumar",
+        ],
+        "expect": ["Dr. Mehta", "600 rupees", "Dr. Kumar is available"],
+    })
+    assert "error" not in result
+    assert result["failures"] == []
+
+
+def test_wav_turns_use_the_stt_stub(tmp_path):
+    with wave.open(str(tmp_path / "dept.wav"), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(8000)
+        wf.writeframes(bytes(1600))
+    (tmp_path / "dept.txt").write_text("book general medicine\n")
+
+    result = run_conversation(
+        {"id": "wav", "turns": [{"wav": "dept.wav"}, "", ""]},
+        SidecarSTT(),
+        str(tmp_path),
+    )
+    assert result["turns"][0]["user"] == "book general medicine"
+    assert "Dr. Sharma" in result["turns"][0]["agent"]
+    # Second silent turn ends the call
+    assert [t["agent"] for t in result["turns"][1:]] == [R.NO_RESPONSE_PROMPT]
+
+
+def test_pool_runs_synthetic_corpus_in_order():
+    rng = random.Random(1)
+    corpus = [_booking(rng, i) for i in range(20)]
+    results = list(simulate(corpus, workers=2, chunksize=3))
+    assert [r["id"] for r in results] == [c["id"] for c in corpus]
+    assert all(not r["failures"] and "error" not in r for r in results)
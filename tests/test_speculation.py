@@ -0,0 +1,83 @@
+import asyncio
+import copy
+
+from hospital_agent.agent import HospitalAppointmentAgent
+from hospital_agent.state import ConversationState
+from hospital_agent import response as R
+from memory.memory import ConversationMemory
+from tts.speculation import Speculator
+from tts.template_renderer import TemplateRenderer
+
+
+class FakeTTS:
+    sample_rate = 8000
+
+    def __init__(self):
+        self.texts = []
+
+    async def synthesize(self, text):
+        self.texts.append(text)
+        return b"\x00\x10" * 80
+
+    async def warm(self, texts, concurrency=4):
+        for text in texts:
+            await self.synthesize(text)
+
+
+class FakePlayer:
+    def __init__(self):
+        self.played = []
+
+    async def play_async(self, audio):
+        self.played.append(audio)
+        return True
+
+
+def _speculator(filler_after_ms=20):
+    return Speculator(TemplateRenderer(FakeTTS()), FakePlayer(), filler_after_ms)
+
+
+async def _slow(delay, value):
+    await asyncio.sleep(delay)
+    return value
+
+
+def test_predict_next_has_no_side_effects():
+    memory = ConversationMemory()
+    memory.start_session("test")
+    agent = HospitalAppointmentAgent(memory=memory)
+    agent.handle_input("I want to book an appointment in cardiology")
+    assert agent.state == ConversationState.SELECT_DOCTOR
+
+    before = (agent.state, copy.deepcopy(agent.context), agent.last_render)
+    predictions = agent.predict_next()
+    assert (R.DOCTOR_AVAILABLE, {"doctor": "Dr. Kumar"}) in predictions
+    assert (agent.state, agent.context, agent.last_render) == before
+
+
+def test_filler_plays_only_for_slow_steps():
+    async def scenario():
+        spec = _speculator()
+        assert await spec.cover(_slow(0, "fast"), R.FILLER_DEFAULT) == "fast"
+        assert spec.player.played == []
+        assert await spec.cover(_slow(0.1, "slow"), R.FILLER_SEARCH) == "slow"
+        assert len(spec.player.played) == 1
+        assert spec.renderer.tts.texts == [R.FILLER_SEARCH]
+
+    asyncio.run(scenario())
+
+
+def test_take_returns_match_and_discards_the_rest():
+    async def scenario():
+        spec = _speculator()
+        hit = (R.DOCTOR_AVAILABLE, {"doctor": "Dr. Kumar"})
+        spec.prefetch([hit, (R.DOCTOR_AVAILABLE, {"doctor": "Dr. Mehta"})])
+        await spec._prefetch
+        assert len(spec.ready) == 2
+
+        assert spec.take(hit)
+        assert spec.ready == {}
+        assert spec.take((R.DOCTOR_AVAILABLE, {"doctor": "Dr. Mehta"})) is None
+        assert (spec.hits, spec.misses) == (1, 1)
+
+    asyncio.run(scenario())
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+from tts.speech_pipeline import SpeechPipeline, split_sentences
+
+
+SYNTH_S = 0.05
+PLAY_S = 0.05
+
+
+class FakeTTS:
+    def __init__(self):
+        self.started = []
+        self.languages = set()
+
+    async def synthesize(self, text, language="en"):
+        self.started.append((text, time.perf_counter()))
+        self.languages.add(language)
+        await asyncio.sleep(SYNTH_S)
+        return text
+
+    async def stream(self, text, language="en"):
+        yield await self.synthesize(text, language)
+
+
+class FakePlayer:
+    def __init__(self, interrupt_after=None):
+        self.played = []
+        self.interrupt_after = interrupt_after
+
+    async def play_async(self, audio):
+        self.played.append(audio)
+        await asyncio.sleep(PLAY_S)
+        return len(self.played) != self.interrupt_after
+
+    async def play_stream(self, chunks):
+        async for chunk in chunks:
+            return await self.play_async(chunk)
+
+
+def test_split_sentences_keeps_titles_together():
+    text = "Dr. Kumar is available. Do you have a date? Great!"
+    assert split_sentences(text) == [
+        "Dr. Kumar is available.",
+        "Do you have a date?",
+        "Great!",
+    ]
+
+
+def test_next_sentence_is_synthesized_while_current_plays():
+    tts, player = FakeTTS(), FakePlayer()
+    pipeline = SpeechPipeline(tts, player, pause_ms=0)
+
+    start = time.perf_counter()
+    assert asyncio.run(pipeline.speak("One. Two. Three."))
+    elapsed = time.perf_counter() - start
+
+    assert player.played == ["One.", "Two.", "Three."]
+    # Serial would be 3 x (synth + play); pipelined is ~synth + 3 x play
+    assert elapsed < 3 * (SYNTH_S + PLAY_S) - SYNTH_S
+
+
+def test_pause_overlaps_background_synthesis():
+    tts, player = FakeTTS(), FakePlayer()
+    pipeline = SpeechPipeline(tts, player, pauses={"let me check": 50})
+
+    start = time.perf_counter()
+    asyncio.run(pipeline.speak("Okay, let me check the availability. Dr. Kumar is free."))
+    elapsed = time.perf_counter() - start
+
+    # synth + play + max(pause, 0) + play, not + pause + synth
+    assert elapsed < SYNTH_S + 2 * PLAY_S + 0.05 + SYNTH_S
+
+
+def test_interruption_stops_remaining_sentences():
+    tts, player = FakeTTS(), FakePlayer(interrupt_after=1)
+    pipeline = SpeechPipeline(tts, player)
+
+    assert asyncio.run(pipeline.speak("One. Two. Three.")) is False
+    assert player.played == ["One."]
+
+
+def test_every_sentence_uses_the_callers_voice():
+    tts, player = FakeTTS(), FakePlayer()
+    pipeline = SpeechPipeline(tts, player, pause_ms=0)
+
+    asyncio.run(pipeline.speak("One. Two. Three.", language="hi"))
+    assert tts.languages == {"hi"}
@@ -0,0 +1,68 @@
+import sqlite3
+
+import pytest
+
+from hospital_agent import storage
+
+
+@pytest.fixture(autouse=True)
+def appointments_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "DATA_FILE", str(tmp_path / "appointments.db"))
+    yield
+    storage.close()
+
+
+def appointment(appointment_id, patient, time="10 AM", **extra):
+    return {
+        "appointment_id": appointment_id,
+        "patient_name": patient,
+        "doctor": "Dr. Kumar",
+        "department": "Cardiology",
+        "date": "12 Mar",
+        "time": time,
+        "status": "CONFIRMED",
+        **extra,
+    }
+
+
+def rows():
+    return [dict(r) for r in storage._connect().execute("SELECT * FROM appointments ORDER BY rowid")]
+
+
+def test_import_renumbers_duplicate_ids_and_flags_only_slot_clashes():
+    conflicts, renumbered = storage.import_appointments([
+        appointment("APT-20240312101500", "Asha Rao"),
+        # Same second as the first booking, different slot
+        appointment("APT-20240312101500", "Rahul Das", time="11 AM"),
+        # Same slot as the first booking
+        appointment("APT-20240312101501", "Vikram Singh"),
+    ])
+
+    assert (conflicts, renumbered) == (1, 1)
+    stored = rows()
+    assert [r["patient_name"] for r in stored] == ["Asha Rao", "Rahul Das", "Vikram Singh"]
+    assert [r["status"] for r in stored] == ["CONFIRMED", "CONFIRMED", "CONFLICT"]
+    assert stored[1]["appointment_id"] != "APT-20240312101500"
+
+
+def test_import_rejects_invalid_rows():
+    with pytest.raises(sqlite3.IntegrityError):
+        storage.import_appointments([
+            appointment("APT-1", "Asha Rao"),
+            appointment("APT-2", None),
+        ])
+    assert rows() == []
+
+
+def test_save_reports_only_slot_clashes_as_taken():
+    storage.save_appointment(appointment("APT-1", "Asha Rao"))
+
+    with pytest.raises(storage.SlotTaken):
+        storage.save_appointment(appointment("APT-2", "Rahul Das"))
+    with pytest.raises(sqlite3.IntegrityError):
+        storage.save_appointment(appointment("APT-3", None, time="11 AM"))
+
+    duplicate = appointment("APT-1", "Rahul Das", time="11 AM")
+    storage.save_appointment(duplicate)
+    assert duplicate["appointment_id"] != "APT-1"
+    assert len(rows()) == 2
@@ -0,0 +1,105 @@
+import asyncio
+
+import numpy as np
+
+from hospital_agent import response as R
+from hospital_agent.storage import ID_ALPHABET, generate_appointment_id
+from tts.template_renderer import TemplateRenderer
+
+
+RATE = 8000
+
+
+class ToneTTS:
+    """
+    Each text renders as 100 ms of a constant level between 50 ms of silence.
+    """
+
+    sample_rate = RATE
+
+    def __init__(self):
+        self.texts = []
+
+    async def synthesize(self, text):
+        self.texts.append(text)
+        edge = np.zeros(RATE // 20, dtype=np.int16)
+        tone = np.full(RATE // 10, 1000 + len(self.texts), dtype=np.int16)
+        return np.concatenate([edge, tone, edge]).tobytes()
+
+    async def warm(self, texts, concurrency=4):
+        for text in texts:
+            await self.synthesize(text)
+
+
+def test_punctuation_is_never_a_fragment_of_its_own():
+    for template in R.TEMPLATES:
+        for fragment in TemplateRenderer.fragments(template):
+            assert any(ch.isalnum() for ch in fragment), (template, fragment)
+
+    assert TemplateRenderer.fragments(R.MOST_EXPERIENCED) == [
+        "has",
+        "years of experience and is the most experienced doctor in this department. "
+        "Would you like to book an appointment with",
+    ]
+
+
+def test_trailing_punctuation_joins_the_preceding_value():
+    renderer = TemplateRenderer(ToneTTS())
+    plan = renderer._plan(R.MOST_EXPERIENCED, {"doctor": "Dr. Kumar", "experience": 12})
+    assert plan[-1] == "Dr. Kumar?"
+
+    plan = renderer._plan(R.SLOTS_ON_DATE, {"date": "12 Mar", "slots": ["10:00 AM", "11:00 AM"]})
+    assert plan == ["Available slots on", "12 Mar", "are", "10:00 AM", 150, "11:00 AM.", "Which one works?"]
+
+
+def test_spelled_ids_keep_shared_clips():
+    renderer = TemplateRenderer(ToneTTS(), word_gap_ms=60)
+    plan = renderer._plan("Your ID is {appt_id}. Thank you.", {"appt_id": "AB-12"})
+    assert plan == ["Your ID is", "A", 60, "B", 60, "one", 60, "two", "Thank you."]
+
+
+def test_render_trims_and_splices_pieces():
+    tts = ToneTTS()
+    renderer = TemplateRenderer(tts, crossfade_ms=5, list_gap_ms=150)
+    audio = np.frombuffer(
+        asyncio.run(renderer.render("Slots are {slots}", {"slots": ["9 AM", "10 AM"]})),
+        dtype=np.int16,
+    )
+
+    assert tts.texts == ["Slots are", "9 AM", "10 AM"]
+    # Three tones trimmed to tone + 40 ms guards, a 150 ms gap, one crossfade per join
+    piece, gap, fade = 800 + 2 * 320, 1200, 40
+    assert len(audio) == 3 * piece + gap - 3 * fade
+    assert audio[320] == 1001 and audio[-321] == 1003
+
+
+def test_splice_crossfades_each_join():
+    renderer = TemplateRenderer(ToneTTS(), crossfade_ms=10)
+    a = np.full(200, 1000, dtype=np.int16)
+    b = np.full(200, -1000, dtype=np.int16)
+    out = renderer.splice([a, np.zeros(0, dtype=np.int16), b])
+
+    assert len(out) == 400 - 80
+    assert out[0] == 1000 and out[-1] == -1000
+    assert (np.diff(out[110:210].astype(np.int32)) <= 0).all()
+
+
+def test_warm_covers_punctuated_values():
+    tts = ToneTTS()
+    renderer = TemplateRenderer(tts)
+    asyncio.run(renderer.warm([R.MOST_EXPERIENCED], values=["Dr. Kumar"]))
+
+    assert {"Dr. Kumar", "Dr. Kumar?", "has", "seven"} <= set(tts.texts)
+    assert "?" not in tts.texts
+
+
+def test_warm_covers_every_id_character():
+    tts = ToneTTS()
+    renderer = TemplateRenderer(tts)
+    asyncio.run(renderer.warm([R.APPOINTMENT_CONFIRMED], spell=ID_ALPHABET))
+
+    warmed = set(tts.texts)
+    for _ in range(20):
+        plan = renderer._plan("{appt_id}", {"appt_id": generate_appointment_id()})
+        assert {p for p in plan if isinstance(p, str)} <= warmed
+    assert {"A", "P", "T", "B", "F"} <= warmed
@@ -0,0 +1,41 @@
+import json
+
+from telemetry.tracing import Histogram, Tracer
+
+
+def test_histogram_quantiles_are_close():
+    h = Histogram()
+    for ms in range(1, 1001):
+        h.observe(ms / 1000)
+    assert h.count == 1000
+    # buckets are ~19% wide (4 per doubling)
+    assert abs(h.quantile(0.5) - 0.5) < 0.1
+    assert abs(h.quantile(0.95) - 0.95) < 0.15
+    assert h.quantile(0.99) <= h.bounds[-1]
+
+
+def test_spans_export_prometheus_and_jsonl(tmp_path):
+    trace = tmp_path / "trace.jsonl"
+    tracer = Tracer(trace_file=str(trace), flush_every=1000)
+
+    tracer.begin_turn("call-1")
+    with tracer.span("handle_input"):
+        pass
+    tracer.record("stt", 0.25, model="nova-2")
+    tracer.flush()
+
+    lines = [json.loads(line) for line in trace.read_text().splitlines()]
+    assert [r["stage"] for r in lines] == ["handle_input", "stt"]
+    assert lines[1]["session"] == "call-1" and lines[1]["turn"] == 1
+    assert lines[1]["ms"] == 250.0 and lines[1]["model"] == "nova-2"
+
+    text = tracer.prometheus()
+    assert 'voice_stage_seconds_count{stage="stt"} 1' in text
+    assert 'voice_stage_seconds_bucket{stage="stt",le="+Inf"} 1' in text
+    assert 'voice_stage_quantile_seconds{stage="stt",quantile="0.99"}' in text
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(enabled=False)
+    tracer.record("stt", 1.0)
+    assert tracer.histograms == {}
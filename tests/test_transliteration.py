@@ -0,0 +1,39 @@
+from language.indic_phonetic import convert_for_agent, convert_to_phonetic
+from language.roman_to_native import convert_roman_to_native
+from language.transliteration import get_transliterator
+
+
+def test_hindi_roman_to_native():
+    assert convert_roman_to_native("mera naam", "hi") == "मेरा नाम"
+    assert convert_roman_to_native("kal", "hi") == "कल"
+    assert convert_roman_to_native("kya?", "hi") == "क्या?"
+
+
+def test_longest_match_and_virama():
+    # "chh" must win over "ch" + "h"; clusters get a virama
+    assert convert_roman_to_native("achha", "hi") == "अछा"
+    assert convert_roman_to_native("enakku", "ta") == "எனக்கு"
+    assert convert_roman_to_native("naaku", "te") == "నాకు"
+
+
+def test_missing_letters_fall_back():
+    # Tamil has no ga / dha: nearest unvoiced letters are used
+    assert convert_roman_to_native("gandhi", "ta") == convert_roman_to_native("kanti", "ta")
+
+
+def test_round_trip_and_passthrough():
+    for lang, word in [("hi", "mujhe"), ("ta", "naalai"), ("kn", "nanage"), ("ml", "enikku"), ("te", "repu")]:
+        assert convert_to_phonetic(convert_roman_to_native(word, lang), lang) == word
+    assert convert_roman_to_native("hello", "en") == "hello"
+    assert convert_to_phonetic("book now", "hi") == "book now"
+    assert get_transliterator("hi") is get_transliterator("hi")
+
+
+def test_agent_text_uses_keywords_and_roster_spellings():
+    names = ["Dr. Kumar", "Dr. Mehta", "Dr. Shah"]
+    assert convert_for_agent("डॉक्टर कुमार", "hi", names) == "doctor kumar"
+    assert convert_for_agent("டாக்டர் மேத்தா", "ta", names) == "doctor mehta"
+    assert convert_for_agent("இன்று பண்ணுங்க", "ta", names) == "today pannungka"
+    # Latin text, including mixed transcripts' Latin words, is untouched
+    assert convert_for_agent("Dr Kumar kal", "hi", names) == "Dr Kumar kal"
+    assert convert_for_agent("book अपॉइंटमेंट", "hi", names) == "book appointment"
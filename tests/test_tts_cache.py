@@ -0,0 +1,83 @@
+import asyncio
+
+from tts.speech_pipeline import SpeechPipeline, prompt_sentences
+from tts.tts_cache import CachedTTS, TTSCache, cache_key
+from tts.voice_pool import VoicePool
+
+
+class FakeTTS:
+    model = "aura-asteria-en"
+    encoding = "linear16"
+    sample_rate = 24000
+
+    def __init__(self):
+        self.calls = []
+
+    async def synthesize(self, text: str) -> bytes:
+        self.calls.append(text)
+        return text.encode("utf-8") * 4
+
+    async def stream(self, text: str):
+        yield await self.synthesize(text)
+
+
+def test_cache_key_depends_on_voice_and_format():
+    base = cache_key("Hello", "aura-asteria-en", 24000, "linear16")
+    assert base == cache_key("  Hello ", "aura-asteria-en", 24000, "linear16")
+    assert base != cache_key("Hello", "aura-luna-en", 24000, "linear16")
+    assert base != cache_key("Hello", "aura-asteria-en", 16000, "linear16")
+    assert base != cache_key("Hello", "aura-asteria-en", 24000, "mulaw")
+
+
+def test_repeated_prompt_is_synthesized_once(tmp_path):
+    fake = FakeTTS()
+    tts = CachedTTS(fake, TTSCache(str(tmp_path)))
+
+    first = asyncio.run(tts.synthesize("Hello, can you hear me?"))
+    second = asyncio.run(tts.synthesize("Hello, can you hear me?"))
+
+    assert bytes(first) == bytes(second)
+    assert fake.calls == ["Hello, can you hear me?"]
+
+
+def test_disk_store_survives_restart(tmp_path):
+    fake = FakeTTS()
+    asyncio.run(CachedTTS(fake, TTSCache(str(tmp_path))).warm(["Greeting", "Bye"]))
+
+    restarted = CachedTTS(FakeTTS(), TTSCache(str(tmp_path)))
+    audio = asyncio.run(restarted.synthesize("Greeting"))
+
+    assert bytes(audio) == b"Greeting" * 4
+    assert restarted.tts.calls == []
+    assert asyncio.run(restarted.warm(["Greeting", "Bye", "New"])) == 1
+
+
+def test_lru_is_bounded(tmp_path):
+    cache = TTSCache(str(tmp_path), max_items=2)
+    for i in range(5):
+        cache.put(f"k{i}", b"x")
+
+    assert list(cache._lru) == ["k3", "k4"]
+    assert cache.get("k0") is not None
+
+
+class FakePlayer:
+    async def play_async(self, audio):
+        return True
+
+    async def play_stream(self, chunks):
+        async for _ in chunks:
+            pass
+        return True
+
+
+def test_warmed_prompt_plays_without_requests(tmp_path):
+    fake = FakeTTS()
+    voices = VoicePool(lambda voice: CachedTTS(fake, TTSCache(str(tmp_path))), {"en": "en-voice"})
+    prompt = "Dr. Kumar is available. Which time suits you?"
+
+    asyncio.run(voices.warm(prompt_sentences([prompt])))
+    fake.calls.clear()
+
+    assert asyncio.run(SpeechPipeline(voices, FakePlayer(), pause_ms=0).speak(prompt))
+    assert fake.calls == []
@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+from tts.tts_router import CircuitBreaker, TTSRouter
+
+
+class FakeEngine:
+    def __init__(self, label, delay=0.0, fail=False):
+        self.label = label
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.sample_rate = 24000
+
+    async def synthesize(self, text, language="en"):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.label} down")
+        return self.label.encode()
+
+    async def stream(self, text, language="en"):
+        yield await self.synthesize(text, language)
+        yield b"-more"
+
+
+def _router(primary, fallback, **kw):
+    kw.setdefault("hedge_ms", 50)
+    kw.setdefault("deadline_ms", 150)
+    return TTSRouter(primary, fallback, **kw)
+
+
+def test_fast_primary_is_used():
+    router = _router(FakeEngine("primary"), FakeEngine("local"))
+    assert asyncio.run(router.synthesize("hi")) == b"primary"
+    assert router.fallback.calls == 0
+
+
+def test_slow_primary_is_hedged_within_deadline():
+    router = _router(FakeEngine("primary", delay=1.0), FakeEngine("local", delay=0.01))
+
+    start = time.perf_counter()
+    audio = asyncio.run(router.synthesize("hi"))
+
+    assert audio == b"local"
+    assert time.perf_counter() - start < 0.3
+
+
+def test_breaker_opens_and_skips_primary():
+    primary = FakeEngine("primary", fail=True)
+    router = _router(primary, FakeEngine("local"), breaker=CircuitBreaker(2, cooldown_s=60))
+
+    async def calls():
+        return [await router.synthesize("hi") for _ in range(4)]
+
+    assert asyncio.run(calls()) == [b"local"] * 4
+    assert primary.calls == 2
+    assert router.breaker.state == CircuitBreaker.OPEN
+
+
+def test_stream_continues_primary_or_falls_back():
+    async def collect(router):
+        return [chunk async for chunk in router.stream("hi")]
+
+    fast = _router(FakeEngine("primary"), FakeEngine("local"))
+    slow = _router(FakeEngine("primary", delay=1.0), FakeEngine("local"))
+
+    assert asyncio.run(collect(fast)) == [b"primary", b"-more"]
+    assert asyncio.run(collect(slow)) == [b"local"]
+
+
+def test_without_fallback_the_primary_is_awaited():
+    primary = FakeEngine("primary", delay=0.3)
+    router = _router(primary, None, breaker=CircuitBreaker(1, cooldown_s=60))
+
+    async def calls():
+        audio = [await router.synthesize("hi") for _ in range(2)]
+        return audio + [chunk async for chunk in router.stream("hi")]
+
+    # Past the 150 ms deadline every time, but there is nothing else to play
+    assert asyncio.run(calls()) == [b"primary", b"primary", b"primary", b"-more"]
+    assert primary.calls == 3
+    assert router.breaker.state == CircuitBreaker.CLOSED
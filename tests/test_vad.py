@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from audio.vad import AdaptiveVAD, EnergyVAD, Endpointer, frame_features
+
+
+SAMPLE_RATE = 16000
+CHUNK = 1600  # 100 ms
+
+
+class Config:
+    chunk_ms = 100
+    silence_duration_ms = 700
+    start_timeout_ms = 5000
+    max_record_ms = 15000
+
+
+def make_turn(noise_rms, speech_amp, lead_s=1.5, speech_s=2.0, tail_s=3.0, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(speech_s * SAMPLE_RATE)) / SAMPLE_RATE
+    phase = 2 * np.pi * 150 * t
+    speech = speech_amp * sum(np.sin(k * phase) / k for k in range(1, 6))
+    speech *= 0.55 + 0.45 * np.sin(2 * np.pi * 4 * t)
+
+    audio = np.concatenate([
+        np.zeros(int(lead_s * SAMPLE_RATE)),
+        speech,
+        np.zeros(int(tail_s * SAMPLE_RATE)),
+    ])
+    audio += rng.normal(0, noise_rms, len(audio))
+    return np.clip(audio, -32768, 32767).astype(np.int16).reshape(-1, 1)
+
+
+def endpoint(vad, pcm):
+    ep = Endpointer(Config())
+    vad.begin_turn()
+    for i in range(0, len(pcm) - CHUNK + 1, CHUNK):
+        reason = ep.update(vad.is_speech(pcm[i: i + CHUNK]))
+        if reason:
+            return ep.total_ms, reason
+    return ep.total_ms, None
+
+
+def test_frame_features_zcr_separates_tone_from_noise():
+    rng = np.random.default_rng(1)
+    t = np.arange(320) / SAMPLE_RATE
+    tone = (3000 * np.sin(2 * np.pi * 150 * t)).astype(np.int16)
+    noise = rng.normal(0, 3000, 320).astype(np.int16)
+
+    rms, zcr = frame_features(np.stack([tone, noise]))
+
+    assert rms[0] == pytest.approx(3000 / np.sqrt(2), rel=0.05)
+    assert zcr[0] < 0.05
+    assert zcr[1] > 0.3
+
+
+def test_energy_vad_matches_recorder_rms():
+    block = np.full((CHUNK, 1), 400, dtype=np.int16)
+    assert EnergyVAD(350.0).is_speech(block)
+    assert not EnergyVAD(450.0).is_speech(block)
+
+
+def test_energy_vad_never_ends_turn_on_noisy_line():
+    pcm = make_turn(noise_rms=600, speech_amp=3500)
+    _, reason = endpoint(EnergyVAD(350.0), pcm)
+    assert reason != "silence"
+
+
+def test_adaptive_vad_ends_turn_on_noisy_line():
+    pcm = make_turn(noise_rms=600, speech_amp=3500)
+    stop_ms, reason = endpoint(AdaptiveVAD(SAMPLE_RATE), pcm)
+
+    assert reason == "silence"
+    assert 3500 <= stop_ms <= 3500 + 1200
+
+
+def test_adaptive_vad_hears_quiet_speaker():
+    pcm = make_turn(noise_rms=40, speech_amp=350)
+    stop_ms, reason = endpoint(AdaptiveVAD(SAMPLE_RATE), pcm)
+
+    assert reason == "silence"
+    assert stop_ms >= 3500
+
+
+def test_adaptive_vad_classify_is_per_frame():
+    pcm = make_turn(noise_rms=50, speech_amp=3000)
+    decisions = AdaptiveVAD(SAMPLE_RATE).classify(pcm)
+
+    frame_s = AdaptiveVAD.frame_ms / 1000
+    assert len(decisions) == len(pcm) // int(SAMPLE_RATE * frame_s)
+    assert not decisions[: int(1.4 / frame_s)].any()
+    assert decisions[int(1.6 / frame_s): int(3.4 / frame_s)].all()
+
+
+def test_endpointer_holds_until_barge_in():
+    speaking = [True]
+    fired = []
+    ep = Endpointer(Config(), hold=lambda: speaking[0], on_speech=lambda: fired.append(1), barge_in_ms=300)
+
+    # Long prompt with a short cough: no timeout, no barge-in
+    for speech in [False] * 60 + [True, True] + [False] * 5:
+        assert ep.update(speech) is None
+        assert ep.holding
+    assert not fired
+
+    # Sustained speech interrupts the prompt and starts the turn
+    assert ep.update(True) is None and ep.holding
+    assert ep.update(True) is None and ep.holding
+    assert ep.update(True) is None
+    assert not ep.holding
+    assert fired == [1]
+    assert ep.total_ms == 300
+
+
+def test_endpointer_starts_timeout_after_prompt_ends():
+    speaking = [True]
+    ep = Endpointer(Config(), hold=lambda: speaking[0], barge_in_ms=300)
+
+    for _ in range(100):
+        ep.update(False)
+    speaking[0] = False
+
+    reasons = [ep.update(False) for _ in range(50)]
+    assert reasons.index("no_speech") == 49
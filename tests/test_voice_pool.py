@@ -0,0 +1,85 @@
+import asyncio
+
+from hospital_agent import response as R
+from tts.voice_pool import VoicePool
+
+
+class FakeVoice:
+    sample_rate = 24000
+    active = 0
+    peak = 0
+
+    def __init__(self, voice):
+        self.voice = voice
+
+    async def synthesize(self, text):
+        if self.voice.startswith("bad"):
+            raise RuntimeError("unknown model")
+        FakeVoice.active += 1
+        FakeVoice.peak = max(FakeVoice.peak, FakeVoice.active)
+        await asyncio.sleep(0.01)
+        FakeVoice.active -= 1
+        return f"{self.voice}:{text}".encode()
+
+    async def stream(self, text):
+        yield await self.synthesize(text)
+
+
+VOICES = {"en": "en-voice", "hi": "hi-voice", "ta": "bad-voice"}
+
+
+def test_engines_are_built_once_per_language():
+    pool = VoicePool(FakeVoice, VOICES)
+    assert pool.engine("hi") is pool.engine("hi")
+    assert asyncio.run(pool.synthesize("x", "hi")) == b"hi-voice:x"
+    assert asyncio.run(pool.synthesize("x", "fr")) == b"en-voice:x"
+
+
+def test_failed_voices_fall_back_to_default():
+    pool = VoicePool(FakeVoice, VOICES)
+    assert asyncio.run(pool.warm_voices()) == ["en", "hi"]
+    assert asyncio.run(pool.synthesize("x", "ta")) == b"en-voice:x"
+
+
+def test_per_language_limit():
+    pool = VoicePool(FakeVoice, VOICES, limits={"hi": 2})
+    FakeVoice.peak = 0
+
+    async def burst():
+        await asyncio.gather(*(pool.synthesize(str(i), "hi") for i in range(6)))
+
+    asyncio.run(burst())
+    assert FakeVoice.peak == 2
+
+
+class FakeCached:
+    """
+    Cache in front of a FakeVoice; a warm cache never reaches the voice.
+    """
+
+    def __init__(self, voice):
+        self.tts = FakeVoice(voice)
+        self.sample_rate = self.tts.sample_rate
+        self.hits = 0
+
+    async def synthesize(self, text):
+        self.hits += 1
+        return b"cached"
+
+
+def test_warm_up_probe_bypasses_the_cache():
+    pool = VoicePool(FakeCached, VOICES)
+    assert asyncio.run(pool.warm_voices()) == ["en", "hi"]
+    assert all(engine.hits == 0 for engine in pool.engines.values())
+
+
+def test_indic_voices_get_native_script():
+    pool = VoicePool(FakeVoice, VOICES)
+    assert asyncio.run(pool.synthesize("Kal subah aaiye", "hi")) == "hi-voice:कल सुबह आइये".encode()
+    assert asyncio.run(pool.synthesize("Kal subah aaiye", "en")) == b"en-voice:Kal subah aaiye"
+
+
+def test_english_prompts_reach_indic_voices_unchanged():
+    pool = VoicePool(FakeVoice, VOICES)
+    for text in R.FIXED_PROMPTS + [R.FILLER_DEFAULT, "Alright.", "rupees."]:
+        assert asyncio.run(pool.synthesize(text, "hi")) == f"hi-voice:{text}".encode()
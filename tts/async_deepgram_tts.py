@@ -0,0 +1,67 @@
+"""
+Deepgram Text-to-Speech (async)
+Uses the shared HTTP pool instead of the blocking SDK call
+"""
+
+import time
+
+from net.http_pool import HTTPPool
+from telemetry.tracing import tracer
+
+
+class AsyncDeepgramTTS:
+    def __init__(
+        self,
+        pool: HTTPPool,
+        model: str = "aura-asteria-en",
+        sample_rate: int = 24000,
+    ):
+        self.pool = pool
+        self.model = model
+        self.encoding = "linear16"
+        self.sample_rate = sample_rate
+        self.params = {
+            "model": model,
+            "encoding": self.encoding,
+            "sample_rate": str(sample_rate),
+            "container": "none",
+        }
+
+    async def synthesize(self, text: str) -> bytes:
+        """
+        Convert text to speech and return raw PCM audio bytes
+        """
+        with tracer.span("tts_complete", mode="buffered"):
+            response = await self.pool.post(
+                "/v1/speak",
+                params=self.params,
+                json={"text": text},
+            )
+
+        audio_bytes = response.content
+        if not audio_bytes:
+            raise RuntimeError("Deepgram TTS returned empty audio stream")
+
+        return audio_bytes
+
+    async def stream(self, text: str):
+        """
+        Yield raw PCM chunks as Deepgram produces them.
+        """
+        received = 0
+        start = time.perf_counter()
+        async with self.pool.stream(
+            "/v1/speak",
+            params=self.params,
+            json={"text": text},
+        ) as response:
+            async for chunk in response.aiter_bytes():
+                if not received:
+                    tracer.record("tts_first_byte", time.perf_counter() - start)
+                received += len(chunk)
+                yield chunk
+
+        tracer.record("tts_complete", time.perf_counter() - start, mode="stream")
+
+        if not received:
+            raise RuntimeError("Deepgram TTS returned empty audio stream")
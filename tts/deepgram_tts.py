@@ -8,30 +8,34 @@ from deepgram import DeepgramClient, SpeakOptions
 
 
 class DeepgramTTS:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, model: str = "aura-asteria-en", sample_rate: int = 24000):
         self.client = DeepgramClient(api_key)
+        self.model = model
+        self.sample_rate = sample_rate
+
+        # Built once and reused for every request
+        self.options = SpeakOptions(
+            model=model,
+            encoding="linear16",
+            sample_rate=sample_rate,
+        )
+        self.speak = self.client.speak.v("1")
 
     def synthesize(self, text: str) -> bytes:
         """
         Convert text to speech and return raw PCM audio bytes
         """
-        options = SpeakOptions(
-            model="aura-asteria-en",
-            encoding="linear16",
-            sample_rate=24000,
-        )
-
-        response = self.client.speak.v("1").stream(
+        response = self.speak.stream(
             {"text": text},
-            options
+            self.options
         )
 
         # ✅ AUDIO IS ONLY IN response.stream
-        audio_bytes = b""
-
-        for chunk in response.stream:
-            if isinstance(chunk, (bytes, bytearray)):
-                audio_bytes += chunk
+        chunks = [
+            chunk for chunk in response.stream
+            if isinstance(chunk, (bytes, bytearray))
+        ]
+        audio_bytes = b"".join(chunks)
 
         if not audio_bytes:
             raise RuntimeError("Deepgram TTS returned empty audio stream")
@@ -1,20 +1,73 @@
 """
 Local TTS using pyttsx3
 Low latency, offline, stable
+
+Renders to a temporary WAV file and returns int16 PCM at the
+requested sample rate, so it can stand in for Deepgram TTS.
+pyttsx3 engines are not thread-safe, so all synthesis runs on one
+dedicated worker thread.
 """
 
+import asyncio
+import os
+import tempfile
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pyttsx3
 
+from tts.tts_adapter import TTSAdapter
+
+
+class LocalTTS(TTSAdapter):
+    def __init__(self, rate: int = 170, sample_rate: int = 24000):
+        self.rate = rate
+        self.sample_rate = sample_rate
+        self._engine = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="local-tts")
+
+    # --------------------------------------------------
+
+    def _render(self, text: str) -> bytes:
+        if self._engine is None:
+            self._engine = pyttsx3.init()
+            self._engine.setProperty("rate", self.rate)
+
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            self._engine.save_to_file(text, path)
+            self._engine.runAndWait()
+
+            with wave.open(path, "rb") as wf:
+                if wf.getsampwidth() != 2:
+                    raise RuntimeError("Local TTS produced non-16-bit audio")
+                rate = wf.getframerate()
+                channels = wf.getnchannels()
+                pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        finally:
+            os.remove(path)
+
+        if channels > 1:
+            pcm = pcm.reshape(-1, channels).mean(axis=1)
+
+        if rate != self.sample_rate and len(pcm):
+            n_out = int(len(pcm) * self.sample_rate / rate)
+            pcm = np.interp(
+                np.linspace(0, len(pcm) - 1, n_out),
+                np.arange(len(pcm)),
+                pcm,
+            )
 
-class LocalTTS:
-    def __init__(self, rate: int = 170):
-        self.engine = pyttsx3.init()
-        self.engine.setProperty("rate", rate)
+        return np.asarray(pcm).astype(np.int16).tobytes()
 
-    async def synthesize(self, text: str):
+    async def synthesize(self, text: str, language: str = "en") -> bytes:
         """
-        Async-compatible generator
+        Synthesize text to raw int16 PCM at self.sample_rate.
         """
-        self.engine.say(text)
-        self.engine.runAndWait()
-        yield b""  # keep async interface consistent
+        loop = asyncio.get_running_loop()
+        audio = await loop.run_in_executor(self._executor, self._render, text)
+        if not audio:
+            raise RuntimeError("Local TTS returned empty audio")
+        return audio
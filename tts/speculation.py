@@ -0,0 +1,119 @@
+"""
+Speculative Audio
+Filler phrases over slow steps, prefetched audio for likely replies
+
+cover() runs a slow step (agent turn, slot search, storage commit)
+and, only if it is still running after filler_after_ms, plays a
+short cached filler so the caller does not hear dead air.
+
+prefetch() takes the agent's predicted next replies and renders
+them in the background while the current reply plays. Complete
+predictions are rendered to audio; ones whose fields depend on the
+caller's answer only warm their fragments and known values. take()
+hands out audio for the reply that actually happened; every other
+prediction is dropped. Nothing here touches agent state or storage,
+so a wrong guess costs only synthesis time.
+"""
+
+import asyncio
+import string
+
+from net.rate_limit import BACKGROUND, set_priority
+
+
+def _fields(template: str) -> set:
+    return {field for _, field, _, _ in string.Formatter().parse(template) if field}
+
+
+def _key(template: str, fields: dict):
+    return template, repr(sorted(fields.items()))
+
+
+class Speculator:
+    def __init__(self, renderer, player, filler_after_ms: int = 250):
+        """
+        renderer  TemplateRenderer (its tts serves the cached fillers)
+        player    needs play_async(audio)
+        """
+        self.renderer = renderer
+        self.player = player
+        self.filler_after = filler_after_ms / 1000
+
+        self.ready = {}
+        self._prefetch = None
+
+        self.hits = 0
+        self.misses = 0
+
+    # --------------------------------------------------
+
+    async def cover(self, awaitable, filler: str):
+        """
+        Await a slow step, playing filler if it is not done in time.
+        """
+        task = asyncio.ensure_future(awaitable)
+        done, _ = await asyncio.wait({task}, timeout=self.filler_after)
+        if not done:
+            try:
+                audio = await self.renderer.tts.synthesize(filler)
+                if not task.done():
+                    print(f"⏳ {filler}")
+                    await self.player.play_async(audio)
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+            except Exception as e:
+                print(f"⚠️ Filler failed: {e}")
+        return await task
+
+    # --------------------------------------------------
+
+    def prefetch(self, predictions):
+        """
+        Start rendering predicted (template, fields) replies.
+
+        Replaces any earlier prefetch; its results are discarded.
+        """
+        self.discard()
+        if predictions:
+            self._prefetch = asyncio.create_task(self._render_all(list(predictions)))
+
+    async def _render_all(self, predictions):
+        # Speculative: never ahead of a real reply for the rate limiter
+        set_priority(BACKGROUND)
+        partial = [(t, f) for t, f in predictions if not _fields(t) <= set(f)]
+        complete = [(t, f) for t, f in predictions if _fields(t) <= set(f)]
+
+        if partial:
+            values = []
+            for _, fields in partial:
+                for value in fields.values():
+                    values.extend(value if isinstance(value, (list, tuple)) else [value])
+            await self.renderer.warm([t for t, _ in partial], values)
+
+        async def render(template, fields):
+            try:
+                self.ready[_key(template, fields)] = await self.renderer.render(template, fields)
+            except Exception as e:
+                print(f"⚠️ Prefetch failed: {e}")
+
+        await asyncio.gather(*(render(t, f) for t, f in complete))
+
+    def take(self, render):
+        """
+        Prefetched audio for render, or None; drops all other guesses.
+        """
+        audio = self.ready.pop(_key(*render), None) if render else None
+        if render:
+            if audio is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        self.discard()
+        return audio
+
+    def discard(self):
+        if self._prefetch is not None and not self._prefetch.done():
+            self._prefetch.cancel()
+        self._prefetch = None
+        self.ready.clear()
@@ -0,0 +1,102 @@
+"""
+Sentence-level Speech Pipeline
+Synthesize sentence N+1 while sentence N is playing
+
+The first sentence is streamed straight into the player (lowest
+time to first audio); every later sentence is synthesized in the
+background as soon as the previous one starts playing. Pauses
+between sentences run concurrently with that background work, so
+the gap the caller hears is max(pause, remaining synthesis) rather
+than pause + synthesis.
+"""
+
+import asyncio
+import re
+
+
+ABBREVIATIONS = ("dr.", "mr.", "mrs.", "ms.", "st.", "no.", "e.g.", "i.e.")
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_sentences(text: str) -> list[str]:
+    """
+    Split on sentence punctuation, keeping "Dr. Kumar" together.
+    """
+    sentences = []
+    for piece in _SENTENCE_END.split(text.strip()):
+        if not piece:
+            continue
+        if sentences and sentences[-1].lower().endswith(ABBREVIATIONS):
+            sentences[-1] = f"{sentences[-1]} {piece}"
+        else:
+            sentences.append(piece)
+    return sentences
+
+
+def prompt_sentences(texts) -> list[str]:
+    """
+    The distinct sentences speak() will synthesize for texts (warm-up).
+    """
+    return list(dict.fromkeys(s for text in texts for s in split_sentences(text)))
+
+
+class SpeechPipeline:
+    def __init__(self, tts, player, pause_ms: int = 150, pauses: dict = None):
+        """
+        tts      needs synthesize(text, language) and stream(text, language)
+        player   needs play_async(audio) and play_stream(chunks)
+        pauses   phrase -> pause in ms after the sentence containing it
+        """
+        self.tts = tts
+        self.player = player
+        self.pause_ms = pause_ms
+        self.pauses = {k.lower(): v for k, v in (pauses or {}).items()}
+
+    def pause_after(self, sentence: str) -> float:
+        lower = sentence.lower()
+        for phrase, ms in self.pauses.items():
+            if phrase in lower:
+                return ms / 1000
+        return self.pause_ms / 1000
+
+    # --------------------------------------------------
+
+    async def speak(self, text: str, should_continue=lambda: True, language: str = "en") -> bool:
+        """
+        Speak text sentence by sentence in language's voice; False if interrupted.
+        """
+        sentences = split_sentences(text)
+        if not sentences:
+            return True
+
+        tasks = [None] * len(sentences)
+        try:
+            for i, sentence in enumerate(sentences):
+                if not should_continue():
+                    return False
+
+                # Start the next sentence's synthesis before playing this one
+                if i + 1 < len(sentences):
+                    tasks[i + 1] = asyncio.create_task(self.tts.synthesize(sentences[i + 1], language))
+
+                if i == 0:
+                    completed = await self.player.play_stream(self.tts.stream(sentence, language))
+                else:
+                    completed = await self.player.play_async(await tasks[i])
+
+                if not completed:
+                    return False
+
+                if i + 1 < len(sentences):
+                    await asyncio.sleep(self.pause_after(sentence))
+
+            return True
+        finally:
+            for task in tasks:
+                if task is None:
+                    continue
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # look-ahead failed unplayed; nothing to report
@@ -0,0 +1,191 @@
+"""
+Template Audio Renderer
+Stitches cached audio fragments instead of synthesizing whole replies
+
+A reply such as "Your appointment ID is {appt_id}." is split into
+its static fragments and its fields. Static fragments are
+synthesized once per voice and then served from the TTS cache;
+fields are rendered per value (doctor names, fees, slot times are
+cached after first use) and IDs are spelled from cached digit and
+letter renders. The PCM pieces are trimmed of edge silence and
+spliced with short linear crossfades.
+"""
+
+import asyncio
+import re
+import string
+
+import numpy as np
+
+from audio.encoding import trim_silence
+
+
+DIGIT_WORDS = {
+    "0": "zero", "1": "one", "2": "two", "3": "three", "4": "four",
+    "5": "five", "6": "six", "7": "seven", "8": "eight", "9": "nine",
+}
+
+_PUNCTUATION = string.punctuation + string.whitespace
+_WORD = re.compile(r"\w")
+
+
+def _split(literal: str) -> tuple:
+    """
+    (punctuation, text) of a template literal.
+
+    The punctuation at its start closes the preceding piece and the
+    rest is spoken as its own fragment; either may be empty:
+    ". We look forward" -> (".", "We look forward"), "?" -> ("?", "").
+    """
+    text = literal.strip()
+    rest = text.lstrip(_PUNCTUATION)
+    punctuation = "".join(ch for ch in text[: len(text) - len(rest)] if not ch.isspace())
+    rest = rest.strip()
+    if not _WORD.search(rest):
+        rest = ""
+    return punctuation, rest
+
+
+class TemplateRenderer:
+    def __init__(
+        self,
+        tts,
+        spell_fields=("appt_id",),
+        crossfade_ms: int = 15,
+        word_gap_ms: int = 60,
+        list_gap_ms: int = 150,
+        silence_threshold: float = 150.0,
+    ):
+        """
+        tts must expose sample_rate and async synthesize(text); pass a
+        CachedTTS so fragments are synthesized only once.
+        """
+        self.tts = tts
+        self.spell_fields = set(spell_fields)
+        self.sample_rate = tts.sample_rate
+        self.crossfade = int(self.sample_rate * crossfade_ms / 1000)
+        self.word_gap_ms = word_gap_ms
+        self.list_gap_ms = list_gap_ms
+        self.silence_threshold = silence_threshold
+
+    # --------------------------------------------------
+
+    @staticmethod
+    def fragments(template: str) -> list[str]:
+        """
+        Static texts of a template; punctuation never stands alone.
+        """
+        return [
+            text
+            for literal, _, _, _ in string.Formatter().parse(template)
+            for text in [_split(literal)[1]]
+            if text
+        ]
+
+    def _plan(self, template: str, fields: dict) -> list:
+        """
+        Ordered list of texts to synthesize, with ints for gaps (ms).
+
+        Punctuation after a field ("with {doctor}?") is rendered with
+        the field's value so it keeps its intonation; after a spelled
+        ID it is dropped, so the letter and digit clips stay shared.
+        """
+        plan = []
+        open_text = False  # plan[-1] may take trailing punctuation
+        for literal, field, _, _ in string.Formatter().parse(template):
+            punctuation, text = _split(literal)
+            if punctuation and open_text:
+                plan[-1] += punctuation
+            if text:
+                plan.append(text)
+            open_text = False
+            if field is None:
+                continue
+
+            value = fields[field]
+            if field in self.spell_fields:
+                chars = [ch for ch in str(value) if ch.isalnum()]
+                for i, ch in enumerate(chars):
+                    if i:
+                        plan.append(self.word_gap_ms)
+                    plan.append(DIGIT_WORDS.get(ch, ch.upper()))
+                continue
+
+            if isinstance(value, (list, tuple)):
+                for i, item in enumerate(value):
+                    if i:
+                        plan.append(self.list_gap_ms)
+                    plan.append(str(item))
+            else:
+                plan.append(str(value))
+            open_text = bool(plan) and isinstance(plan[-1], str)
+        return plan
+
+    # --------------------------------------------------
+
+    async def render(self, template: str, fields: dict) -> bytes:
+        plan = self._plan(template, fields)
+        texts = [p for p in plan if isinstance(p, str)]
+        audio = await asyncio.gather(*(self.tts.synthesize(t) for t in texts))
+        rendered = iter(audio)
+
+        pieces = []
+        for step in plan:
+            if isinstance(step, int):
+                pieces.append(np.zeros(int(self.sample_rate * step / 1000), dtype=np.int16))
+            else:
+                pcm = np.frombuffer(next(rendered), dtype=np.int16)
+                pieces.append(
+                    trim_silence(pcm, self.sample_rate, self.silence_threshold, guard_ms=40)
+                )
+
+        return self.splice(pieces).tobytes()
+
+    def splice(self, pieces: list) -> np.ndarray:
+        """
+        Concatenate int16 pieces with a linear crossfade at each join.
+        """
+        pieces = [p for p in pieces if len(p)]
+        if not pieces:
+            return np.zeros(0, dtype=np.int16)
+
+        total = sum(len(p) for p in pieces)
+        out = np.zeros(total, dtype=np.float32)
+        ramp_cache = {}
+
+        pos = 0
+        for i, piece in enumerate(pieces):
+            x = piece.astype(np.float32)
+            n = min(self.crossfade, len(x), pos) if i else 0
+            if n:
+                ramp = ramp_cache.get(n)
+                if ramp is None:
+                    ramp = ramp_cache[n] = np.linspace(0.0, 1.0, n, dtype=np.float32)
+                out[pos - n: pos] *= 1.0 - ramp
+                x[:n] *= ramp
+                pos -= n
+            out[pos: pos + len(x)] += x
+            pos += len(x)
+
+        return np.clip(out[:pos], -32768, 32767).astype(np.int16)
+
+    # --------------------------------------------------
+
+    async def warm(self, templates, values=(), spell="", concurrency: int = 4):
+        """
+        Pre-synthesize static fragments, digits and known field values.
+
+        Values are also warmed with each punctuation mark that follows
+        a field in the templates, as _plan() renders them that way;
+        spell is every character a spelled field can contain.
+        """
+        texts = {f for t in templates for f in self.fragments(t)}
+        texts.update(DIGIT_WORDS.values())
+        texts.update(DIGIT_WORDS.get(ch, ch.upper()) for ch in spell if ch.isalnum())
+        marks = {""} | {
+            _split(literal)[0]
+            for t in templates
+            for literal, _, _, _ in list(string.Formatter().parse(t))[1:]
+        }
+        texts.update(f"{v}{mark}" for v in values for mark in marks)
+        return await self.tts.warm(sorted(texts), concurrency=concurrency)
@@ -0,0 +1,158 @@
+"""
+Persistent TTS Audio Cache
+Content-addressed by (text, voice model, sample rate, encoding)
+
+Two tiers:
+  - in-memory LRU of recently played prompts
+  - on-disk store, one file per key, read back through mmap so a
+    cold hit costs a page-in rather than a copy
+
+Files are written to a temp name and renamed, so a crash never
+leaves a truncated entry behind. CachedTTS writes on the disk
+executor so the event loop never waits on the filesystem.
+"""
+
+import asyncio
+import hashlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+
+from runtime.executors import run_disk
+
+
+def cache_key(text: str, model: str, sample_rate: int, encoding: str) -> str:
+    raw = "\x1f".join([text.strip(), model, str(sample_rate), encoding])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    def __init__(self, cache_dir: str = ".tts_cache", max_items: int = 256):
+        self.cache_dir = cache_dir
+        self.max_items = max_items
+        self._lru = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # --------------------------------------------------
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pcm")
+
+    def _remember(self, key: str, audio):
+        self._lru[key] = audio
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_items:
+            self._lru.popitem(last=False)
+
+    # --------------------------------------------------
+
+    def get(self, key: str):
+        """
+        Return cached audio (bytes or a read-only memoryview) or None.
+        """
+        audio = self._lru.get(key)
+        if audio is not None:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return audio
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # ValueError: empty file, treat as missing
+            self.misses += 1
+            return None
+
+        audio = memoryview(mapped)
+        self._remember(key, audio)
+        self.hits += 1
+        return audio
+
+    def _write(self, key: str, audio: bytes):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(audio)
+        os.replace(tmp, path)
+
+    def put(self, key: str, audio: bytes):
+        self._write(key, audio)
+        self._remember(key, audio)
+
+    async def put_async(self, key: str, audio: bytes):
+        """
+        Serve from memory at once; write the file on the disk executor.
+        """
+        self._remember(key, audio)
+        await run_disk(self._write, key, audio)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._lru or os.path.exists(self._path(key))
+
+
+class CachedTTS:
+    """
+    Wraps an async TTS client (e.g. AsyncDeepgramTTS) with TTSCache.
+    """
+
+    def __init__(self, tts, cache: TTSCache):
+        self.tts = tts
+        self.cache = cache
+
+    @property
+    def sample_rate(self) -> int:
+        return self.tts.sample_rate
+
+    def key(self, text: str) -> str:
+        return cache_key(text, self.tts.model, self.tts.sample_rate, self.tts.encoding)
+
+    async def synthesize(self, text: str):
+        key = self.key(text)
+        audio = self.cache.get(key)
+        if audio is not None:
+            return audio
+
+        audio = await self.tts.synthesize(text)
+        await self.cache.put_async(key, audio)
+        return audio
+
+    async def stream(self, text: str):
+        """
+        Yield audio chunks: the cached audio at once, or the live
+        stream (stored in the cache once it completes).
+        """
+        key = self.key(text)
+        audio = self.cache.get(key)
+        if audio is not None:
+            yield audio
+            return
+
+        chunks = []
+        async for chunk in self.tts.stream(text):
+            chunks.append(chunk)
+            yield chunk
+        await self.cache.put_async(key, b"".join(chunks))
+
+    async def warm(self, texts, concurrency: int = 4):
+        """
+        Pre-synthesize prompts that are not cached yet.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(text):
+            async with semaphore:
+                try:
+                    await self.synthesize(text)
+                except Exception as e:
+                    print(f"⚠️ TTS warm-up failed for {text[:40]!r}: {e}")
+
+        missing = [t for t in texts if self.key(t) not in self.cache]
+        await asyncio.gather(*(one(t) for t in missing))
+        return len(missing)
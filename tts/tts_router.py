@@ -0,0 +1,222 @@
+"""
+Latency-SLO TTS Router
+Deepgram first, local engine when Deepgram is slow or down
+
+Each request goes to the primary engine. If no audio has arrived
+after hedge_ms, the fallback is started in parallel and whichever
+finishes first (primary preferred) is used. If nothing has arrived
+by deadline_ms the primary is abandoned and the fallback's audio
+is played, so the caller always hears something within the budget.
+
+A circuit breaker counts primary failures and timeouts; once it
+opens, requests go straight to the fallback until cooldown_s has
+passed, then a single trial request decides whether to close it.
+Requests shed by the shared rate limiter never reached Deepgram, so
+they go to the fallback without counting against the breaker.
+
+Without a fallback there is nothing to switch to: the primary is
+awaited for as long as it takes and the breaker is not used.
+"""
+
+import asyncio
+import time
+
+from net.rate_limit import RateLimited
+from tts.tts_adapter import TTSAdapter
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, cooldown_s: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.cooldown_s:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        """
+        True if the primary may be tried; one trial when half-open.
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial:
+            self._trial = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                print("⚠️ TTS primary unhealthy, switching to local voice.")
+            self.opened_at = time.monotonic()
+
+
+class TTSRouter(TTSAdapter):
+    def __init__(
+        self,
+        primary,
+        fallback=None,
+        hedge_ms: int = 400,
+        deadline_ms: int = 1500,
+        breaker: CircuitBreaker = None,
+    ):
+        """
+        primary   needs sample_rate, synthesize(text, language) and
+                  stream(text, language), e.g. a VoicePool
+        fallback  a TTSAdapter returning PCM at the same sample rate
+        """
+        self.primary = primary
+        self.fallback = fallback
+        self.hedge = hedge_ms / 1000
+        self.deadline = deadline_ms / 1000
+        self.breaker = breaker or CircuitBreaker()
+
+        self.primary_count = 0
+        self.fallback_count = 0
+
+    @property
+    def sample_rate(self) -> int:
+        return self.primary.sample_rate
+
+    async def warm(self, texts, concurrency: int = 4, **kwargs):
+        return await self.primary.warm(texts, concurrency=concurrency, **kwargs)
+
+    # --------------------------------------------------
+
+    async def _fallback(self, text: str, language: str) -> bytes:
+        if self.fallback is None:
+            raise RuntimeError("TTS primary unavailable and no fallback configured")
+        self.fallback_count += 1
+        return await self.fallback.synthesize(text, language)
+
+    async def _race(self, first, text: str, language: str):
+        """
+        Wait for the primary's first result with hedging.
+
+        first is a task yielding the primary's audio (or first chunk).
+        Returns (result, from_primary).
+        """
+        start = time.monotonic()
+        backup = None
+        try:
+            if self.fallback is None:
+                result = await first
+                self.primary_count += 1
+                return result, True
+
+            await asyncio.wait({first}, timeout=self.hedge)
+
+            if first.done():
+                if first.exception() is None:
+                    self.breaker.record_success()
+                    self.primary_count += 1
+                    return first.result(), True
+                error = first.exception()
+                if isinstance(error, RateLimited):
+                    # Shed by our own limiter, never sent: not a provider failure
+                    return await self._fallback(text, language), False
+                print(f"⚠️ TTS primary failed: {error}")
+                self.breaker.record_failure()
+                return await self._fallback(text, language), False
+
+            # Hedge: start the local engine alongside the slow primary
+            backup = asyncio.create_task(self.fallback.synthesize(text, language))
+            pending = {first, backup}
+            while pending:
+                remaining = self.deadline - (time.monotonic() - start)
+                if first in pending and remaining <= 0:
+                    # Budget spent: give up on the primary
+                    print("⚠️ TTS primary missed its deadline, using local voice.")
+                    first.cancel()
+                    pending.discard(first)
+                    self.breaker.record_failure()
+                    continue
+
+                timeout = remaining if first in pending else None
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if first in done:
+                    if first.exception() is None:
+                        self.breaker.record_success()
+                        self.primary_count += 1
+                        return first.result(), True
+                    if not isinstance(first.exception(), RateLimited):
+                        self.breaker.record_failure()
+
+                if backup in done and backup.exception() is None:
+                    self.fallback_count += 1
+                    return backup.result(), False
+
+            raise RuntimeError("TTS primary and fallback both failed")
+        finally:
+            # Let cancelled tasks unwind so the primary stream can be closed
+            leftover = [t for t in (first, backup) if t is not None and not t.done()]
+            for task in leftover:
+                task.cancel()
+            if leftover:
+                await asyncio.gather(*leftover, return_exceptions=True)
+            for task in (first, backup):
+                if task is not None and task.done() and not task.cancelled():
+                    task.exception()  # failed while we were being cancelled
+
+    # --------------------------------------------------
+
+    async def synthesize(self, text: str, language: str = "en") -> bytes:
+        if self.fallback is not None and not self.breaker.allow():
+            return await self._fallback(text, language)
+
+        first = asyncio.create_task(self.primary.synthesize(text, language))
+        audio, _ = await self._race(first, text, language)
+        return audio
+
+    async def stream(self, text: str, language: str = "en"):
+        """
+        Stream the primary if its first chunk beats the hedge/deadline.
+        """
+        if self.fallback is not None and not self.breaker.allow():
+            yield await self._fallback(text, language)
+            return
+
+        chunks = self.primary.stream(text, language).__aiter__()
+        first = asyncio.create_task(chunks.__anext__())
+        try:
+            result, from_primary = await self._race(first, text, language)
+        except BaseException:
+            await chunks.aclose()
+            raise
+
+        yield result
+        if not from_primary:
+            await chunks.aclose()
+            return
+
+        try:
+            async for chunk in chunks:
+                yield chunk
+        except Exception as e:
+            # Audio already playing; end this sentence rather than crash
+            print(f"⚠️ TTS stream interrupted: {e}")
+            if self.fallback is not None:
+                self.breaker.record_failure()
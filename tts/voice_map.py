@@ -1,5 +1,8 @@
+# Language -> TTS voice (Deepgram model name for Deepgram voices).
+# Voices the provider rejects are dropped at warm-up and that
+# language is spoken with the default ("en") voice instead.
 VOICE_MAP = {
-    "en": "en-US-1",
+    "en": "aura-asteria-en",
     "hi": "hi_female_1",
     "ta": "ta_female_1",
     "te": "te_female_1",
@@ -0,0 +1,118 @@
+"""
+Per-language Voice Pool
+One warm synthesis engine per language in VOICE_MAP
+
+Each language gets its own engine (model, request options and
+cache key prefix built once) and its own concurrency limit, so a
+burst of Hindi prompts cannot starve English ones. warm_voices()
+sends a short probe through every voice at start-up so the first
+switch to another language does not pay the provider's cold start;
+voices that fail the probe fall back to the default voice. The
+probe bypasses the TTS cache, which would otherwise answer it from
+disk without touching the provider.
+
+Romanized Indic text ("kal subah aaiye") sent to an Indic voice is
+transliterated to its native script first. English text, such as
+the agent's prompts, is sent as is: an Indic voice reads it better
+than a letter-by-letter transliteration.
+"""
+
+import asyncio
+
+from language.detect_language import detect_caller_language
+from language.roman_to_native import convert_roman_to_native
+from tts.tts_adapter import TTSAdapter
+from tts.voice_map import VOICE_MAP
+
+
+WARM_PROBE = "Hello."
+
+
+class VoicePool(TTSAdapter):
+    def __init__(
+        self,
+        factory,
+        voices: dict = None,
+        default: str = "en",
+        limits: dict = None,
+        default_limit: int = 4,
+    ):
+        """
+        factory   voice name -> engine with sample_rate, synthesize(text),
+                  stream(text) and warm(texts), e.g. a CachedTTS
+                  (its uncached .tts is what warm_voices() probes)
+        voices    language -> voice name (VOICE_MAP by default)
+        limits    language -> max concurrent requests
+        """
+        self.voices = dict(voices or VOICE_MAP)
+        if default not in self.voices:
+            raise RuntimeError(f"Default language {default!r} has no voice")
+        self.default = default
+
+        self.engines = {lang: factory(voice) for lang, voice in self.voices.items()}
+        limits = limits or {}
+        self.limits = {
+            lang: asyncio.Semaphore(limits.get(lang, default_limit))
+            for lang in self.voices
+        }
+        self.unavailable = set()
+
+    @property
+    def sample_rate(self) -> int:
+        return self.engines[self.default].sample_rate
+
+    def language_for(self, language: str) -> str:
+        if language in self.engines and language not in self.unavailable:
+            return language
+        return self.default
+
+    def engine(self, language: str = "en"):
+        return self.engines[self.language_for(language)]
+
+    def _script(self, text: str, lang: str) -> str:
+        """
+        Text as lang's voice reads it: romanized Indic in native script.
+        """
+        # Same bar as a caller switching language: "Alright." stays English
+        if lang == self.default or detect_caller_language(text, "en") == "en":
+            return text
+        # Sentence case is not the scheme's retroflex capitals ("T", "D")
+        return convert_roman_to_native(text.lower(), lang)
+
+    # --------------------------------------------------
+
+    async def synthesize(self, text: str, language: str = "en") -> bytes:
+        lang = self.language_for(language)
+        async with self.limits[lang]:
+            return await self.engines[lang].synthesize(self._script(text, lang))
+
+    async def stream(self, text: str, language: str = "en"):
+        """
+        Stream from the language's voice; the slot is held until done.
+        """
+        lang = self.language_for(language)
+        async with self.limits[lang]:
+            async for chunk in self.engines[lang].stream(self._script(text, lang)):
+                yield chunk
+
+    async def warm(self, texts, concurrency: int = 4, language: str = "en"):
+        return await self.engine(language).warm(texts, concurrency=concurrency)
+
+    # --------------------------------------------------
+
+    async def warm_voices(self, probe: str = WARM_PROBE):
+        """
+        Probe every voice once; drop the ones the provider rejects.
+        """
+        async def one(lang):
+            try:
+                async with self.limits[lang]:
+                    engine = self.engines[lang]
+                    await getattr(engine, "tts", engine).synthesize(probe)
+            except Exception as e:
+                if lang != self.default:
+                    self.unavailable.add(lang)
+                print(f"⚠️ Voice {self.voices[lang]!r} ({lang}) unavailable: {e}")
+
+        await asyncio.gather(*(one(lang) for lang in self.engines))
+        return sorted(set(self.engines) - self.unavailable)